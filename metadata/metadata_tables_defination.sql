@@ -12,7 +12,7 @@ CREATE OR REPLACE TABLE COMMON.FILE_FORMAT_MASTER (
     quote_char          VARCHAR(1),         -- " | ' | NULL
     escape_char         VARCHAR(1),
     header_present      CHAR(1),            -- Y/N
-    compression_type    VARCHAR(10),        -- GZIP | BZIP2 | NONE
+    compression_type    VARCHAR(10),        -- GZIP | ZSTD | BZIP2 | NONE
     record_separator    VARCHAR(5),         -- \n | \r\n
     encoding            VARCHAR(20),        -- UTF-8 | ISO-8859-1
     created_at          TIMESTAMP DEFAULT CURRENT_TIMESTAMP
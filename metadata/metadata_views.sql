@@ -93,7 +93,8 @@ WITH source_metadata AS (
         ffm.format_type,
         ffm.delimiter,
         ffm.quote_char,
-        ffm.header_present
+        ffm.header_present,
+        ffm.compression_type
     FROM COMMON.SOURCE_FILE_CONFIG sfc
     JOIN COMMON.TARGET_TABLE_MAPPING ttm ON sfc.source_id = ttm.source_id
     LEFT JOIN COMMON.FILE_FORMAT_MASTER ffm ON sfc.file_format_id = ffm.file_format_id
@@ -253,6 +254,7 @@ SELECT
             ') FILE_FORMAT = (TYPE = CSV ' ||
             'FIELD_DELIMITER = ''' || sm.delimiter || ''' ' ||
             IFF(sm.header_present = 'Y', 'SKIP_HEADER = 1 ', '') ||
+            'COMPRESSION = ' || COALESCE(NULLIF(TRIM(sm.compression_type), ''), 'AUTO') || ' ' ||
             'FIELD_OPTIONALLY_ENCLOSED_BY = ''' || COALESCE(sm.quote_char, '"') || ''') ' ||
             'ON_ERROR = ABORT_STATEMENT;'
     END AS file_copy_sql,
@@ -0,0 +1,58 @@
+import pyarrow as pa
+import pytest
+
+from utils.bronze_stream_ingest import DuckDBBronzeWriter, generated_batches, ingest
+from utils.generate_food_delivery_data import TABLE_SPECS
+
+COUNTS = {table: 50 for table in TABLE_SPECS}
+COUNTS['order'] = 300
+
+
+@pytest.fixture
+def writer():
+    writer = DuckDBBronzeWriter()
+    yield writer
+    writer.close()
+
+
+def test_ingest_generated_batches(writer):
+    result = ingest(writer, generated_batches('order', COUNTS, chunk_rows=100), 'ORDER_BATCH', chunk_rows=100)
+
+    assert result['bronze_table'] == 'BRONZE.ORDER_BRZ'
+    assert (result['rows'], result['batches'], result['ingest_run_id']) == (300, 3, 1)
+    assert result['dropped_columns'] == []
+    assert writer.fetch("SELECT COUNT(*), COUNT(DISTINCT ORDER_ID), MIN(INGEST_RUN_ID), MAX(INGEST_RUN_ID), "
+                        "COUNT(CREATED_AT) FROM BRONZE.ORDER_BRZ") == [(300, 300, 1, 1, 300)]
+
+
+def test_raw_columns_mirror_typed_values(writer):
+    ingest(writer, generated_batches('order', COUNTS, chunk_rows=100), 'ORDER_BATCH')
+
+    mismatches = writer.fetch("SELECT COUNT(*) FROM BRONZE.ORDER_BRZ "
+                              "WHERE ORDER_ID_RAW IS DISTINCT FROM CAST(ORDER_ID AS VARCHAR) "
+                              "OR ORDER_STATUS_RAW IS DISTINCT FROM ORDER_STATUS")
+    assert mismatches == [(0,)]
+
+
+def test_each_run_gets_the_next_ingest_run_id(writer):
+    first = ingest(writer, generated_batches('order', COUNTS, chunk_rows=100), 'ORDER_BATCH')
+    second = ingest(writer, generated_batches('order', COUNTS, chunk_rows=100), 'ORDER_BATCH')
+
+    assert (first['ingest_run_id'], second['ingest_run_id']) == (1, 2)
+    assert writer.fetch("SELECT INGEST_RUN_ID, COUNT(*) FROM BRONZE.ORDER_BRZ "
+                        "GROUP BY 1 ORDER BY 1") == [(1, 300), (2, 300)]
+
+
+def test_columns_bronze_lacks_are_dropped(writer):
+    batch = pa.table({'ORDER_ID': ['1', '2'], 'ORDER_STATUS': ['DELIVERED', None], 'NOT_A_COLUMN': ['a', 'b']})
+
+    result = ingest(writer, [batch], 'ORDER_BATCH', ingest_run_id=42)
+
+    assert result['dropped_columns'] == ['NOT_A_COLUMN']
+    assert writer.fetch("SELECT ORDER_ID_RAW, ORDER_STATUS_RAW, INGEST_RUN_ID FROM BRONZE.ORDER_BRZ "
+                        "ORDER BY ORDER_ID") == [('1', 'DELIVERED', 42), ('2', None, 42)]
+
+
+def test_unknown_source_is_rejected(writer):
+    with pytest.raises(ValueError, match="No active TARGET_TABLE_MAPPING"):
+        ingest(writer, [], 'NO_SUCH_BATCH')
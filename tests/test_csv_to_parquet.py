@@ -0,0 +1,49 @@
+import json
+import os
+
+from utils.csv_to_parquet import STATE_FILE, convert_tree, is_conversion_output
+
+
+def write_csv(path, rows):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("ID,NAME\n")
+        f.writelines(f"{i},name_{i}\n" for i in range(rows))
+
+
+def parquet_names(directory):
+    return sorted(p.name for p in directory.glob('*.parquet'))
+
+
+def test_parallel_conversions_of_one_table_all_recorded(tmp_path):
+    names = ['order', 'order_item', 'a', 'b', 'c', 'd']
+    for name in names:
+        write_csv(tmp_path / "in/t" / f"{name}.csv", 200)
+
+    convert_tree(tmp_path / "in", tmp_path / "out", workers=4, target_part_mb=None)
+
+    state = json.loads((tmp_path / "out/t" / STATE_FILE).read_text())
+    assert sorted(state) == sorted(f"{name}.csv" for name in names)
+    report = convert_tree(tmp_path / "in", tmp_path / "out", workers=4, target_part_mb=None)
+    assert report['tables']['t']['skipped'] == len(names)
+
+
+def test_reconverting_a_csv_keeps_files_of_csvs_sharing_its_prefix(tmp_path):
+    write_csv(tmp_path / "in/t/order.csv", 100)
+    write_csv(tmp_path / "in/t/order_item.csv", 100)
+    convert_tree(tmp_path / "in", tmp_path / "out", workers=1, target_part_mb=None)
+
+    write_csv(tmp_path / "in/t/order.csv", 150)
+    os.utime(tmp_path / "in/t/order.csv", ns=(0, 0))
+    report = convert_tree(tmp_path / "in", tmp_path / "out", workers=1, target_part_mb=None)
+
+    assert parquet_names(tmp_path / "out/t") == ['order.parquet', 'order_item.parquet']
+    assert report['tables']['t']['converted'] == 1
+
+
+def test_is_conversion_output():
+    assert is_conversion_output('order.csv', 'order.parquet')
+    assert is_conversion_output('order.csv', 'year=2024/month=1/day=2/order-part-0.parquet')
+    assert is_conversion_output('order.csv', 'order-part-00012.parquet')
+    assert not is_conversion_output('order.csv', 'order_item.parquet')
+    assert not is_conversion_output('order.csv', 'order_item-part-00000.parquet')
@@ -0,0 +1,47 @@
+import csv
+from collections import Counter
+
+import pytest
+
+from utils.defect_injection import DefectInjector, verify_ground_truth
+from utils.generate_food_delivery_data import DEFECT_PROFILES, TABLES, generate_table
+
+COUNTS = {'location': 50, 'restaurant': 200, 'customer': 500, 'customer_address': 700, 'menu': 600,
+          'delivery_agent': 100, 'order': 2_000, 'order_item': 4_000, 'delivery': 2_000}
+
+
+def _labels(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+@pytest.mark.parametrize('table', TABLES)
+def test_dq_labels_match_written_values(tmp_path, table):
+    # High rates so rules on the same column collide in many rows
+    rules = {t: [dict(rule, rate=0.2) for rule in table_rules]
+             for t, table_rules in DEFECT_PROFILES['dq'].items()}
+    if table not in rules:
+        pytest.skip(f"no dq rules for {table}")
+
+    entry = generate_table(table, COUNTS, tmp_path, seed=7, show_progress=False, defect_rules=rules)
+    data_path = tmp_path / entry['files'][0]
+    truth_path = tmp_path / entry['ground_truth']
+
+    assert verify_ground_truth(data_path, truth_path) == []
+    cells = Counter((label['ROW_NUMBER'], label['COLUMN']) for label in _labels(truth_path))
+    assert max(cells.values()) == 1
+
+
+def test_one_defect_per_cell_including_raw_mirror(tmp_path):
+    rules = [
+        {'type': 'null', 'column': 'STATUS', 'rate': 1.0},
+        {'type': 'bad_enum', 'column': 'STATUS', 'rate': 1.0, 'values': ['BAD']},
+        {'type': 'bad_enum', 'column': 'STATUS_RAW', 'rate': 1.0, 'values': ['BAD']},
+    ]
+    injector = DefectInjector(rules, 'ID', seed=1)
+    rows = list(injector.inject(({'ID': str(i), 'STATUS': 'OK', 'STATUS_RAW': 'OK'} for i in range(10)),
+                                tmp_path / 'truth.csv'))
+
+    assert all(row['STATUS'] == '' and row['STATUS_RAW'] == '' for row in rows)
+    assert injector.counts == {'null': 10}
+    assert [label['DEFECT_TYPE'] for label in _labels(tmp_path / 'truth.csv')] == ['null'] * 10
@@ -0,0 +1,11 @@
+from utils.duckdb_backend import NO_OP_RESULT, translate_sql
+
+
+def test_clustering_keys_are_skipped():
+    assert translate_sql("ALTER TABLE BRONZE.CUSTOMER_BRZ CLUSTER BY (INGEST_RUN_ID)") == NO_OP_RESULT
+    assert translate_sql("ALTER TABLE IF EXISTS BRONZE.ORDER_BRZ DROP CLUSTERING KEY") == NO_OP_RESULT
+    assert translate_sql("CREATE TABLE T (A INT, B DATE) CLUSTER BY (TO_DATE(B), A)") == "CREATE TABLE T (A INT, B DATE)"
+
+
+def test_other_alter_table_statements_still_run():
+    assert translate_sql("ALTER TABLE T ADD COLUMN C INT") == "ALTER TABLE T ADD COLUMN C INT"
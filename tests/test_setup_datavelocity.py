@@ -0,0 +1,251 @@
+import threading
+from contextlib import contextmanager
+
+import pytest
+
+import utils.setup_datavelocity as setup_datavelocity
+from utils.setup_datavelocity import (SQLScriptExecutor, build_dependency_graph, load_deployment_ledger,
+                                      save_deployment_ledger)
+
+
+class FakeCursor:
+    def __init__(self, pool):
+        self.pool = pool
+
+    def execute(self, sql):
+        with self.pool.lock:
+            self.pool.executed.append(sql)
+        if 'FAIL' in sql:
+            if self.pool.barrier:
+                self.pool.barrier.wait(5)  # keep failing scripts in flight together
+            raise RuntimeError(f"SQL compilation error: {sql}")
+
+    def fetchall(self):
+        return []
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, pool):
+        self.pool = pool
+
+    def cursor(self):
+        return FakeCursor(self.pool)
+
+
+class FakePool:
+    """Just the connection() context manager _run_graph borrows connections with"""
+
+    def __init__(self, barrier=None):
+        self.executed = []
+        self.lock = threading.Lock()
+        self.barrier = barrier
+
+    @contextmanager
+    def connection(self):
+        yield FakeConnection(self)
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """Temp repo root with a utils/ dir, so script files resolve under it"""
+    (tmp_path / "utils").mkdir()
+    (tmp_path / "sql").mkdir()
+    monkeypatch.setattr(setup_datavelocity, 'BASE_DIR', str(tmp_path / "utils"))
+    return tmp_path
+
+
+def write_scripts(repo, **scripts):
+    for name, sql in scripts.items():
+        (repo / "sql" / f"{name}.sql").write_text(sql, encoding='utf-8')
+    return [{'file': f"sql/{name}.sql"} for name in scripts]
+
+
+@pytest.fixture
+def executor(tmp_path):
+    return SQLScriptExecutor(statement_retries=0, ledger_path=None, log_dir=tmp_path / "logs")
+
+
+@pytest.fixture
+def ledger_path(tmp_path):
+    return tmp_path / "logs" / "deployment_ledger.json"
+
+
+def run_graph(executor, definitions, workers=2, stop_on_error=True, pool=None, ledger=None, force=False):
+    pool = pool or FakePool()
+    graph = build_dependency_graph(definitions)
+    executor._run_graph(pool, definitions, graph, stop_on_error, False, workers, ledger, 'acct/DB', force)
+    return pool
+
+
+def deploy(ledger_path, definitions, force=False):
+    """One deploy against the ledger at ledger_path (None = --no-ledger); returns the executor"""
+    executor = SQLScriptExecutor(statement_retries=0, ledger_path=ledger_path)
+    ledger = load_deployment_ledger(ledger_path) if ledger_path else None
+    run_graph(executor, definitions, workers=1, stop_on_error=False, ledger=ledger, force=force)
+    return executor
+
+
+def statuses(executor):
+    return {entry['script'].split('/')[-1][:-4]: entry['status'] for entry in executor.execution_log}
+
+
+def test_dependencies_are_inferred_from_created_objects(repo):
+    definitions = write_scripts(
+        repo,
+        a="CREATE OR REPLACE TABLE BRONZE.A (ID INT);",
+        b="CREATE OR REPLACE VIEW SILVER.B AS SELECT * FROM DATAVELOCITY.BRONZE.A;",
+        c="CREATE TABLE IF NOT EXISTS GOLD.C (ID INT);",
+        d="INSERT INTO GOLD.C SELECT * FROM SILVER.B; -- BRONZE.A only in a comment",
+    )
+    assert build_dependency_graph(definitions) == {0: set(), 1: {0}, 2: set(), 3: {1, 2}}
+
+
+def test_inferred_dependencies_only_point_backwards(repo):
+    definitions = write_scripts(
+        repo,
+        a="CREATE VIEW SILVER.A AS SELECT * FROM BRONZE.B;",
+        b="CREATE TABLE BRONZE.B (ID INT);",
+    )
+    assert build_dependency_graph(definitions) == {0: set(), 1: set()}
+
+
+def test_declared_dependencies(repo):
+    definitions = write_scripts(repo, a="SELECT 1;", b="SELECT 2;")
+    definitions[0]['depends_on'] = ['sql/b.sql']
+    assert build_dependency_graph(definitions) == {0: {1}, 1: set()}
+
+    definitions[1]['depends_on'] = ['sql/a.sql']
+    with pytest.raises(ValueError, match="Dependency cycle"):
+        build_dependency_graph(definitions)
+
+    definitions[1]['depends_on'] = ['sql/missing.sql']
+    with pytest.raises(ValueError, match="not in this deploy"):
+        build_dependency_graph(definitions)
+
+
+def test_scripts_run_after_their_dependencies(repo, executor):
+    definitions = write_scripts(
+        repo,
+        a="CREATE TABLE BRONZE.A (ID INT);",
+        b="CREATE VIEW SILVER.B AS SELECT * FROM BRONZE.A;",
+        c="CREATE VIEW GOLD.C AS SELECT * FROM SILVER.B;",
+    )
+    pool = run_graph(executor, definitions, workers=3)
+
+    assert [sql.split()[2] for sql in pool.executed] == ['BRONZE.A', 'SILVER.B', 'GOLD.C']
+    assert statuses(executor) == {'a': 'success', 'b': 'success', 'c': 'success'}
+
+
+def test_failed_script_blocks_its_dependents_only(repo, executor):
+    definitions = write_scripts(
+        repo,
+        a="CREATE TABLE BRONZE.A (ID INT); SELECT FAIL;",
+        b="CREATE VIEW SILVER.B AS SELECT * FROM BRONZE.A;",
+        c="CREATE VIEW GOLD.C AS SELECT * FROM SILVER.B;",
+        d="CREATE TABLE GOLD.D (ID INT);",
+    )
+    run_graph(executor, definitions, workers=1, stop_on_error=False)
+
+    assert statuses(executor) == {'a': 'failed', 'b': 'blocked', 'c': 'blocked', 'd': 'success'}
+    assert executor.failed_scripts == ['sql/a.sql']
+
+
+def test_optional_failure_does_not_block(repo, executor):
+    definitions = write_scripts(
+        repo,
+        a="CREATE TABLE BRONZE.A (ID INT); SELECT FAIL;",
+        b="CREATE VIEW SILVER.B AS SELECT * FROM BRONZE.A;",
+    )
+    definitions[0]['optional'] = True
+    run_graph(executor, definitions, workers=1)
+
+    assert statuses(executor) == {'a': 'optional_failed', 'b': 'success'}
+
+
+def test_stop_on_error_drains_in_flight_scripts_and_logs_the_rest(repo, executor, capsys):
+    definitions = write_scripts(
+        repo,
+        a="SELECT FAIL_A;",
+        b="SELECT FAIL_B;",
+        c="CREATE TABLE GOLD.C (ID INT);",
+    )
+    run_graph(executor, definitions, workers=2, pool=FakePool(barrier=threading.Barrier(2)))
+
+    assert statuses(executor) == {'a': 'failed', 'b': 'failed', 'c': 'skipped'}
+    assert capsys.readouterr().out.count("Stopping execution due to error in") == 1
+
+    executor._print_summary(setup_datavelocity.datetime.now())
+    summary = capsys.readouterr().out
+    assert "📋 Total: 3" in summary
+    assert "Not started (stopped on error): 1" in summary
+
+
+LEDGER_SCRIPTS = {
+    'a': "CREATE TABLE BRONZE.A (ID INT);",
+    'b': "CREATE VIEW SILVER.B AS SELECT * FROM BRONZE.A;",
+    'c': "CREATE TABLE GOLD.C (ID INT);",
+}
+
+
+def test_ledger_skips_scripts_deployed_unchanged(repo, ledger_path):
+    definitions = write_scripts(repo, **LEDGER_SCRIPTS)
+    assert statuses(deploy(ledger_path, definitions)) == {'a': 'success', 'b': 'success', 'c': 'success'}
+
+    ledger = load_deployment_ledger(ledger_path)
+    assert sorted(ledger['acct/DB']) == ['sql/a.sql', 'sql/b.sql', 'sql/c.sql']
+    assert statuses(deploy(ledger_path, definitions)) == {'a': 'unchanged', 'b': 'unchanged', 'c': 'unchanged'}
+
+
+def test_ledger_reruns_a_matching_script_whose_last_deploy_failed(repo, ledger_path):
+    definitions = write_scripts(repo, a="SELECT FAIL;", c=LEDGER_SCRIPTS['c'])
+    assert statuses(deploy(ledger_path, definitions)) == {'a': 'failed', 'c': 'success'}
+    assert load_deployment_ledger(ledger_path)['acct/DB']['sql/a.sql']['status'] == 'failed'
+
+    # Same content, but the last deploy didn't succeed
+    assert statuses(deploy(ledger_path, definitions)) == {'a': 'failed', 'c': 'unchanged'}
+
+
+def test_redeployed_upstream_forces_its_dependents(repo, ledger_path):
+    definitions = write_scripts(repo, **LEDGER_SCRIPTS)
+    deploy(ledger_path, definitions)
+
+    write_scripts(repo, a="CREATE TABLE BRONZE.A (ID INT, NAME STRING);")
+    assert statuses(deploy(ledger_path, definitions)) == {'a': 'success', 'b': 'success', 'c': 'unchanged'}
+
+
+def test_force_deploys_everything_and_updates_the_ledger(repo, ledger_path):
+    definitions = write_scripts(repo, **LEDGER_SCRIPTS)
+    deploy(ledger_path, definitions)
+    before = load_deployment_ledger(ledger_path)['acct/DB']['sql/c.sql']['deployed_at']
+
+    assert statuses(deploy(ledger_path, definitions, force=True)) == {'a': 'success', 'b': 'success', 'c': 'success'}
+    assert load_deployment_ledger(ledger_path)['acct/DB']['sql/c.sql']['deployed_at'] >= before
+
+
+def test_no_ledger_deploys_everything_and_writes_nothing(repo, tmp_path):
+    definitions = write_scripts(repo, **LEDGER_SCRIPTS)
+    for _ in range(2):
+        assert statuses(deploy(None, definitions)) == {'a': 'success', 'b': 'success', 'c': 'success'}
+    assert not (tmp_path / "logs").exists()
+
+
+def test_ledger_save_is_atomic(ledger_path):
+    assert load_deployment_ledger(ledger_path) == {}
+    ledger = {'acct/DB': {'sql/a.sql': {'sha256': 'abc', 'status': 'success'}}}
+    save_deployment_ledger(ledger_path, ledger)
+
+    assert load_deployment_ledger(ledger_path) == ledger
+    assert [p.name for p in ledger_path.parent.iterdir()] == ['deployment_ledger.json']
+
+
+def test_execution_log_goes_to_log_dir_whatever_the_cwd(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    executor = SQLScriptExecutor(statement_retries=0, ledger_path=None, log_dir=tmp_path / "deploy" / "logs")
+    executor._save_execution_log(setup_datavelocity.datetime.now())
+
+    assert [p.name.startswith('sql_execution_') for p in (tmp_path / "deploy" / "logs").iterdir()] == [True]
+    assert not (tmp_path / "logs").exists()
+    assert setup_datavelocity.DEPLOYMENT_LEDGER_FILE.parent == setup_datavelocity.LOG_DIR
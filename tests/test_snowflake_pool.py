@@ -0,0 +1,213 @@
+import threading
+
+import pytest
+
+import utils.snowflake_connector as snowflake_connector
+from utils.snowflake_connector import SnowflakePool
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, query, params=None):
+        if self.connection.closed:
+            raise RuntimeError("connection is closed")
+        if self.connection.broken:
+            raise RuntimeError("connection reset")
+        self.connection.queries.append(query)
+
+    def fetchall(self):
+        return [(1,)]
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Just enough of a DB-API connection for the pool."""
+
+    def __init__(self, number):
+        self.number = number
+        self.closed = False
+        self.broken = False
+        self.queries = []
+
+    def cursor(self, cursor_class=None):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        if self.broken:
+            raise RuntimeError("connection reset")
+
+    def close(self):
+        self.closed = True
+
+
+class FakeDriver:
+    def __init__(self):
+        self.connections = []
+
+    def connect(self):
+        connection = FakeConnection(len(self.connections))
+        self.connections.append(connection)
+        return connection
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def driver():
+    return FakeDriver()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(snowflake_connector.time, 'monotonic', clock)
+    return clock
+
+
+def test_acquire_release_reuses_connection(driver):
+    pool = SnowflakePool(min_size=1, max_size=2, connect_fn=driver.connect)
+    assert len(driver.connections) == 1
+
+    first = pool.acquire()
+    pool.release(first)
+    second = pool.acquire()
+    pool.release(second)
+
+    assert first is second
+    assert len(driver.connections) == 1
+    assert first.queries == ["SELECT 1", "SELECT 1"]  # health check per checkout
+    assert pool.status()['reused'] == 2
+
+
+def test_acquire_opens_up_to_max_size_then_times_out(driver):
+    pool = SnowflakePool(min_size=0, max_size=2, connect_fn=driver.connect)
+    first, second = pool.acquire(), pool.acquire()
+    assert first is not second
+
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.05)
+    pool.release(first)
+    assert pool.acquire(timeout=0.05) is first
+
+
+def test_waiting_acquire_gets_released_connection(driver):
+    pool = SnowflakePool(min_size=0, max_size=1, connect_fn=driver.connect)
+    held = pool.acquire()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire(timeout=5)))
+    waiter.start()
+    pool.release(held)
+    waiter.join(5)
+
+    assert got == [held]
+    assert pool.status()['waits'] >= 1
+
+
+def test_release_rejects_foreign_connection(driver):
+    pool = SnowflakePool(min_size=0, max_size=1, connect_fn=driver.connect)
+    with pytest.raises(ValueError):
+        pool.release(FakeConnection(99))
+
+
+def test_idle_timeout_replaces_connection(driver, clock):
+    pool = SnowflakePool(min_size=0, max_size=2, idle_timeout=60, max_lifetime=None, connect_fn=driver.connect)
+    first = pool.acquire()
+    pool.release(first)
+
+    clock.now += 61
+    second = pool.acquire()
+
+    assert second is not first
+    assert first.closed
+    assert pool.status()['discarded'] == 1
+
+
+def test_idle_timeout_keeps_min_size(driver, clock):
+    pool = SnowflakePool(min_size=1, max_size=3, idle_timeout=60, max_lifetime=None, connect_fn=driver.connect)
+    first, second = pool.acquire(), pool.acquire()
+    pool.release(first)
+    pool.release(second)
+    assert pool.status()['idle'] == 2
+
+    clock.now += 61
+    pool.prune()
+
+    assert pool.status()['size'] == 1
+    assert sum(connection.closed for connection in (first, second)) == 1
+
+
+def test_max_lifetime_retires_connection_on_release(driver, clock):
+    pool = SnowflakePool(min_size=0, max_size=1, idle_timeout=None, max_lifetime=3600, connect_fn=driver.connect)
+    first = pool.acquire()
+    clock.now += 3601
+    pool.release(first)
+
+    assert first.closed
+    second = pool.acquire()
+    assert second is not first
+
+
+def test_unhealthy_connection_is_replaced(driver):
+    pool = SnowflakePool(min_size=1, max_size=1, connect_fn=driver.connect)
+    driver.connections[0].broken = True
+
+    raw = pool.acquire()
+
+    assert raw is driver.connections[1]
+    assert driver.connections[0].closed
+
+
+def test_failed_rollback_discards_connection(driver):
+    pool = SnowflakePool(min_size=0, max_size=1, connect_fn=driver.connect)
+    with pytest.raises(RuntimeError):
+        with pool.connection() as raw:
+            raw.broken = True
+            raise RuntimeError("query failed")
+
+    assert raw.closed
+    assert pool.status()['size'] == 0
+
+
+def test_failed_connect_frees_slot(driver):
+    attempts = []
+
+    def connect():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("login failed")
+        return driver.connect()
+
+    pool = SnowflakePool(min_size=0, max_size=1, connect_fn=connect)
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+    assert pool.acquire(timeout=0.05) is driver.connections[0]
+
+
+def test_close_while_checked_out(driver):
+    pool = SnowflakePool(min_size=2, max_size=2, connect_fn=driver.connect)
+    borrowed = pool.acquire()
+    idle = next(connection for connection in driver.connections if connection is not borrowed)
+
+    pool.close()
+
+    assert idle.closed
+    assert not borrowed.closed  # still in use by its borrower
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+    pool.release(borrowed)
+    assert borrowed.closed
+    assert pool.status()['size'] == 0
@@ -0,0 +1,88 @@
+import io
+import re
+
+import pytest
+
+from utils.sql_splitter import SqlStatement, split_sql
+
+
+def sqls(source):
+    return [statement.sql for statement in split_sql(source)]
+
+
+def test_splits_on_semicolons_and_drops_empty_statements():
+    assert sqls("SELECT 1;\n;\n  SELECT 2 ;  \nSELECT 3") == ["SELECT 1", "SELECT 2", "SELECT 3"]
+
+
+def test_comment_markers_and_semicolons_inside_literals_are_kept():
+    assert sqls("SELECT 'a--b;c' AS x; SELECT '//;/*' AS y;") == ["SELECT 'a--b;c' AS x", "SELECT '//;/*' AS y"]
+
+
+def test_quote_escapes_inside_literals():
+    assert sqls("SELECT 'it''s; fine';") == ["SELECT 'it''s; fine'"]
+    assert sqls(r"SELECT 'it\'s; fine'; SELECT 2;") == [r"SELECT 'it\'s; fine'", "SELECT 2"]
+    assert sqls(r"SELECT 'ends in backslash\\'; SELECT 2;") == [r"SELECT 'ends in backslash\\'", "SELECT 2"]
+
+
+def test_quoted_identifiers():
+    assert sqls('SELECT 1 AS "a""b;--c"; SELECT 2;') == ['SELECT 1 AS "a""b;--c"', "SELECT 2"]
+
+
+def test_dollar_quoted_bodies_are_kept_whole():
+    script = """
+CREATE OR REPLACE PROCEDURE P()
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+BEGIN
+    -- not a comment to the splitter
+    LET x := 'a;b';
+    RETURN x;  // nor this
+END;
+$$;
+CALL P();
+"""
+    statements = sqls(script)
+    assert len(statements) == 2
+    assert "-- not a comment to the splitter" in statements[0]
+    assert "RETURN x;  // nor this" in statements[0]
+    assert statements[0].endswith("END;\n$$")
+    assert statements[1] == "CALL P()"
+
+
+def test_comments_are_dropped():
+    script = "-- header; comment\nSELECT 1 /* inline ; */ + 2; // trailing ; comment\n/* multi\nline; */ SELECT 3;"
+    assert sqls(script) == ["SELECT 1   + 2", "SELECT 3"]
+
+
+def test_comment_only_source_has_no_statements():
+    assert sqls("-- nothing here;\n/* or; here */\n// or here;\n") == []
+
+
+def test_statement_lines():
+    script = "-- header\n\nSELECT 1;\nSELECT\n  2;\n\n/* c */ SELECT 'x\ny';\nSELECT 4"
+    assert list(split_sql(script)) == [
+        SqlStatement("SELECT 1", 3),
+        SqlStatement("SELECT\n  2", 4),
+        SqlStatement("SELECT 'x\ny'", 7),
+        SqlStatement("SELECT 4", 9),
+    ]
+
+
+def test_reads_lines_lazily_from_a_file():
+    source = io.StringIO("SELECT 1;\nSELECT 2;\n")
+    statements = split_sql(source)
+    assert next(statements) == SqlStatement("SELECT 1", 1)
+    assert next(statements) == SqlStatement("SELECT 2", 2)
+
+
+@pytest.mark.parametrize('script, what, line', [
+    ("SELECT 1;\nSELECT 'abc;", "string literal", 2),
+    ('SELECT "abc', "quoted identifier", 1),
+    ("SELECT 1;\n\nCREATE PROCEDURE P() AS $$ BEGIN", "$$ block", 3),
+    ("SELECT 1; /* never closed", "block comment", 1),
+])
+def test_unterminated_constructs_raise(script, what, line):
+    with pytest.raises(ValueError, match=rf"Unterminated {re.escape(what)} starting at line {line}"):
+        list(split_sql(script))
@@ -0,0 +1,213 @@
+import gzip
+import json
+import re
+
+import pytest
+
+from utils.upload_files_to_stage import LocalPutExecutor, stage_file_pattern, upload_all
+
+STAGE = "BRONZE.CSV_STG"
+JOBS = [("data/order", STAGE, "order"), ("data/menu", STAGE, "menu")]
+
+
+class FlakyPutExecutor(LocalPutExecutor):
+    """LocalPutExecutor whose PUTs of the named files fail (times=None: always)"""
+
+    def __init__(self, root, failing=(), times=None):
+        super().__init__(root)
+        self.failures = {name: times for name in failing}
+        self.puts = []
+
+    def put(self, local_path, stage_path, **kwargs):
+        self.puts.append(str(local_path))
+        name = str(local_path).rsplit('/', 1)[-1]
+        remaining = self.failures.get(name, 0)
+        if remaining is None or remaining > 0:
+            if remaining:
+                self.failures[name] = remaining - 1
+            raise ConnectionError(f"connection reset uploading {name}")
+        return super().put(local_path, stage_path, **kwargs)
+
+
+def write_csv(path, rows, width=40):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write("ID,PAYLOAD\n")
+        for i in range(rows):
+            f.write(f"{i},{'x' * width}\n")
+    return path
+
+
+@pytest.fixture
+def data_root(tmp_path):
+    root = tmp_path / "repo"
+    write_csv(root / "data/order/order.csv", 200)     # ~9 KB
+    write_csv(root / "data/menu/menu.csv", 20)        # ~1 KB
+    return root
+
+
+def stage_files(stage_root, table):
+    directory = stage_root / STAGE / table
+    return sorted(p.name for p in directory.iterdir()) if directory.exists() else []
+
+
+def run(data_root, executor, **options):
+    options.setdefault('chunk_mb', None)
+    return upload_all(JOBS, executor=executor, workers=2, data_root=data_root, retries=0, **options)
+
+
+def test_upload_copies_files_to_stage(data_root, tmp_path):
+    stage_root = tmp_path / "stage"
+    results = run(data_root, LocalPutExecutor(stage_root), use_manifest=False)
+
+    assert sorted(r['status'] for r in results) == ['UPLOADED', 'UPLOADED']
+    assert stage_files(stage_root, 'order') == ['order.csv']
+    assert (stage_root / STAGE / "order/order.csv").read_bytes() == (data_root / "data/order/order.csv").read_bytes()
+
+
+def test_large_csv_is_split_into_chunks(data_root, tmp_path):
+    stage_root = tmp_path / "stage"
+    run(data_root, LocalPutExecutor(stage_root), chunk_mb=2 / 1024)  # 2 KB chunks
+
+    chunks = stage_files(stage_root, 'order')
+    assert len(chunks) > 1 and all(name.startswith('order_part_') for name in chunks)
+    rows = sum(len((stage_root / STAGE / "order" / name).read_text().splitlines()) - 1 for name in chunks)
+    assert rows == 200
+    assert stage_files(stage_root, 'menu') == ['menu.csv']
+
+
+def test_invalid_parallel_is_rejected(data_root, tmp_path):
+    with pytest.raises(ValueError):
+        run(data_root, LocalPutExecutor(tmp_path / "stage"), parallel=100)
+
+
+def test_unchanged_files_are_skipped(data_root, tmp_path):
+    stage_root = tmp_path / "stage"
+    run(data_root, LocalPutExecutor(stage_root))
+    again = run(data_root, LocalPutExecutor(stage_root))
+    assert [r['status'] for r in again] == ['UNCHANGED', 'UNCHANGED']
+
+    write_csv(data_root / "data/menu/menu.csv", 30)
+    changed = run(data_root, LocalPutExecutor(stage_root))
+    assert {r['table']: r['status'] for r in changed} == {'order': 'UNCHANGED', 'menu': 'UPLOADED'}
+    assert len((stage_root / STAGE / "menu/menu.csv").read_text().splitlines()) == 31
+
+
+def test_force_replaces_staged_files(data_root, tmp_path):
+    stage_root = tmp_path / "stage"
+    run(data_root, LocalPutExecutor(stage_root))
+    (stage_root / STAGE / "order/order.csv").write_text("corrupt\n")
+
+    results = run(data_root, LocalPutExecutor(stage_root), force=True)
+
+    assert [r['status'] for r in results] == ['UPLOADED', 'UPLOADED']
+    assert (stage_root / STAGE / "order/order.csv").read_bytes() == (data_root / "data/order/order.csv").read_bytes()
+
+
+def test_files_kept_on_the_stage_are_not_recorded(data_root, tmp_path):
+    # Stage already holds files the (missing) manifest knows nothing about
+    stage_root = tmp_path / "stage"
+    (stage_root / STAGE / "order").mkdir(parents=True)
+    (stage_root / STAGE / "order/order.csv").write_text("old\n")
+
+    results = run(data_root, LocalPutExecutor(stage_root))
+
+    assert {r['table']: r['status'] for r in results} == {'order': 'SKIPPED', 'menu': 'UPLOADED'}
+    manifest = json.loads((data_root / "data/upload_manifest.json").read_text())
+    assert list(manifest) == [f"@{STAGE}/menu/menu.csv"]
+
+    forced = run(data_root, LocalPutExecutor(stage_root), force=True)
+    assert [r['status'] for r in forced] == ['UPLOADED', 'UPLOADED']
+    assert (stage_root / STAGE / "order/order.csv").read_bytes() == (data_root / "data/order/order.csv").read_bytes()
+
+
+def test_fewer_chunks_removes_superseded_chunks(data_root, tmp_path):
+    stage_root = tmp_path / "stage"
+    run(data_root, LocalPutExecutor(stage_root), chunk_mb=1 / 1024)
+    before = stage_files(stage_root, 'order')
+
+    write_csv(data_root / "data/order/order.csv", 50)
+    run(data_root, LocalPutExecutor(stage_root), chunk_mb=1 / 1024)
+    after = stage_files(stage_root, 'order')
+
+    assert len(after) < len(before)
+    rows = sum(len((stage_root / STAGE / "order" / name).read_text().splitlines()) - 1 for name in after)
+    assert rows == 50
+
+    # Back to a whole file: every chunk goes
+    write_csv(data_root / "data/order/order.csv", 10)
+    run(data_root, LocalPutExecutor(stage_root), chunk_mb=1 / 1024)
+    assert stage_files(stage_root, 'order') == ['order.csv']
+
+
+def test_stage_file_pattern_matches_exact_names():
+    pattern = re.compile(stage_file_pattern(['order.csv', 'order_part_001.csv']))
+
+    assert pattern.fullmatch('order/order.csv')
+    assert pattern.fullmatch('order_part_001.csv')
+    assert not pattern.fullmatch('order/order_item.csv')
+    assert not pattern.fullmatch('order/orderXcsv')
+
+
+def test_codec_is_recorded_after_a_clean_run(data_root, tmp_path):
+    stage_root = tmp_path / "stage"
+    run(data_root, LocalPutExecutor(stage_root))
+
+    assert json.loads((stage_root / "file_format_master.json").read_text()) == {
+        f"@{STAGE}/menu/": 'NONE', f"@{STAGE}/order/": 'NONE'}
+
+
+def test_codec_switch_removes_previous_codec_files(data_root, tmp_path):
+    stage_root = tmp_path / "stage"
+    run(data_root, LocalPutExecutor(stage_root))
+    run(data_root, LocalPutExecutor(stage_root), codec='gzip')
+
+    assert stage_files(stage_root, 'order') == ['order.csv.gz']
+    assert gzip.decompress((stage_root / STAGE / "order/order.csv.gz").read_bytes()) == \
+        (data_root / "data/order/order.csv").read_bytes()
+    manifest = json.loads((data_root / "data/upload_manifest.json").read_text())
+    assert sorted(manifest) == [f"@{STAGE}/menu/menu.csv.gz", f"@{STAGE}/order/order.csv.gz"]
+    assert json.loads((stage_root / "file_format_master.json").read_text())[f"@{STAGE}/order/"] == 'GZIP'
+
+
+def test_unknown_codec_is_rejected(data_root, tmp_path):
+    with pytest.raises(ValueError):
+        run(data_root, LocalPutExecutor(tmp_path / "stage"), codec='brotli')
+
+
+def test_failure_then_resume_uploads_only_the_rest(data_root, tmp_path):
+    stage_root = tmp_path / "stage"
+    flaky = FlakyPutExecutor(stage_root, failing=['order.csv'])
+    results = run(data_root, flaky)
+
+    assert {r['table']: r['status'] for r in results} == {'order': 'ERROR', 'menu': 'UPLOADED'}
+    assert not (stage_root / "file_format_master.json").exists()  # only recorded after a clean run
+    journal = json.loads((data_root / "data/upload_journal.json").read_text())
+    assert sorted(entry['status'] for entry in journal['files'].values()) == ['DONE', 'FAILED']
+    manifest = json.loads((data_root / "data/upload_manifest.json").read_text())
+    assert list(manifest) == [f"@{STAGE}/menu/menu.csv"]
+
+    retry = FlakyPutExecutor(stage_root)
+    resumed = run(data_root, retry, resume=True)
+
+    assert [(r['table'], r['status']) for r in resumed] == [('order', 'UPLOADED')]
+    assert [p.rsplit('/', 1)[-1] for p in retry.puts] == ['order.csv']
+    manifest = json.loads((data_root / "data/upload_manifest.json").read_text())
+    assert sorted(manifest) == [f"@{STAGE}/menu/menu.csv", f"@{STAGE}/order/order.csv"]
+
+
+def test_transient_failure_is_retried(data_root, tmp_path, monkeypatch):
+    monkeypatch.setattr('utils.upload_files_to_stage.time.sleep', lambda seconds: None)
+    stage_root = tmp_path / "stage"
+    flaky = FlakyPutExecutor(stage_root, failing=['menu.csv'], times=1)
+    results = upload_all(JOBS, executor=flaky, workers=1, data_root=data_root, chunk_mb=None, retries=2)
+
+    assert {r['table']: (r['status'], r['attempts']) for r in results} == {
+        'order': ('UPLOADED', 1), 'menu': ('UPLOADED', 2)}
+
+
+def test_resume_without_journal_is_rejected(data_root, tmp_path):
+    with pytest.raises(ValueError):
+        run(data_root, LocalPutExecutor(tmp_path / "stage"), resume=True, use_journal=False)
+    with pytest.raises(FileNotFoundError):
+        run(data_root, LocalPutExecutor(tmp_path / "stage"), resume=True)
@@ -0,0 +1,286 @@
+"""
+Direct ingestion into Bronze tables, without files or a stage.
+
+The batch path is CSV → PUT → SP_*_STAGE_TO_BRONZE (COPY INTO). For small,
+frequent increments the stage round trip and file listing dominate, so this
+client streams Arrow record batches straight into the Bronze table instead:
+
+    source (generator / CSV / Parquet) → Arrow batches → bulk_load: write_pandas (Snowflake)
+                                                                   INSERT BY NAME (DuckDB)
+
+The target is looked up in COMMON.TARGET_TABLE_MAPPING through the source's
+SOURCE_FILE_CONFIG row (default <TABLE>_BATCH). enable_raw_columns fills the
+*_RAW columns from the typed values, and enable_audit_columns stamps
+INGEST_RUN_ID (from BRONZE.SEQ_<ENTITY>_INGEST_RUN_ID), CREATED_AT and
+UPDATED_AT, the same way V_BRONZE_COPY_SQL's bronze_insert_sql does.
+Columns the Bronze table doesn't have are dropped.
+
+DuckDBBronzeWriter runs the same calls against utils.duckdb_backend's
+DuckDBConnection, bootstrapped with the metadata tables and Bronze DDL from
+the repo's SQL files, so the whole path can run without a Snowflake account.
+
+Usage:
+    python -m utils.bronze_stream_ingest --table order --source generate --rows 200000 --duckdb /tmp/dv.duckdb
+    python -m utils.bronze_stream_ingest --table delivery --source csv
+    python -m utils.bronze_stream_ingest --table order --source parquet --path data_parquet/order
+"""
+import argparse
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from utils.csv_to_parquet import BASE_DIR, _open_csv_stream, schema_for_table
+from utils.duckdb_backend import ingest_sequence_name
+from utils.generate_food_delivery_data import SCALE_PROFILES, DEFAULT_PROFILE, SEED, TABLE_SPECS, table_rows
+
+REPO_ROOT = Path(__file__).parent.parent
+DEFAULT_CHUNK_ROWS = 250_000
+AUDIT_COLUMNS = ['INGEST_RUN_ID', 'CREATED_AT', 'UPDATED_AT']
+
+TARGET_MAPPING_SQL = """
+    SELECT ttm.bronze_table, ttm.load_error_table, ttm.load_type, ttm.primary_key_fields,
+           ttm.enable_raw_columns, ttm.enable_audit_columns
+    FROM COMMON.TARGET_TABLE_MAPPING ttm
+    JOIN COMMON.SOURCE_FILE_CONFIG sfc ON sfc.source_id = ttm.source_id
+    WHERE UPPER(sfc.source_name) = UPPER(%s)
+      AND ttm.active_flag = 'Y'
+"""
+
+TABLE_COLUMNS_SQL = """
+    SELECT column_name
+    FROM information_schema.columns
+    WHERE UPPER(table_schema) = UPPER(%s) AND UPPER(table_name) = UPPER(%s)
+    ORDER BY ordinal_position
+"""
+
+
+def split_table_name(qualified):
+    """'BRONZE.ORDER_BRZ' -> ('BRONZE', 'ORDER_BRZ')"""
+    schema, _, table = qualified.rpartition('.')
+    return schema or 'BRONZE', table
+
+
+# ===== WRITERS =====
+class SnowflakeBronzeWriter:
+    """Writes Arrow tables to Snowflake with write_pandas (Parquet upload + COPY under the hood)."""
+
+    def __init__(self, sf=None, parallel=4, compression='snappy'):
+        if sf is None:
+            from utils.snowflake_connector import SnowflakeConnection
+            sf = SnowflakeConnection()
+            sf.connect()
+        self.sf = sf
+        self.parallel = parallel
+        self.compression = compression
+
+    def fetch(self, sql, params=None):
+        return self.sf.execute_query(sql, params)
+
+    def next_ingest_run_id(self, sequence_name):
+        return self.fetch(f"SELECT {sequence_name}.NEXTVAL")[0][0]
+
+    def write(self, table, target, chunk_rows):
+        result = self.sf.bulk_load(table, target, chunk_size=chunk_rows, parallel=self.parallel,
+                                  compression=self.compression)
+        if not result['success']:
+            raise RuntimeError(f"write_pandas into {target} reported failure")
+        return result['rows']
+
+    def close(self):
+        self.sf.close()
+
+
+class DuckDBBronzeWriter(SnowflakeBronzeWriter):
+    """
+    Local stand-in for SnowflakeBronzeWriter: the same calls against a
+    DuckDBConnection bootstrapped with the metadata and Bronze tables.
+    """
+
+    def __init__(self, path=':memory:', repo_root=REPO_ROOT):
+        from utils.duckdb_backend import DuckDBConnection
+
+        sf = DuckDBConnection(path, bootstrap=True, repo_root=repo_root)
+        sf.connect()
+        super().__init__(sf)
+
+
+# ===== SOURCES =====
+def _rebatch(batches, chunk_rows):
+    """Regroup record batches into Arrow tables of about chunk_rows rows"""
+    pending, pending_rows = [], 0
+    for batch in batches:
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        if pending_rows >= chunk_rows:
+            yield pa.Table.from_batches(pending)
+            pending, pending_rows = [], 0
+    if pending:
+        yield pa.Table.from_batches(pending)
+
+
+def generated_batches(table, counts, chunk_rows=DEFAULT_CHUNK_ROWS, seed=SEED, distributions=None):
+    """Arrow tables straight from the generator (all string columns, like the CSV it would write)"""
+    fields = TABLE_SPECS[table]['fields']
+    schema = pa.schema([(field, pa.string()) for field in fields])
+    rows = table_rows(table, counts, seed, distributions)
+    while True:
+        chunk = [row for _, row in zip(range(chunk_rows), rows)]
+        if not chunk:
+            return
+        columns = {field: [None if row[field] in (None, '') else str(row[field]) for row in chunk] for field in fields}
+        yield pa.table(columns, schema=schema)
+
+
+def csv_batches(table, csv_path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Typed Arrow tables from a generated CSV (schema from csv_to_parquet)"""
+    return _rebatch(_open_csv_stream(csv_path, schema_for_table(table)), chunk_rows)
+
+
+def parquet_batches(path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Arrow tables from a Parquet file or directory (flat or Hive-partitioned)"""
+    dataset = ds.dataset(path, format='parquet', partitioning='hive')
+    partition_columns = {'year', 'month', 'day'} & set(dataset.schema.names)
+    columns = [name for name in dataset.schema.names if name not in partition_columns]
+    return _rebatch(dataset.to_batches(columns=columns, batch_size=chunk_rows), chunk_rows)
+
+
+# ===== INGESTION =====
+def lookup_target(writer, source_name):
+    """TARGET_TABLE_MAPPING row for a source, as a dict"""
+    rows = writer.fetch(TARGET_MAPPING_SQL, (source_name,))
+    if not rows:
+        raise ValueError(f"No active TARGET_TABLE_MAPPING row for source '{source_name}'")
+    keys = ['bronze_table', 'load_error_table', 'load_type', 'primary_key_fields',
+            'enable_raw_columns', 'enable_audit_columns']
+    return dict(zip(keys, rows[0]))
+
+
+def shape_for_bronze(table, target_columns, mapping, ingest_run_id, loaded_at):
+    """
+    Align an Arrow table with the Bronze table's columns.
+
+    Adds *_RAW mirrors and audit columns when the mapping enables them and
+    drops columns Bronze doesn't have. Returns (table, dropped column names).
+    """
+    columns = {name.upper(): table.column(name) for name in table.column_names}
+    target_set = set(target_columns)
+
+    if (mapping['enable_raw_columns'] or '').upper() == 'Y':
+        for name in list(columns):
+            raw = f"{name}_RAW"
+            if raw in target_set and raw not in columns:
+                columns[raw] = pc.cast(columns[name], pa.string())
+
+    if (mapping['enable_audit_columns'] or '').upper() == 'Y':
+        n = table.num_rows
+        if 'INGEST_RUN_ID' in target_set:
+            columns['INGEST_RUN_ID'] = pa.array([ingest_run_id] * n, pa.int64())
+        for name in ('CREATED_AT', 'UPDATED_AT'):
+            if name in target_set:
+                columns[name] = pa.array([loaded_at] * n, pa.string())
+
+    keep = [name for name in target_columns if name in columns]
+    dropped = sorted(set(columns) - target_set)
+    return pa.table({name: columns[name] for name in keep}), dropped
+
+
+def ingest(writer, batches, source_name, chunk_rows=DEFAULT_CHUNK_ROWS, ingest_run_id=None):
+    """
+    Stream Arrow tables into the Bronze table mapped to source_name.
+
+    Args:
+        writer: SnowflakeBronzeWriter or DuckDBBronzeWriter
+        batches: Iterable of pyarrow.Table
+        source_name: SOURCE_FILE_CONFIG.source_name (e.g. ORDER_BATCH)
+        chunk_rows: Rows per write_pandas chunk / DuckDB insert
+        ingest_run_id: Audit run id (default: next value of the table's sequence)
+
+    Returns:
+        Dict with bronze_table, ingest_run_id, rows, batches, dropped_columns, elapsed_sec, rows_per_sec
+    """
+    mapping = lookup_target(writer, source_name)
+    bronze_table = mapping['bronze_table']
+    schema, name = split_table_name(bronze_table)
+    target_columns = [row[0].upper() for row in writer.fetch(TABLE_COLUMNS_SQL, (schema, name))]
+    if not target_columns:
+        raise ValueError(f"Bronze table {bronze_table} not found")
+
+    if ingest_run_id is None and (mapping['enable_audit_columns'] or '').upper() == 'Y':
+        ingest_run_id = writer.next_ingest_run_id(ingest_sequence_name(bronze_table))
+    loaded_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    start = time.time()
+    rows = 0
+    batch_count = 0
+    dropped = set()
+    for batch in batches:
+        shaped, batch_dropped = shape_for_bronze(batch, target_columns, mapping, ingest_run_id, loaded_at)
+        dropped.update(batch_dropped)
+        rows += writer.write(shaped, bronze_table, chunk_rows)
+        batch_count += 1
+        print(f"   ➜ {bronze_table}: {rows:,} rows")
+
+    elapsed = time.time() - start
+    return {
+        'source_name': source_name,
+        'bronze_table': bronze_table,
+        'ingest_run_id': ingest_run_id,
+        'rows': rows,
+        'batches': batch_count,
+        'dropped_columns': sorted(dropped),
+        'elapsed_sec': round(elapsed, 3),
+        'rows_per_sec': round(rows / elapsed) if elapsed else None,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Stream records straight into Bronze tables")
+    parser.add_argument('--table', required=True, choices=list(TABLE_SPECS), help="Generator table to ingest")
+    parser.add_argument('--source', choices=['generate', 'csv', 'parquet'], default='csv',
+                        help="Where records come from (default: csv)")
+    parser.add_argument('--path', help="CSV file or Parquet file/directory (default: the table's file under data/)")
+    parser.add_argument('--rows', type=int, help="Rows to generate with --source generate (default: profile count)")
+    parser.add_argument('--profile', choices=list(SCALE_PROFILES), default=DEFAULT_PROFILE,
+                        help="Parent row counts for --source generate")
+    parser.add_argument('--source-name', help="SOURCE_FILE_CONFIG source_name (default: <TABLE>_BATCH)")
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS,
+                        help=f"Rows per write (default: {DEFAULT_CHUNK_ROWS:,})")
+    parser.add_argument('--duckdb', help="Write to this local DuckDB database instead of Snowflake")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    source_name = args.source_name or f"{args.table.upper()}_BATCH"
+
+    if args.source == 'generate':
+        counts = dict(SCALE_PROFILES[args.profile])
+        if args.rows:
+            counts[args.table] = args.rows
+        batches = generated_batches(args.table, counts, args.chunk_rows)
+    elif args.source == 'csv':
+        path = args.path or BASE_DIR / args.table / TABLE_SPECS[args.table]['file']
+        batches = csv_batches(args.table, path, args.chunk_rows)
+    else:
+        batches = parquet_batches(args.path or BASE_DIR.parent / 'data_parquet' / args.table, args.chunk_rows)
+
+    writer = DuckDBBronzeWriter(args.duckdb) if args.duckdb else SnowflakeBronzeWriter()
+    print(f"\n🚀 Streaming {args.table} ({args.source}) → {source_name} "
+          f"[{'DuckDB ' + args.duckdb if args.duckdb else 'Snowflake'}]\n")
+    try:
+        result = ingest(writer, batches, source_name, args.chunk_rows)
+    finally:
+        writer.close()
+
+    print(f"\n✅ {result['rows']:,} rows into {result['bronze_table']} in {result['elapsed_sec']:.1f}s "
+          f"({result['rows_per_sec'] or 0:,} rows/s, INGEST_RUN_ID={result['ingest_run_id']})")
+    if result['dropped_columns']:
+        print(f"⚠️  Not in {result['bronze_table']}, dropped: {', '.join(result['dropped_columns'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,417 @@
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
 from pathlib import Path
 import pandas as pd
 import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.dataset as ds
 import pyarrow.parquet as pq
 
+from utils.generate_food_delivery_data import TABLE_SPECS
+
 BASE_DIR = Path(__file__).parent.parent / "data"
 
+# ===== EXPLICIT COLUMN TYPES =====
+# Types for every column written by generate_food_delivery_data.py. Columns not
+# listed here (and all *_RAW columns) are read as strings, so a chunk can never
+# change the schema half-way through a file.
+MONEY = pa.decimal128(10, 2)
+COLUMN_TYPES = {
+    # Keys
+    'LOCATION_BRZ_ID': pa.int64(),
+    'RESTAURANT_BRZ_ID': pa.int64(),
+    'CUSTOMER_BRZ_ID': pa.int64(),
+    'CUSTOMER_ADDRESS_BRZ_ID': pa.int64(),
+    'MENU_ID': pa.int64(),
+    'DELIVERY_AGENT_ID': pa.int64(),
+    'ORDER_ID': pa.string(),
+    'ORDER_ITEM_ID': pa.string(),
+    'DELIVERY_ID': pa.string(),
+    'CUSTOMER_ID': pa.int64(),
+    'RESTAURANT_ID': pa.int64(),
+    'LOCATION_ID': pa.int64(),
+    'CUSTOMER_ADDRESS_ID': pa.int64(),
+    # Numbers
+    'FSSAI_REGISTRATION_NO': pa.int64(),
+    'PRICING_FOR_TWO': pa.int64(),
+    'LATITUDE': pa.float64(),
+    'LONGITUDE': pa.float64(),
+    'FLAT_NO': pa.int64(),
+    'HOUSE_NO': pa.int64(),
+    'FLOOR_NO': pa.int64(),
+    'ZIPCODE': pa.int64(),
+    'PHONE': pa.int64(),
+    'RATING': pa.float64(),
+    'QUANTITY': pa.int64(),
+    'PRICE': MONEY,
+    'SUBTOTAL': MONEY,
+    'TOTAL_AMOUNT': MONEY,
+    # Dates and timestamps
+    'DOB': pa.date32(),
+    'ANNIVERSARY': pa.date32(),
+    'ORDER_DATE': pa.date32(),
+    'ORDER_TIMESTAMP': pa.date32(),
+    'DELIVERY_DATE': pa.timestamp('s', tz='UTC'),
+    'CREATED_AT': pa.timestamp('s'),
+    'UPDATED_AT': pa.timestamp('s'),
+}
+
+# Low-cardinality columns that benefit from Parquet dictionary encoding
+DICTIONARY_COLUMNS = [
+    'CITY', 'STATE', 'CUISINE_TYPE', 'PRICING_FOR_TWO', 'OPERATING_HOURS', 'ACTIVE_FLAG', 'OPEN_STATUS',
+    'LOGIN_BY_USING', 'GENDER', 'LANDMARK', 'PRIMARYFLAG', 'ADDRESSTYPE', 'ITEM_NAME', 'DESCRIPTION',
+    'CATEGORY', 'AVAILABILITY', 'ITEM_TYPE', 'VEHICLE_TYPE', 'IS_ACTIVE', 'ORDER_STATUS', 'PAYMENT_METHOD',
+    'DELIVERY_STATUS', 'ESTIMATED_TIME', 'DELIVERY_STATUS_RAW', 'ESTIMATED_TIME_RAW', 'INGEST_RUN_ID',
+]
+
+COMPRESSION_CODECS = ['zstd', 'snappy', 'gzip', 'lz4', 'none']
+
+DEFAULT_ROW_GROUP_SIZE = 1_000_000
+DEFAULT_BLOCK_SIZE = 16 * 1024 * 1024  # Bytes of CSV parsed per streaming batch
+
+# Date column each fact table is Hive-partitioned on (year=/month=/day=)
+PARTITION_COLUMNS = {
+    'order': 'ORDER_DATE',
+    'order_item': 'ORDER_TIMESTAMP',
+    'delivery': 'DELIVERY_DATE',
+}
+PARTITION_FIELDS = pa.schema([('year', pa.int16()), ('month', pa.int8()), ('day', pa.int8())])
+FILE_STATS_FILE = "_file_stats.json"
+
+# COMMON.DATA_FIELD_MASTER.data_type -> Arrow type
+FIELD_MASTER_TYPES = {
+    'VARCHAR': pa.string(),
+    'INTEGER': pa.int64(),
+    'DATE': pa.date32(),
+    'TIMESTAMP': pa.timestamp('s'),
+    'BOOLEAN': pa.bool_(),
+}
+
+
+def column_type(column):
+    """Arrow type for a generated CSV column (strings unless typed in COLUMN_TYPES)"""
+    if column.endswith('_RAW'):
+        return pa.string()
+    return COLUMN_TYPES.get(column, pa.string())
+
+
+def schema_for_table(table):
+    """Explicit Arrow schema for a table, built from the generator's column list"""
+    if table not in TABLE_SPECS:
+        raise ValueError(f"Unknown table '{table}', expected one of {list(TABLE_SPECS)}")
+    return pa.schema([(column, column_type(column)) for column in TABLE_SPECS[table]['fields']])
+
+
+def schema_from_field_master(sf, columns):
+    """
+    Build an Arrow schema from COMMON.DATA_FIELD_MASTER.
+
+    Args:
+        sf: SnowflakeConnection
+        columns: CSV column names in file order; columns missing from the
+            field master (e.g. *_RAW and audit columns) fall back to column_type()
+
+    Returns:
+        pyarrow.Schema
+    """
+    rows = sf.execute_query(
+        "SELECT FIELD_NAME, DATA_TYPE, PRECISION, SCALE FROM COMMON.DATA_FIELD_MASTER"
+    )
+    field_types = {}
+    for field_name, data_type, precision, scale in rows:
+        data_type = (data_type or '').upper()
+        if data_type == 'NUMBER':
+            field_types[field_name.upper()] = pa.decimal128(precision or 38, scale or 0)
+        elif data_type in FIELD_MASTER_TYPES:
+            field_types[field_name.upper()] = FIELD_MASTER_TYPES[data_type]
+
+    return pa.schema([(column, field_types.get(column.upper(), column_type(column))) for column in columns])
+
+
+def _open_csv_stream(csv_path, schema, block_size=DEFAULT_BLOCK_SIZE):
+    """Streaming CSV reader that parses straight into the given schema"""
+    return pa_csv.open_csv(
+        csv_path,
+        read_options=pa_csv.ReadOptions(block_size=block_size),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={field.name: field.type for field in schema},
+            include_columns=schema.names,
+            null_values=[''],
+            strings_can_be_null=True,
+        ),
+    )
+
+
+def part_path(parquet_path, part_number):
+    """Path of part N for a split output: orders.parquet -> orders-part-00000.parquet"""
+    parquet_path = Path(parquet_path)
+    return parquet_path.with_name(f"{parquet_path.stem}-part-{part_number:05d}{parquet_path.suffix}")
+
+
+class _RollingParquetWriter:
+    """Writes row groups to parquet_path, or to numbered parts of roughly target_part_bytes each"""
+
+    def __init__(self, parquet_path, schema, writer_options, target_part_bytes=None):
+        self.parquet_path = Path(parquet_path)
+        self.schema = schema
+        self.writer_options = writer_options
+        self.target_part_bytes = target_part_bytes
+        self.files = []
+        self._sink = None
+        self._writer = None
+
+    def _open(self):
+        path = self.parquet_path if not self.target_part_bytes else part_path(self.parquet_path, len(self.files))
+        self._sink = pa.OSFile(str(path), 'wb')
+        self._writer = pq.ParquetWriter(self._sink, self.schema, **self.writer_options)
+        self.files.append(path)
+
+    def write(self, table, row_group_size):
+        # One row group at a time so a part can be closed as soon as it reaches its target size
+        for offset in range(0, max(table.num_rows, 1), row_group_size):
+            if self._writer is None:
+                self._open()
+            self._writer.write_table(table.slice(offset, row_group_size), row_group_size=row_group_size)
+            # Row groups are flushed on write, so tell() is the part's current size
+            if self.target_part_bytes and self._sink.tell() >= self.target_part_bytes:
+                self.close()
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._sink.close()
+            self._writer = None
+            self._sink = None
+
+
+def csv_to_parquet_arrow(csv_path, parquet_path, schema, row_group_size=DEFAULT_ROW_GROUP_SIZE,
+                         compression='zstd', compression_level=None, dictionary_columns=None,
+                         block_size=DEFAULT_BLOCK_SIZE, target_part_bytes=None):
+    """
+    Convert a CSV to Parquet with pyarrow's streaming CSV reader.
+
+    The CSV is parsed straight into Arrow record batches with a fixed schema, so
+    there is no pandas copy and no per-chunk type inference. Batches are
+    buffered until row_group_size rows, then written as one row group.
+
+    Args:
+        csv_path: Input CSV (with header)
+        parquet_path: Output Parquet file
+        schema: pyarrow.Schema with the CSV's columns in file order
+        row_group_size: Rows per Parquet row group
+        compression: One of COMPRESSION_CODECS
+        compression_level: Optional codec level (e.g. 1-22 for zstd)
+        dictionary_columns: Columns to dictionary-encode (default: DICTIONARY_COLUMNS present in schema)
+        block_size: Bytes of CSV per streaming read
+        target_part_bytes: If set, split the output into <stem>-part-NNNNN.parquet
+            files of roughly this size (rounded up to whole row groups)
+
+    Returns:
+        Dict with rows, row_groups, files, input/output bytes and elapsed seconds
+    """
+    if compression not in COMPRESSION_CODECS:
+        raise ValueError(f"Unknown compression '{compression}', expected one of {COMPRESSION_CODECS}")
+
+    csv_path, parquet_path = Path(csv_path), Path(parquet_path)
+    if dictionary_columns is None:
+        dictionary_columns = [c for c in DICTIONARY_COLUMNS if c in schema.names]
+
+    start = time.time()
+    reader = _open_csv_stream(csv_path, schema, block_size)
+    writer = _RollingParquetWriter(
+        parquet_path,
+        schema,
+        writer_options={
+            'compression': None if compression == 'none' else compression,
+            'compression_level': compression_level,
+            'use_dictionary': dictionary_columns or False,
+            'write_statistics': True,
+        },
+        target_part_bytes=target_part_bytes,
+    )
+
+    rows = 0
+    row_groups = 0
+    pending = []
+    pending_rows = 0
+    try:
+        for batch in reader:
+            pending.append(batch)
+            pending_rows += batch.num_rows
+            if pending_rows >= row_group_size:
+                table = pa.Table.from_batches(pending, schema=schema)
+                writer.write(table, row_group_size)
+                row_groups += -(-table.num_rows // row_group_size)
+                rows += table.num_rows
+                pending, pending_rows = [], 0
+
+        if pending or not writer.files:
+            table = pa.Table.from_batches(pending, schema=schema)
+            writer.write(table, row_group_size)
+            row_groups += -(-table.num_rows // row_group_size)
+            rows += table.num_rows
+    finally:
+        writer.close()
+
+    return {
+        'rows': rows,
+        'row_groups': row_groups,
+        'files': [str(path) for path in writer.files],
+        'input_bytes': csv_path.stat().st_size,
+        'output_bytes': sum(path.stat().st_size for path in writer.files),
+        'elapsed_sec': round(time.time() - start, 3),
+    }
+
+
+def _stat_value(value):
+    """JSON-friendly form of a Parquet min/max statistic"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='replace')
+    return str(value)
+
+
+def file_column_stats(metadata):
+    """
+    Per-column min/max/null_count over all row groups of a Parquet file.
+
+    Args:
+        metadata: pyarrow.parquet.FileMetaData
+
+    Returns:
+        {column: {'min', 'max', 'null_count'}} for columns with statistics
+    """
+    stats = {}
+    for rg in range(metadata.num_row_groups):
+        row_group = metadata.row_group(rg)
+        for c in range(row_group.num_columns):
+            column = row_group.column(c)
+            col_stats = column.statistics
+            if col_stats is None or not col_stats.has_min_max:
+                continue
+            entry = stats.setdefault(column.path_in_schema, {'min': col_stats.min, 'max': col_stats.max,
+                                                              'null_count': 0})
+            entry['min'] = min(entry['min'], col_stats.min)
+            entry['max'] = max(entry['max'], col_stats.max)
+            entry['null_count'] += col_stats.null_count or 0
+    return {column: {key: _stat_value(value) for key, value in entry.items()} for column, entry in stats.items()}
+
+
+def _with_partition_columns(batches, partition_column):
+    """Append year/month/day columns derived from partition_column to each batch"""
+    for batch in batches:
+        dates = batch.column(batch.schema.get_field_index(partition_column))
+        yield pa.RecordBatch.from_arrays(
+            batch.columns + [
+                pc.cast(pc.year(dates), pa.int16()),
+                pc.cast(pc.month(dates), pa.int8()),
+                pc.cast(pc.day(dates), pa.int8()),
+            ],
+            schema=pa.schema(list(batch.schema) + list(PARTITION_FIELDS)),
+        )
+
+
+def csv_to_parquet_partitioned(csv_path, output_dir, schema, partition_column,
+                               row_group_size=DEFAULT_ROW_GROUP_SIZE, compression='zstd',
+                               compression_level=None, dictionary_columns=None,
+                               block_size=DEFAULT_BLOCK_SIZE, basename=None):
+    """
+    Convert a CSV to a Hive-partitioned Parquet dataset (year=YYYY/month=M/day=D).
+
+    Partition values are taken from partition_column (a date or timestamp;
+    timestamps are bucketed by their UTC day). The partition columns live only
+    in the directory names, so readers should use hive partitioning
+    (pyarrow.dataset, DuckDB hive_partitioning=1, Snowflake PARTITION BY on
+    the external table). Each file's per-column min/max is collected from its
+    footer into the result, so loaders can pick files without opening them.
+
+    Args:
+        csv_path: Input CSV (with header)
+        output_dir: Dataset root for this table
+        schema: pyarrow.Schema with the CSV's columns in file order
+        partition_column: Date/timestamp column to partition on
+        row_group_size: Maximum rows per row group (days with fewer rows get one row group)
+        compression: One of COMPRESSION_CODECS
+        compression_level: Optional codec level
+        dictionary_columns: Columns to dictionary-encode (default: DICTIONARY_COLUMNS present in schema)
+        block_size: Bytes of CSV per streaming read
+        basename: File name prefix inside each partition (default: CSV stem)
+
+    Returns:
+        Dict with rows, row_groups, files, partitions, file_stats, input/output bytes and elapsed seconds
+    """
+    if compression not in COMPRESSION_CODECS:
+        raise ValueError(f"Unknown compression '{compression}', expected one of {COMPRESSION_CODECS}")
+    if partition_column not in schema.names:
+        raise ValueError(f"Partition column '{partition_column}' is not in the schema")
+
+    csv_path, output_dir = Path(csv_path), Path(output_dir)
+    if dictionary_columns is None:
+        dictionary_columns = [c for c in DICTIONARY_COLUMNS if c in schema.names]
+    basename = basename or csv_path.stem
+
+    start = time.time()
+    reader = _open_csv_stream(csv_path, schema, block_size)
+    batches = pa.RecordBatchReader.from_batches(
+        pa.schema(list(schema) + list(PARTITION_FIELDS)),
+        _with_partition_columns(reader, partition_column),
+    )
+
+    written = []
+    ds.write_dataset(
+        batches,
+        output_dir,
+        format='parquet',
+        partitioning=ds.partitioning(PARTITION_FIELDS, flavor='hive'),
+        basename_template=f"{basename}-part-{{i}}.parquet",
+        existing_data_behavior='overwrite_or_ignore',
+        file_options=ds.ParquetFileFormat().make_write_options(
+            compression=None if compression == 'none' else compression,
+            compression_level=compression_level,
+            use_dictionary=dictionary_columns or False,
+            write_statistics=True,
+        ),
+        # Buffer rows per partition so small days still get one row group instead of one per CSV block
+        min_rows_per_group=row_group_size,
+        max_rows_per_group=row_group_size,
+        file_visitor=written.append,
+    )
+
+    files = []
+    file_stats = []
+    rows = 0
+    row_groups = 0
+    for written_file in sorted(written, key=lambda w: w.path):
+        metadata = written_file.metadata
+        rows += metadata.num_rows
+        row_groups += metadata.num_row_groups
+        files.append(written_file.path)
+        file_stats.append({
+            'file': str(Path(written_file.path).relative_to(output_dir)),
+            'rows': metadata.num_rows,
+            'bytes': written_file.size,
+            'columns': file_column_stats(metadata),
+        })
+
+    return {
+        'rows': rows,
+        'row_groups': row_groups,
+        'files': files,
+        'partitions': len({str(Path(f).parent) for f in files}),
+        'file_stats': file_stats,
+        'input_bytes': csv_path.stat().st_size,
+        'output_bytes': sum(Path(f).stat().st_size for f in files),
+        'elapsed_sec': round(time.time() - start, 3),
+    }
+
+
 def csv_to_parquet_large(csv_path, parquet_path, chunksize=100_000):
     writer = None
 
@@ -23,10 +430,323 @@ def csv_to_parquet_large(csv_path, parquet_path, chunksize=100_000):
     if writer:
         writer.close()
 
-csv_to_parquet_large(
-    BASE_DIR / "delivery" / "delivery_brz.csv",
-    BASE_DIR / "delivery" / "delivery.parquet"
-)
 
-df = pd.read_parquet(BASE_DIR / "delivery" / "delivery.parquet", engine="pyarrow")
-print(df.head())
\ No newline at end of file
+# ===== BATCH CONVERSION OF THE data/ TREE =====
+PARQUET_DIR = BASE_DIR.parent / "data_parquet"
+STATE_FILE = "_conversion_state.json"
+REPORT_FILE = "_conversion_report.json"
+DEFAULT_TARGET_PART_MB = 128
+
+# Directories under data/ that hold sidecars rather than table CSVs
+SKIP_DIRS = {'_ground_truth', 'delta'}
+
+
+def schema_from_header(csv_path):
+    """All-string schema from a CSV header, for table directories the generator doesn't know"""
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        header = f.readline().strip()
+    return pa.schema([(column, column_type(column)) for column in header.split(',')])
+
+
+def discover_csv_files(input_dir, tables=None):
+    """Return [(table, csv_path)] for every table directory under input_dir"""
+    input_dir = Path(input_dir)
+    found = []
+    for table_dir in sorted(p for p in input_dir.iterdir() if p.is_dir()):
+        if table_dir.name in SKIP_DIRS or table_dir.name.startswith('_'):
+            continue
+        if tables and table_dir.name not in tables:
+            continue
+        for csv_path in sorted(table_dir.glob('*.csv')):
+            found.append((table_dir.name, csv_path))
+    return found
+
+
+def _source_signature(csv_path, options):
+    stat = Path(csv_path).stat()
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'options': options}
+
+
+def _load_state(state_path):
+    if state_path.exists():
+        with open(state_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def is_up_to_date(csv_path, output_dir, options):
+    """True if a previous conversion of csv_path with the same options is still valid"""
+    state = _load_state(Path(output_dir) / STATE_FILE).get(Path(csv_path).name)
+    if not state or state.get('source') != _source_signature(csv_path, options):
+        return False
+    return all(Path(output_dir, name).exists() for name in state.get('files', []))
+
+
+def _write_json_atomic(path, data):
+    tmp_path = Path(path).with_suffix('.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _state_entry(output_dir, csv_path, options, result):
+    """State record of a finished conversion, as kept in the table's _conversion_state.json"""
+    return {
+        'source': _source_signature(csv_path, options),
+        'files': [str(Path(f).relative_to(output_dir)) for f in result['files']],
+        'rows': result['rows'],
+        'output_bytes': result['output_bytes'],
+    }
+
+
+def _save_table_state(output_dir, converted):
+    """
+    Record finished conversions in a table's _conversion_state.json and _file_stats.json.
+
+    Only the parent process calls this: workers return their entries instead of
+    writing, so CSVs of the same table converted in parallel can't overwrite
+    each other's read-modify-write. Both files are written atomically.
+
+    Args:
+        output_dir: The table's Parquet directory
+        converted: [(csv file name, state entry, file stats or None)]
+    """
+    state_path = Path(output_dir) / STATE_FILE
+    stats_path = Path(output_dir) / FILE_STATS_FILE
+    state = _load_state(state_path)
+    stats = _load_state(stats_path)
+    for name, entry, file_stats in converted:
+        state[name] = entry
+        if file_stats is None:
+            stats.pop(name, None)  # No longer partitioned
+        else:
+            stats[name] = file_stats
+    _write_json_atomic(state_path, state)
+    if stats or stats_path.exists():
+        _write_json_atomic(stats_path, stats)
+
+
+def is_conversion_output(csv_path, path):
+    """True if path is a Parquet file converted from csv_path: <stem>.parquet or <stem>-part-N.parquet"""
+    stem = re.escape(Path(csv_path).stem)
+    return re.fullmatch(rf"{stem}(-part-\d+)?\.parquet", Path(path).name) is not None
+
+
+def convert_file_task(table, csv_path, output_dir, options, force=False):
+    """
+    Convert one CSV file (process pool entry point).
+
+    Returns:
+        Result dict; 'skipped' is True if the existing output was up to date. A
+        conversion also carries 'state' and 'file_stats' for the parent to record
+        (see _save_table_state)
+    """
+    csv_path, output_dir = Path(csv_path), Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    if not force and is_up_to_date(csv_path, output_dir, options):
+        state = _load_state(output_dir / STATE_FILE)[csv_path.name]
+        return {
+            'table': table, 'file': csv_path.name, 'skipped': True, 'rows': state['rows'],
+            'files': state['files'], 'input_bytes': csv_path.stat().st_size,
+            'output_bytes': state['output_bytes'], 'elapsed_sec': 0.0,
+        }
+
+    schema = schema_for_table(table) if table in TABLE_SPECS else schema_from_header(csv_path)
+    parquet_path = output_dir / f"{csv_path.stem}.parquet"
+
+    # Remove files from an earlier conversion so a smaller output doesn't leave stale files behind
+    # (exact names only: order.csv must not take order_item*.parquet with it)
+    for stale in output_dir.rglob(f"{csv_path.stem}*.parquet"):
+        if is_conversion_output(csv_path, stale):
+            stale.unlink()
+
+    if options.get('partitioned') and table in PARTITION_COLUMNS:
+        result = csv_to_parquet_partitioned(
+            csv_path,
+            output_dir,
+            schema,
+            PARTITION_COLUMNS[table],
+            row_group_size=options['row_group_size'],
+            compression=options['compression'],
+            compression_level=options.get('compression_level'),
+        )
+    else:
+        target_part_mb = options.get('target_part_mb')
+        result = csv_to_parquet_arrow(
+            csv_path,
+            parquet_path,
+            schema,
+            row_group_size=options['row_group_size'],
+            compression=options['compression'],
+            compression_level=options.get('compression_level'),
+            target_part_bytes=int(target_part_mb * 1024 * 1024) if target_part_mb else None,
+        )
+    result.setdefault('file_stats', None)
+    result['state'] = _state_entry(output_dir, csv_path, options, result)
+    return {'table': table, 'file': csv_path.name, 'skipped': False, **result}
+
+
+def convert_tree(input_dir=BASE_DIR, output_dir=PARQUET_DIR, workers=None, tables=None,
+                 row_group_size=DEFAULT_ROW_GROUP_SIZE, compression='zstd', compression_level=None,
+                 target_part_mb=DEFAULT_TARGET_PART_MB, partitioned=False, force=False):
+    """
+    Convert every table directory under input_dir to Parquet in a process pool.
+
+    Args:
+        input_dir: Root with one directory per table (default: data/)
+        output_dir: Parquet root; mirrors the table directories
+        workers: Worker processes (default: CPU count)
+        tables: Only convert these table directories
+        row_group_size: Rows per row group
+        compression: Parquet codec
+        compression_level: Optional codec level
+        target_part_mb: Split outputs into parts of roughly this size (None/0 = one file)
+        partitioned: Write PARTITION_COLUMNS tables as year/month/day Hive partitions
+        force: Reconvert even if the output is up to date
+
+    Returns:
+        Report dict with per-table totals
+    """
+    input_dir, output_dir = Path(input_dir), Path(output_dir)
+    files = discover_csv_files(input_dir, tables)
+    if not files:
+        raise FileNotFoundError(f"No CSV files found under {input_dir}")
+
+    options = {
+        'row_group_size': row_group_size,
+        'compression': compression,
+        'compression_level': compression_level,
+        'target_part_mb': target_part_mb or None,
+        'partitioned': partitioned,
+    }
+
+    start = time.time()
+    results = []
+    # Largest files first so the pool isn't left waiting on one long straggler
+    files.sort(key=lambda item: item[1].stat().st_size, reverse=True)
+    converted = {}
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(convert_file_task, table, str(csv_path), str(output_dir / table), options, force):
+                    (table, csv_path)
+                for table, csv_path in files
+            }
+            for future in as_completed(futures):
+                table, csv_path = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"   ❌ {table}/{csv_path.name}: {e}")
+                    result = {'table': table, 'file': csv_path.name, 'error': str(e)}
+                else:
+                    status = "⏭️  up to date" if result['skipped'] else f"✅ {len(result['files'])} file(s)"
+                    print(f"   {status:<16} {table}/{csv_path.name}")
+                    if not result['skipped']:
+                        converted.setdefault(table, []).append(
+                            (csv_path.name, result.pop('state'), result.pop('file_stats')))
+                results.append(result)
+    finally:
+        # One writer per table's state files, and finished conversions are kept even if the run is interrupted
+        for table, entries in converted.items():
+            _save_table_state(output_dir / table, entries)
+
+    report = build_report(results, time.time() - start)
+    report['input_dir'] = str(input_dir)
+    report['output_dir'] = str(output_dir)
+    report['options'] = options
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(output_dir / REPORT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def build_report(results, elapsed_sec):
+    """Aggregate per-file results into per-table rows, bytes and throughput"""
+    tables = {}
+    for result in results:
+        entry = tables.setdefault(result['table'], {
+            'rows': 0, 'input_bytes': 0, 'output_bytes': 0, 'files': 0,
+            'converted': 0, 'skipped': 0, 'errors': 0, 'elapsed_sec': 0.0,
+        })
+        if 'error' in result:
+            entry['errors'] += 1
+            continue
+        entry['rows'] += result['rows']
+        entry['input_bytes'] += result['input_bytes']
+        entry['output_bytes'] += result['output_bytes']
+        entry['files'] += len(result['files'])
+        entry['elapsed_sec'] += result['elapsed_sec']
+        entry['skipped' if result['skipped'] else 'converted'] += 1
+
+    for entry in tables.values():
+        entry['elapsed_sec'] = round(entry['elapsed_sec'], 3)
+        entry['throughput_mb_s'] = round(entry['input_bytes'] / 1024 / 1024 / entry['elapsed_sec'], 1) \
+            if entry['elapsed_sec'] and entry['converted'] else None
+        entry['compression_ratio'] = round(entry['input_bytes'] / entry['output_bytes'], 2) \
+            if entry['output_bytes'] else None
+
+    return {'generated_at': datetime.now().isoformat(), 'elapsed_sec': round(elapsed_sec, 3), 'tables': tables}
+
+
+def print_report(report):
+    print("\n" + "=" * 100)
+    print("📊 PARQUET CONVERSION REPORT")
+    print("=" * 100)
+    print(f"{'Table':<18} {'Rows':>12} {'CSV MB':>10} {'Parquet MB':>11} {'Ratio':>7} {'Files':>6} "
+          f"{'MB/s':>8} {'Status':>14}")
+    print("-" * 100)
+    for table, entry in sorted(report['tables'].items()):
+        status = f"{entry['converted']} new/{entry['skipped']} skip" + (f"/{entry['errors']} err" if entry['errors'] else "")
+        throughput = f"{entry['throughput_mb_s']:.1f}" if entry['throughput_mb_s'] else '-'
+        ratio = f"{entry['compression_ratio']:.1f}x" if entry['compression_ratio'] else '-'
+        print(f"{table:<18} {entry['rows']:>12,} {entry['input_bytes'] / 1024 / 1024:>10.1f} "
+              f"{entry['output_bytes'] / 1024 / 1024:>11.1f} {ratio:>7} {entry['files']:>6} {throughput:>8} {status:>14}")
+    print("=" * 100)
+    print(f"⏱️  Total wall time: {report['elapsed_sec']:.1f}s")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Convert the generated CSV tree to Parquet")
+    parser.add_argument('--input-dir', default=str(BASE_DIR), help=f"CSV root (default: {BASE_DIR})")
+    parser.add_argument('--output-dir', default=str(PARQUET_DIR), help=f"Parquet root (default: {PARQUET_DIR})")
+    parser.add_argument('--tables', nargs='+', help="Only convert these table directories")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument('--row-group-size', type=int, default=DEFAULT_ROW_GROUP_SIZE,
+                        help=f"Rows per row group (default: {DEFAULT_ROW_GROUP_SIZE:,})")
+    parser.add_argument('--compression', choices=COMPRESSION_CODECS, default='zstd',
+                        help="Parquet compression codec (default: zstd)")
+    parser.add_argument('--compression-level', type=int, help="Codec compression level")
+    parser.add_argument('--target-part-mb', type=float, default=DEFAULT_TARGET_PART_MB,
+                        help=f"Split outputs into parts of about this size, 0 for one file "
+                             f"(default: {DEFAULT_TARGET_PART_MB})")
+    parser.add_argument('--partitioned', action='store_true',
+                        help=f"Hive-partition {', '.join(PARTITION_COLUMNS)} by year/month/day of their date column")
+    parser.add_argument('--force', action='store_true', help="Reconvert even if outputs are up to date")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print("\n🚀 Converting CSV tree to Parquet")
+    print(f"📂 {args.input_dir} → {args.output_dir} | codec={args.compression} | "
+          f"row groups={args.row_group_size:,} | parts≈{args.target_part_mb or '∞'} MB\n")
+
+    report = convert_tree(
+        input_dir=args.input_dir,
+        output_dir=args.output_dir,
+        workers=args.workers,
+        tables=args.tables,
+        row_group_size=args.row_group_size,
+        compression=args.compression,
+        compression_level=args.compression_level,
+        target_part_mb=args.target_part_mb,
+        partitioned=args.partitioned,
+        force=args.force,
+    )
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
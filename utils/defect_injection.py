@@ -0,0 +1,164 @@
+import csv
+
+import numpy as np
+
+# Defect type -> COMMON.DQ_CONFIG.VALIDATION_TYPE that should catch it
+DEFECT_VALIDATION_TYPES = {
+    'null': 'MANDATORY_CHECK',
+    'bad_enum': 'VALUE_CHECK',
+    'lookup_miss': 'LOOKUP_CHECK',
+    'duplicate': 'DUPLICATE_ALLOW_ONE_CHECK',
+}
+
+DEFAULT_BAD_VALUES = ['UNKNOWN', 'N/A', '???']
+
+GROUND_TRUTH_FIELDS = ['ROW_NUMBER', 'KEY', 'COLUMN', 'DEFECT_TYPE', 'VALIDATION_TYPE',
+                       'ORIGINAL_VALUE', 'INJECTED_VALUE']
+
+
+class DefectInjector:
+    """
+    Injects data-quality defects into a stream of row dicts and records every
+    injected defect in a ground-truth CSV.
+
+    Rules are dicts with a 'type', a 'rate' (fraction of rows) and, except for
+    duplicates, a 'column':
+        {'type': 'null', 'column': 'ORDER_ID', 'rate': 0.01}
+        {'type': 'bad_enum', 'column': 'ORDER_STATUS', 'rate': 0.01, 'values': ['SHIPPED']}
+        {'type': 'lookup_miss', 'column': 'CUSTOMER_ID', 'parent': 'customer', 'rate': 0.005}
+        {'type': 'duplicate', 'rate': 0.002}
+
+    'null' writes an empty string (COPY INTO loads it as NULL), 'bad_enum'
+    writes a value outside the allowed set, 'lookup_miss' writes a parent key
+    past the end of the parent table, and 'duplicate' emits the row a second
+    time with the same primary key. With 'mirror_raw' (default True) column
+    defects are also written to <COLUMN>_RAW when the table has one, so raw
+    and typed columns stay consistent.
+    """
+
+    def __init__(self, rules, key_field, parent_keys=None, seed=None, batch_size=50_000):
+        """
+        Args:
+            rules: List of defect rules (see class docstring)
+            key_field: Primary key column of the table
+            parent_keys: {parent_table: (row_count, key_format)} for lookup_miss rules
+            seed: Random seed
+            batch_size: Rows per vectorized random draw
+        """
+        self.rules = [dict(rule) for rule in rules]
+        self.key_field = key_field
+        self.parent_keys = parent_keys or {}
+        self.rng = np.random.default_rng(seed)
+        self.batch_size = batch_size
+        self.counts = {}
+
+        for rule in self.rules:
+            defect_type = rule.get('type')
+            if defect_type not in DEFECT_VALIDATION_TYPES:
+                raise ValueError(f"Unknown defect type '{defect_type}', expected one of {list(DEFECT_VALIDATION_TYPES)}")
+            if not 0 <= rule.get('rate', 0) <= 1:
+                raise ValueError(f"Defect rate must be between 0 and 1, got {rule.get('rate')}")
+            if defect_type != 'duplicate' and not rule.get('column'):
+                raise ValueError(f"'{defect_type}' rule needs a column: {rule}")
+            if defect_type == 'lookup_miss' and rule.get('parent') not in self.parent_keys:
+                raise ValueError(f"lookup_miss rule needs a known parent table: {rule}")
+
+        self._rates = np.array([rule.get('rate', 0) for rule in self.rules], dtype=np.float64)
+
+    def _bad_value(self, rule, original):
+        defect_type = rule['type']
+        if defect_type == 'null':
+            return ''
+        if defect_type == 'bad_enum':
+            values = rule.get('values', DEFAULT_BAD_VALUES)
+            return values[int(self.rng.integers(0, len(values)))]
+        # lookup_miss: a key that cannot exist in the parent table
+        parent_count, key_format = self.parent_keys[rule['parent']]
+        return key_format.format(parent_count + int(self.rng.integers(1, 1000)))
+
+    def _record(self, writer, row_number, key, column, defect_type, original, injected):
+        self.counts[defect_type] = self.counts.get(defect_type, 0) + 1
+        writer.writerow([row_number, key, column, defect_type, DEFECT_VALIDATION_TYPES[defect_type],
+                         original, injected])
+
+    def inject(self, rows, ground_truth_path):
+        """
+        Yield rows with defects applied and write the ground truth to ground_truth_path.
+
+        Row numbers in the ground truth are 1-based data rows of the output file.
+        """
+        with open(ground_truth_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(GROUND_TRUTH_FIELDS)
+
+            row_number = 0
+            hits = np.empty((0, len(self.rules)), dtype=bool)
+            pos = 0
+            for row in rows:
+                if pos >= len(hits):
+                    hits = self.rng.random((self.batch_size, len(self.rules))) < self._rates
+                    pos = 0
+                row_hits = hits[pos]
+                pos += 1
+                row_number += 1
+
+                duplicate = False
+                key = row.get(self.key_field)
+                touched = set()
+                for rule, hit in zip(self.rules, row_hits):
+                    if not hit:
+                        continue
+                    if rule['type'] == 'duplicate':
+                        duplicate = True
+                        continue
+
+                    column = rule['column']
+                    raw_column = f"{column}_RAW"
+                    mirror = rule.get('mirror_raw', True) and raw_column in row
+                    # One defect per cell: a later rule would overwrite the value
+                    # while both labels stayed in the ground truth
+                    if column in touched or (mirror and raw_column in touched):
+                        continue
+                    original = row.get(column)
+                    injected = self._bad_value(rule, original)
+                    row[column] = injected
+                    touched.add(column)
+                    if mirror:
+                        row[raw_column] = injected
+                        touched.add(raw_column)
+                    self._record(writer, row_number, key, column, rule['type'], original, injected)
+
+                yield row
+
+                # A duplicate only makes sense if the key itself survived
+                if duplicate and row.get(self.key_field) not in (None, ''):
+                    row_number += 1
+                    self._record(writer, row_number, row[self.key_field], self.key_field, 'duplicate',
+                                 row[self.key_field], row[self.key_field])
+                    yield dict(row)
+
+
+def verify_ground_truth(data_path, ground_truth_path):
+    """
+    Check every ground-truth label against the data file it describes.
+
+    Returns:
+        List of (row_number, column, defect_type, expected, actual) for labels
+        whose INJECTED_VALUE isn't what the data row holds (empty = all labels hold)
+    """
+    with open(ground_truth_path, newline='', encoding='utf-8') as f:
+        labels = sorted(csv.DictReader(f), key=lambda label: int(label['ROW_NUMBER']))
+
+    mismatches = []
+    with open(data_path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        row_number, row = 0, None
+        for label in labels:
+            target = int(label['ROW_NUMBER'])
+            while row_number < target:
+                row = next(reader, None)
+                row_number += 1
+            actual = None if row is None else row.get(label['COLUMN'])
+            if actual != label['INJECTED_VALUE']:
+                mismatches.append((target, label['COLUMN'], label['DEFECT_TYPE'], label['INJECTED_VALUE'], actual))
+    return mismatches
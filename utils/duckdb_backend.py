@@ -0,0 +1,508 @@
+"""
+DuckDB stand-in for SnowflakeConnection, for running the Python tooling offline.
+
+DuckDBConnection is a SnowflakeConnection whose connect() opens a local
+DuckDB database instead of a Snowflake session, so everything built on top
+of it (execute_query/update/many, fetch_arrow/pandas, iter_arrow_batches,
+bulk_load, submit_async/wait/results, the result cache and query hooks)
+works unchanged against a laptop-sized copy of the data/ tree:
+
+    sf = DuckDBConnection('local.duckdb', bootstrap=True)
+    sf.execute_query("SELECT bronze_table FROM COMMON.TARGET_TABLE_MAPPING")
+
+or, for tools that call create_connection(), set DATAVELOCITY_BACKEND=duckdb
+(and optionally DATAVELOCITY_DUCKDB_PATH).
+
+translate_sql() is a small compatibility shim for the subset of Snowflake
+SQL the tools send; it is not a general translator. Outside string
+literals it rewrites:
+
+    %s placeholders                    ?
+    <DATABASE>.SCHEMA.OBJECT           SCHEMA.OBJECT
+    SEQ.NEXTVAL                        nextval('SEQ')
+    CURRENT_ROLE() / _WAREHOUSE() /
+      _USER() / _VERSION()             constants / version()
+    IFF( / NVL(                        IF( / COALESCE(
+    USE SCHEMA x                       USE x
+    USE DATABASE/WAREHOUSE/ROLE,
+      ALTER SESSION,
+      ALTER TABLE x CLUSTER BY (...)   no-op (DuckDB has no clustering keys)
+    CREATE TABLE DDL                   see DDL_REWRITES (tags, comments, clustering, types)
+
+bootstrap=True creates the COMMON metadata tables and rows and the Bronze
+tables and INGEST_RUN_ID sequences from the repo's SQL files.
+"""
+import re
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from pathlib import Path
+from typing import Optional
+
+import pyarrow as pa
+
+from utils.snowflake_connector import SnowflakeConnection
+from utils.sql_splitter import split_sql
+
+REPO_ROOT = Path(__file__).parent.parent
+DEFAULT_DATABASE = ':memory:'
+SNOWFLAKE_DATABASE = 'DATAVELOCITY'
+SCHEMAS = ['COMMON', 'BRONZE', 'SILVER', 'GOLD']
+ASYNC_WORKERS = 4
+NO_OP_RESULT = "SELECT 'Statement executed successfully.' AS status"
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_DML = re.compile(r"^\s*(INSERT|UPDATE|DELETE|MERGE)\b", re.IGNORECASE)
+_NO_OP = re.compile(
+    r"^\s*(USE\s+(DATABASE|WAREHOUSE|ROLE|SECONDARY\s+ROLES)\b|ALTER\s+SESSION\b"
+    r"|ALTER\s+TABLE\s+(IF\s+EXISTS\s+)?[\w$.\"]+\s+(CLUSTER\s+BY|DROP\s+CLUSTERING\s+KEY|(SUSPEND|RESUME)\s+RECLUSTER)\b)",
+    re.IGNORECASE)
+_VALUES_INSERT = re.compile(
+    r"^\s*INSERT\s+INTO\s+(?P<table>[\w$.\"]+)\s*(?P<columns>\([^)]*\))?\s*"
+    r"VALUES\s*\(\s*\?(?:\s*,\s*\?)*\s*\)\s*;?\s*$", re.IGNORECASE)
+_DDL = re.compile(r"^\s*(CREATE|ALTER)\s+(OR\s+REPLACE\s+)?(TRANSIENT\s+|TEMPORARY\s+)?TABLE\b", re.IGNORECASE)
+
+SQL_REWRITES = [
+    (r"\b([A-Za-z_][\w$]*(?:\.[A-Za-z_][\w$]*){0,2})\.NEXTVAL\b", r"nextval('\1')"),
+    (r"\bCURRENT_ROLE\(\)", "'DUCKDB_LOCAL'"),
+    (r"\bCURRENT_WAREHOUSE\(\)", "'DUCKDB_LOCAL'"),
+    (r"\bCURRENT_USER\(\)", "'DUCKDB_LOCAL'"),
+    (r"\bCURRENT_VERSION\(\)", "version()"),
+    (r"\bIFF\s*\(", "IF("),
+    (r"\bNVL\s*\(", "COALESCE("),
+    (r"^\s*USE\s+SCHEMA\s+", "USE "),
+]
+
+# Snowflake DDL constructs DuckDB doesn't parse, and their local equivalents
+DDL_REWRITES = [
+    (r"\s+WITH\s+TAG\s*\([^)]*\)", ''),
+    (r"\s+CLUSTER\s+BY\s*\((?:[^()]|\([^()]*\))*\)", ''),
+    (r"\s+COMMENT\s*=?\s*'(?:[^']|'')*'", ''),
+    (r"\bAUTO_?INCREMENT\b", ''),
+    (r"\bNUMBER\b", 'DECIMAL'),
+    (r"\bTIMESTAMP_(?:TZ|LTZ)\b(\s*\(\d+\))?", 'TIMESTAMPTZ'),
+    (r"\bTIMESTAMP_NTZ\b(\s*\(\d+\))?", 'TIMESTAMP'),
+    (r"\bVARIANT\b", 'JSON'),
+    (r"\bCURRENT_TIMESTAMP\(\)", 'CURRENT_TIMESTAMP'),
+]
+
+# Snowflake doesn't enforce key constraints: Bronze is expected to hold duplicates, and
+# metadata rows are updated while other tables reference them (DuckDB rejects that)
+UNENFORCED_CONSTRAINTS = [
+    (r",\s*FOREIGN\s+KEY\s*\([^)]*\)\s*REFERENCES\s+[\w.\"]+\s*\([^)]*\)", ''),
+    (r"\s+PRIMARY\s+KEY\b", ''),
+    (r"\s+UNIQUE\b", ''),
+]
+
+
+def _rewrite_outside_literals(sql, rewrite):
+    parts = []
+    last = 0
+    for match in _STRING_LITERAL.finditer(sql):
+        parts.append(rewrite(sql[last:match.start()]))
+        parts.append(match.group(0))
+        last = match.end()
+    parts.append(rewrite(sql[last:]))
+    return ''.join(parts)
+
+
+def translate_ddl(statement, drop_constraints=False):
+    """Rewrite Snowflake CREATE TABLE syntax for DuckDB"""
+    rewrites = DDL_REWRITES + (UNENFORCED_CONSTRAINTS if drop_constraints else [])
+    for pattern, replacement in rewrites:
+        statement = re.sub(pattern, replacement, statement, flags=re.IGNORECASE)
+    return statement
+
+
+def translate_sql(query, database=SNOWFLAKE_DATABASE):
+    """Translate one Snowflake statement to DuckDB (see the module docstring for what is covered)"""
+    if _NO_OP.match(query):
+        return NO_OP_RESULT
+    if _DDL.match(query):
+        query = translate_ddl(query)
+    database_prefix = re.compile(rf"\b{re.escape(database)}\.(?=[A-Za-z_\"])", re.IGNORECASE)
+
+    def rewrite(segment):
+        segment = segment.replace('%s', '?')
+        segment = database_prefix.sub('', segment)
+        for pattern, replacement in SQL_REWRITES:
+            segment = re.sub(pattern, replacement, segment, flags=re.IGNORECASE)
+        return segment
+
+    return _rewrite_outside_literals(query, rewrite)
+
+
+def sql_statements(path):
+    """Statements of a repo SQL file (see utils.sql_splitter)"""
+    with open(path, encoding='utf-8', errors='replace') as f:
+        return [statement.sql for statement in split_sql(f)]
+
+
+def ingest_sequence_name(bronze_table):
+    """'BRONZE.ORDER_BRZ' -> 'BRONZE.SEQ_ORDER_INGEST_RUN_ID'"""
+    schema, _, table = bronze_table.rpartition('.')
+    entity = re.sub(r'_BRZ$', '', table.upper())
+    return f"{schema or 'BRONZE'}.SEQ_{entity}_INGEST_RUN_ID"
+
+
+# ===== DB-API ADAPTER =====
+class QueryStatus(Enum):
+    """The subset of snowflake.connector.constants.QueryStatus the async API looks at"""
+    RUNNING = 'RUNNING'
+    SUCCESS = 'SUCCESS'
+    FAILED_WITH_ERROR = 'FAILED_WITH_ERROR'
+
+
+class DictCursor:
+    """Marker passed to DuckDBAdapter.cursor() for dict rows, like snowflake.connector.DictCursor"""
+
+
+def _arrow_table(cursor):
+    # to_arrow_table/to_arrow_reader replaced fetch_arrow_table/fetch_record_batch in DuckDB 1.4
+    if hasattr(cursor, 'to_arrow_table'):
+        return cursor.to_arrow_table()
+    return cursor.fetch_arrow_table()
+
+
+def _arrow_reader(cursor):
+    if hasattr(cursor, 'to_arrow_reader'):
+        return cursor.to_arrow_reader()
+    return cursor.fetch_record_batch()
+
+
+def _result_table(cursor, dml):
+    if dml:
+        rows = cursor.fetchall()
+        return pa.table({'number of rows affected': [rows[0][0] if rows else 0]})
+    if cursor.description is None:
+        return pa.table({'status': ['Statement executed successfully.']})
+    return _arrow_table(cursor)
+
+
+class DuckDBCursor:
+    """Snowflake-cursor-shaped wrapper over a DuckDB cursor."""
+
+    def __init__(self, adapter, dict_rows=False):
+        self._adapter = adapter
+        self._cursor = adapter.duckdb.cursor()
+        self._dict_rows = dict_rows
+        self._table = None
+        self._offset = 0
+        self.sfqid = None
+        self.rowcount = -1
+
+    # ----- execution -----
+    def _reset(self):
+        self._table = None
+        self._offset = 0
+        self.rowcount = -1
+        self.sfqid = str(uuid.uuid4())
+
+    def execute(self, command, params=None, **kwargs):
+        self._reset()
+        sql = self._adapter.translate(command)
+        self._cursor.execute(sql, list(params) if params else None)
+        if _DML.match(sql):
+            self._table = _result_table(self._cursor, dml=True)
+            self.rowcount = self._table.column(0)[0].as_py()
+        return self
+
+    def executemany(self, command, seqparams, **kwargs):
+        self._reset()
+        sql = self._adapter.translate(command)
+        seqparams = [list(params) for params in seqparams]
+        insert = _VALUES_INSERT.match(sql)
+        total = None
+        if insert and seqparams:
+            # DuckDB's executemany runs row by row; one INSERT ... SELECT from Arrow is ~20x faster
+            total = self._insert_from_arrow(insert.group('table'), insert.group('columns'), seqparams)
+        if total is None:
+            total = 0
+            for params in seqparams:
+                self._cursor.execute(sql, params)
+                if _DML.match(sql):
+                    total += _result_table(self._cursor, dml=True).column(0)[0].as_py()
+        self.rowcount = total
+        self._table = pa.table({'number of rows affected': [total]})
+        return self
+
+    def _insert_from_arrow(self, table, columns, rows):
+        try:
+            batch = pa.table([pa.array(column) for column in zip(*rows)],
+                             names=[f"c{i}" for i in range(len(rows[0]))])
+        except (pa.ArrowException, TypeError, ValueError):
+            return None  # mixed-type column; let DuckDB bind row by row
+        view = f"executemany_{uuid.uuid4().hex}"
+        self._cursor.register(view, batch)
+        try:
+            self._cursor.execute(f"INSERT INTO {table} {columns or ''} SELECT * FROM {view}")
+            return _result_table(self._cursor, dml=True).column(0)[0].as_py()
+        finally:
+            self._cursor.unregister(view)
+
+    def execute_async(self, command, params=None, **kwargs):
+        self._reset()
+        self._adapter.submit(self.sfqid, self._adapter.translate(command), params)
+        return {'queryId': self.sfqid}
+
+    def get_results_from_sfqid(self, sfqid):
+        self._reset()
+        self.sfqid = sfqid
+        self._table = self._adapter.result(sfqid)
+        self.rowcount = self._table.num_rows
+
+    # ----- results -----
+    @property
+    def description(self):
+        if self._table is not None:
+            return [(field.name, str(field.type), None, None, None, None, True) for field in self._table.schema]
+        return self._cursor.description
+
+    def _names(self):
+        return [column[0] for column in self.description or []]
+
+    def _rows(self, rows):
+        if not self._dict_rows:
+            return rows
+        names = self._names()
+        return [dict(zip(names, row)) for row in rows]
+
+    def _take(self, n=None):
+        end = self._table.num_rows if n is None else min(self._offset + n, self._table.num_rows)
+        chunk = self._table.slice(self._offset, end - self._offset)
+        self._offset = end
+        return chunk
+
+    def fetchone(self):
+        rows = self.fetchmany(1)
+        return rows[0] if rows else None
+
+    def fetchmany(self, size=1):
+        if self._table is None:
+            return self._rows(self._cursor.fetchmany(size))
+        chunk = self._take(size)
+        return self._rows(list(zip(*(column.to_pylist() for column in chunk.columns))))
+
+    def fetchall(self):
+        if self._table is None:
+            return self._rows(self._cursor.fetchall())
+        chunk = self._take()
+        return self._rows(list(zip(*(column.to_pylist() for column in chunk.columns))))
+
+    def fetch_arrow_all(self, force_return_table=False):
+        table = self._take() if self._table is not None else _arrow_table(self._cursor)
+        return table if table.num_rows or force_return_table else None
+
+    def fetch_arrow_batches(self):
+        if self._table is not None:
+            reader = self._take().to_reader()
+        else:
+            reader = _arrow_reader(self._cursor)
+        for batch in reader:
+            yield pa.Table.from_batches([batch])
+
+    def fetch_pandas_all(self):
+        return self.fetch_arrow_all(force_return_table=True).to_pandas()
+
+    def fetch_pandas_batches(self):
+        for table in self.fetch_arrow_batches():
+            yield table.to_pandas()
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def close(self):
+        self._cursor.close()
+
+
+class DuckDBAdapter:
+    """
+    Snowflake-connection-shaped wrapper over a duckdb connection: cursors,
+    commit/rollback (autocommit), async queries on a small thread pool.
+    """
+
+    def __init__(self, database=DEFAULT_DATABASE, snowflake_database=SNOWFLAKE_DATABASE):
+        import duckdb
+
+        self.duckdb = duckdb.connect(str(database))
+        self.snowflake_database = snowflake_database
+        self._closed = False
+        self._executor = None
+        self._async = {}
+        self._lock = threading.Lock()
+
+    def translate(self, query):
+        return translate_sql(query, self.snowflake_database)
+
+    def cursor(self, cursor_class=None):
+        return DuckDBCursor(self, dict_rows=cursor_class is DictCursor)
+
+    def commit(self):
+        pass  # DuckDB runs each statement in autocommit mode
+
+    def rollback(self):
+        pass
+
+    # ----- async -----
+    def submit(self, query_id, sql, params):
+        def run():
+            cursor = self.duckdb.cursor()
+            try:
+                cursor.execute(sql, list(params) if params else None)
+                return _result_table(cursor, dml=bool(_DML.match(sql)))
+            finally:
+                cursor.close()
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=ASYNC_WORKERS, thread_name_prefix='duckdb-async')
+            self._async[query_id] = self._executor.submit(run)
+
+    def get_query_status(self, query_id):
+        future = self._async.get(query_id)
+        if future is None:
+            raise ValueError(f"Unknown query id {query_id}")
+        if not future.done():
+            return QueryStatus.RUNNING
+        return QueryStatus.FAILED_WITH_ERROR if future.exception() else QueryStatus.SUCCESS
+
+    def is_still_running(self, status):
+        return status == QueryStatus.RUNNING
+
+    def is_an_error(self, status):
+        return status == QueryStatus.FAILED_WITH_ERROR
+
+    def get_query_status_throw_if_error(self, query_id):
+        status = self.get_query_status(query_id)
+        if status == QueryStatus.FAILED_WITH_ERROR:
+            raise self._async[query_id].exception()
+        return status
+
+    def result(self, query_id):
+        return self._async[query_id].result()
+
+    # ----- lifecycle -----
+    def is_closed(self):
+        return self._closed
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        self.duckdb.close()
+        self._closed = True
+
+
+# ===== CONNECTION =====
+class DuckDBConnection(SnowflakeConnection):
+    """
+    SnowflakeConnection backed by a local DuckDB database.
+
+    Accepts the same keyword arguments as SnowflakeConnection (cache, hooks,
+    logger, retries); Snowflake credentials are ignored.
+    """
+
+    dict_cursor_class = DictCursor
+
+    def __init__(self, database: str = DEFAULT_DATABASE, bootstrap: bool = False,
+                 repo_root: Path = REPO_ROOT, **kwargs):
+        """
+        Args:
+            database: DuckDB file path, or ':memory:'
+            bootstrap: Create the COMMON metadata and Bronze tables from the repo's SQL if missing
+            repo_root: Where metadata/ and entities/ live
+        """
+        super().__init__(**kwargs)
+        self.database_path = str(database)
+        self.bootstrap_on_connect = bootstrap
+        self.repo_root = Path(repo_root)
+        self.snowflake_database = self.database or SNOWFLAKE_DATABASE
+
+    def connect(self) -> DuckDBAdapter:
+        """Open the DuckDB database (and bootstrap it if asked)."""
+        self.connection = DuckDBAdapter(self.database_path, self.snowflake_database)
+        for schema in SCHEMAS:
+            self.connection.duckdb.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+        self.logger.info("Opened DuckDB database %s", self.database_path)
+        if self.bootstrap_on_connect and not self._has_table('COMMON', 'TARGET_TABLE_MAPPING'):
+            self.bootstrap()
+        return self.connection
+
+    def cache_context(self) -> tuple:
+        """Cached results are only shared between connections to the same DuckDB file"""
+        return (*super().cache_context(), self.database_path)
+
+    def _has_table(self, schema, table):
+        return bool(self.connection.duckdb.execute(
+            "SELECT 1 FROM information_schema.tables WHERE UPPER(table_schema) = ? AND UPPER(table_name) = ?",
+            [schema.upper(), table.upper()],
+        ).fetchall())
+
+    def bootstrap(self):
+        """
+        Create COMMON.FILE_FORMAT_MASTER / SOURCE_FILE_CONFIG / TARGET_TABLE_MAPPING
+        with their configured rows, and every BRONZE.*_BRZ table with its
+        INGEST_RUN_ID sequence, from the repo's SQL files.
+        """
+        con = self._ensure_connected().duckdb
+        metadata_tables = r'COMMON\.(FILE_FORMAT_MASTER|SOURCE_FILE_CONFIG|TARGET_TABLE_MAPPING)\b'
+
+        for statement in sql_statements(self.repo_root / 'metadata' / 'metadata_tables_defination.sql'):
+            if re.match(r'CREATE OR REPLACE TABLE ' + metadata_tables, statement, re.IGNORECASE):
+                con.execute(translate_ddl(statement, drop_constraints=True))
+        for statement in sql_statements(self.repo_root / 'metadata' / 'meta_data_configuration.sql'):
+            if re.match(r'INSERT INTO ' + metadata_tables, statement, re.IGNORECASE):
+                con.execute(statement)
+
+        for entity_file in sorted((self.repo_root / 'entities').glob('*.sql')):
+            for statement in sql_statements(entity_file):
+                match = re.match(r'CREATE OR REPLACE TABLE (BRONZE\.\w+_BRZ)\b', statement, re.IGNORECASE)
+                if match:
+                    con.execute(translate_ddl(statement, drop_constraints=True))
+                    con.execute(f"CREATE SEQUENCE IF NOT EXISTS {ingest_sequence_name(match.group(1))} START 1")
+
+    def bulk_load(
+            self,
+            data,
+            table: str,
+            schema: Optional[str] = None,
+            chunk_size: Optional[int] = None,
+            auto_create_table: bool = False,
+            overwrite: bool = False,
+            parallel: int = 4,
+            compression: str = 'gzip'
+    ) -> dict:
+        """
+        Insert a DataFrame or Arrow table by column name (see SnowflakeConnection.bulk_load).
+        chunk_size splits the insert; parallel and compression don't apply locally.
+        """
+        self._ensure_connected()
+        target = f"{schema}.{table}" if schema else table
+        if not hasattr(data, 'slice'):
+            data = pa.Table.from_pandas(data, preserve_index=False)
+        con = self.connection.duckdb
+
+        view = f"bulk_load_{uuid.uuid4().hex}"
+        chunk_size = chunk_size or max(data.num_rows, 1)
+        chunks = 0
+        try:
+            if auto_create_table:
+                con.register(view, data.slice(0, 0))
+                con.execute(f"CREATE TABLE IF NOT EXISTS {target} AS SELECT * FROM {view}")
+                con.unregister(view)
+            if overwrite:
+                con.execute(f"DELETE FROM {target}")
+            for offset in range(0, data.num_rows, chunk_size):
+                con.register(view, data.slice(offset, chunk_size))
+                con.execute(f"INSERT INTO {target} BY NAME SELECT * FROM {view}")
+                con.unregister(view)
+                chunks += 1
+        finally:
+            try:
+                con.unregister(view)
+            except Exception:
+                pass
+
+        if self.cache:
+            self.cache.invalidate(table)
+        return {'success': True, 'chunks': chunks, 'rows': data.num_rows}
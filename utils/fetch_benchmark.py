@@ -0,0 +1,187 @@
+"""
+Benchmark result fetching from Snowflake: fetchall() vs the Arrow API.
+
+Runs the same query through each fetch method of SnowflakeConnection and
+reports wall time, throughput and peak memory:
+
+    fetchall            execute_query(): list of Python tuples
+    fetch_arrow         one Arrow table
+    fetch_pandas        one pandas DataFrame (built from Arrow)
+    iter_arrow_batches  Arrow chunks consumed one at a time (bounded memory)
+
+Each method runs in a fresh process so peak RSS isn't inherited from the
+previous one (peak working set on Windows; reported as n/a where neither
+is available). Login time is excluded from the timings.
+
+Usage:
+    python -m utils.fetch_benchmark --rows 1000000
+    python -m utils.fetch_benchmark --query "SELECT * FROM GOLD.FACT_ORDER"
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+METHODS = ['fetchall', 'fetch_arrow', 'fetch_pandas', 'iter_arrow_batches']
+REPORT_FILE = Path(__file__).parent.parent / "logs" / "fetch_benchmark.json"
+
+# Mixed-type synthetic result, similar in shape to an order extract
+GENERATOR_SQL = """
+    SELECT
+        SEQ8() AS ORDER_ID,
+        UNIFORM(1, 100000, RANDOM()) AS CUSTOMER_ID,
+        UNIFORM(1, 5000, RANDOM()) AS RESTAURANT_ID,
+        DATEADD(SECOND, -UNIFORM(0, 31536000, RANDOM()), CURRENT_TIMESTAMP()) AS ORDER_DATE,
+        UNIFORM(50, 5000, RANDOM())::NUMBER(10, 2) AS TOTAL_AMOUNT,
+        RANDSTR(10, RANDOM()) AS STATUS,
+        RANDSTR(32, RANDOM()) AS DELIVERY_NOTES
+    FROM TABLE(GENERATOR(ROWCOUNT => {rows}))
+"""
+
+
+def _windows_peak_working_set_mb():
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD)] + [
+            (name, ctypes.c_size_t) for name in (
+                'PeakWorkingSetSize', 'WorkingSetSize', 'QuotaPeakPagedPoolUsage', 'QuotaPagedPoolUsage',
+                'QuotaPeakNonPagedPoolUsage', 'QuotaNonPagedPoolUsage', 'PagefileUsage', 'PeakPagefileUsage')]
+
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    kernel32, psapi = ctypes.WinDLL('kernel32'), ctypes.WinDLL('psapi')
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    if not psapi.GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+        return None
+    return counters.PeakWorkingSetSize / 1024 / 1024
+
+
+def _peak_rss_mb():
+    """Peak resident memory of this process in MB, or None if the platform doesn't report it"""
+    try:
+        if resource is not None:
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            # ru_maxrss is KiB on Linux, bytes on macOS
+            return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+        if sys.platform == 'win32':
+            return _windows_peak_working_set_mb()
+    except (OSError, AttributeError):
+        pass
+    return None
+
+
+def _mb(value):
+    return 'n/a' if value is None else f"{value:.1f}"
+
+
+def run_method(method, query, repeats):
+    """Run one fetch method repeats times in this process; returns its measurements"""
+    from utils.snowflake_connector import SnowflakeConnection
+
+    sf = SnowflakeConnection()
+    sf.connect()
+    baseline_mb = _peak_rss_mb()
+    timings = []
+    rows = batches = 0
+    try:
+        for _ in range(repeats):
+            started = time.perf_counter()
+            if method == 'fetchall':
+                result = sf.execute_query(query)
+                rows, batches = len(result), 1
+            elif method == 'fetch_arrow':
+                result = sf.fetch_arrow(query)
+                rows, batches = result.num_rows, 1
+            elif method == 'fetch_pandas':
+                result = sf.fetch_pandas(query)
+                rows, batches = len(result), 1
+            else:
+                result = None
+                rows = batches = 0
+                for batch in sf.iter_arrow_batches(query):
+                    rows += batch.num_rows
+                    batches += 1
+            timings.append(time.perf_counter() - started)
+            del result
+    finally:
+        sf.close()
+
+    elapsed = statistics.median(timings)
+    peak_mb = _peak_rss_mb()
+    return {
+        'method': method,
+        'rows': rows,
+        'batches': batches,
+        'elapsed_sec_median': round(elapsed, 3),
+        'rows_per_sec': round(rows / elapsed) if elapsed else None,
+        'peak_rss_mb': None if peak_mb is None else round(peak_mb, 1),
+        'peak_rss_delta_mb': None if peak_mb is None or baseline_mb is None else round(peak_mb - baseline_mb, 1),
+    }
+
+
+def benchmark(query, methods=METHODS, repeats=3):
+    """Run each method in its own process and collect the results"""
+    results = []
+    for method in methods:
+        print(f"⏳ {method}...")
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            results.append(pool.submit(run_method, method, query, repeats).result())
+    return results
+
+
+def print_results(results):
+    print("\n" + "=" * 90)
+    print("📊 FETCH BENCHMARK")
+    print("=" * 90)
+    print(f"{'Method':<20} {'Rows':>12} {'Batches':>8} {'Seconds':>9} {'Rows/s':>12} {'Peak MB':>9} {'Δ MB':>9}")
+    print("-" * 90)
+    for r in results:
+        print(f"{r['method']:<20} {r['rows']:>12,} {r['batches']:>8} {r['elapsed_sec_median']:>9.2f} "
+              f"{r['rows_per_sec'] or 0:>12,} {_mb(r['peak_rss_mb']):>9} {_mb(r['peak_rss_delta_mb']):>9}")
+    baseline = next((r for r in results if r['method'] == 'fetchall'), None)
+    if baseline and baseline['elapsed_sec_median']:
+        print("-" * 90)
+        for r in results:
+            if r is not baseline and r['elapsed_sec_median']:
+                print(f"{r['method']:<20} {baseline['elapsed_sec_median'] / r['elapsed_sec_median']:.1f}x faster "
+                      f"than fetchall")
+    print("=" * 90)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark fetchall() vs Arrow/pandas fetches")
+    parser.add_argument('--rows', type=int, default=1_000_000,
+                        help="Rows in the synthetic GENERATOR result (default: 1,000,000)")
+    parser.add_argument('--query', help="Benchmark this query instead of the synthetic one")
+    parser.add_argument('--methods', nargs='+', choices=METHODS, default=METHODS)
+    parser.add_argument('--repeats', type=int, default=3, help="Runs per method; the median is reported")
+    parser.add_argument('--report', default=str(REPORT_FILE), help=f"JSON report path (default: {REPORT_FILE})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    query = args.query or GENERATOR_SQL.format(rows=args.rows)
+    results = benchmark(query, args.methods, args.repeats)
+    print_results(results)
+
+    report_path = Path(args.report)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump({'generated_at': datetime.now().isoformat(), 'query': query, 'results': results}, f, indent=2)
+    print(f"📝 Report saved to {report_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""
+Daily delta batches for CDC / SCD2 load testing.
+
+Reads the manifest of a previous full run of generate_food_delivery_data and
+emits N daily increments per table, each a mix of:
+    - inserts: new keys continuing after the highest key generated so far
+    - updates: existing live keys re-generated with new attribute values
+    - deletes: existing live keys written to a separate tombstone file
+
+Every day also gets an exact ground-truth file (KEY, OP) so incremental loads
+through MERGE / SCD2 / SP_BRONZE_TO_SILVER can be checked and timed against a
+full reload.
+
+Layout (under <output_dir>/delta/day_NNN/):
+    <table>/<table>_brz.csv                  inserts + updates, same columns as the full load
+    _tombstones/<table>_tombstones.csv       deleted keys
+    _ground_truth/<table>_ground_truth.csv   KEY, OP for every row in the two files above
+
+Tombstones and ground truth sit outside the table directories so the stage
+file patterns (e.g. 'delivery_*.csv') never pick them up as data files.
+
+Usage:
+    python -m utils.generate_delta_batches --from-dir data --days 7 \
+        --insert-ratio 0.01 --update-ratio 0.005 --delete-ratio 0.001
+"""
+
+import argparse
+import csv
+import random
+import time
+from datetime import datetime, timedelta
+from itertools import chain
+from pathlib import Path
+
+import numpy as np
+
+from utils.generate_food_delivery_data import (
+    BASE_DIR, GROUND_TRUTH_DIR, MANIFEST_FILE, TABLES, TABLE_SPECS, SEED,
+    build_key_sampler, write_csv_chunked, load_manifest, write_manifest
+)
+
+DELTA_DIR_NAME = 'delta'
+DELTA_MANIFEST_FILE = 'delta_manifest.json'
+STATE_DIR_NAME = '_state'
+TOMBSTONE_DIR_NAME = '_tombstones'
+
+DEFAULT_INSERT_RATIO = 0.01
+DEFAULT_UPDATE_RATIO = 0.005
+DEFAULT_DELETE_RATIO = 0.001
+
+
+def dependency_order(tables=None):
+    """Order tables so parents are processed before their children"""
+    tables = list(tables or TABLES)
+    ordered = []
+    remaining = list(tables)
+    while remaining:
+        for table in remaining:
+            parents = {parent for _, parent in TABLE_SPECS[table]['foreign_keys']}
+            if not (parents & set(remaining)) or parents <= set(ordered):
+                ordered.append(table)
+                remaining.remove(table)
+                break
+        else:
+            raise ValueError(f"Circular foreign keys between: {remaining}")
+    return ordered
+
+
+def format_key(table, key):
+    return TABLE_SPECS[table]['key_format'].format(key)
+
+
+def live_keys(sampler, deleted):
+    """Yield sampled parent keys, skipping parents that have been deleted"""
+    for key in sampler:
+        if key not in deleted:
+            yield key
+
+
+def pick_live_keys(rng, max_id, deleted, size):
+    """Pick `size` distinct keys in [1, max_id] that are not in `deleted`"""
+    live_count = max_id - len(deleted)
+    size = min(size, live_count)
+    if size <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    picked = np.empty(0, dtype=np.int64)
+    deleted_arr = np.fromiter(deleted, dtype=np.int64, count=len(deleted))
+    while len(picked) < size:
+        # Over-draw a little so one pass is usually enough
+        candidates = rng.integers(1, max_id + 1, size=int((size - len(picked)) * 1.2) + 16)
+        candidates = candidates[~np.isin(candidates, deleted_arr)]
+        picked = np.unique(np.concatenate([picked, candidates]))
+    return rng.permutation(picked)[:size]
+
+
+def _state_path(delta_root, table):
+    return delta_root / STATE_DIR_NAME / f"{table}_deleted.npy"
+
+
+def load_delta_state(manifest, delta_root):
+    """
+    Return per-table {'max_id', 'deleted'} and the number of days already generated.
+    A manifest without delta_state starts from the full snapshot.
+    """
+    previous = manifest.get('delta_state', {})
+    state = {}
+    for table in TABLES:
+        table_state = previous.get('tables', {}).get(table)
+        if table_state:
+            deleted_file = _state_path(delta_root, table)
+            deleted = set(np.load(deleted_file).tolist()) if deleted_file.exists() else set()
+            state[table] = {'max_id': table_state['max_id'], 'deleted': deleted}
+        else:
+            state[table] = {'max_id': manifest['row_counts'][table], 'deleted': set()}
+    return state, previous.get('days_generated', 0)
+
+
+def save_delta_state(state, delta_root):
+    (delta_root / STATE_DIR_NAME).mkdir(parents=True, exist_ok=True)
+    for table, table_state in state.items():
+        np.save(_state_path(delta_root, table), np.array(sorted(table_state['deleted']), dtype=np.int64))
+
+
+def generate_table_delta(table, day, day_dir, state, ratios, seed, distributions, day_date):
+    """
+    Generate one table's delta for one day and update `state` in place.
+
+    Returns:
+        Delta manifest entry with op counts, bytes and elapsed time
+    """
+    spec = TABLE_SPECS[table]
+    table_state = state[table]
+    table_seed = seed + day * 1000 + TABLES.index(table)
+    rng = np.random.default_rng(table_seed)
+    random.seed(table_seed)
+
+    live_rows = table_state['max_id'] - len(table_state['deleted'])
+    num_inserts = int(round(live_rows * ratios['insert']))
+    num_updates = int(round(live_rows * ratios['update']))
+    num_deletes = int(round(live_rows * ratios['delete']))
+
+    # Updates and deletes are drawn together so a key gets at most one op per day
+    changed = pick_live_keys(rng, table_state['max_id'], table_state['deleted'], num_updates + num_deletes)
+    update_ids = np.sort(changed[:num_updates]).tolist()
+    delete_ids = np.sort(changed[num_updates:]).tolist()
+    insert_ids = range(table_state['max_id'] + 1, table_state['max_id'] + 1 + num_inserts)
+
+    # New rows only reference parents that are still live
+    samplers = [
+        live_keys(
+            build_key_sampler(relationship, state[parent]['max_id'], distributions, table_seed),
+            state[parent]['deleted']
+        )
+        for relationship, parent in spec['foreign_keys']
+    ]
+
+    table_dir = day_dir / table
+    tombstone_dir = day_dir / TOMBSTONE_DIR_NAME
+    truth_dir = day_dir / GROUND_TRUTH_DIR
+    for directory in (table_dir, tombstone_dir, truth_dir):
+        directory.mkdir(parents=True, exist_ok=True)
+    data_file = table_dir / spec['file']
+    tombstone_file = tombstone_dir / f"{table}_tombstones.csv"
+    truth_file = truth_dir / f"{table}_ground_truth.csv"
+
+    start = time.time()
+    rows = chain(spec['generator'](insert_ids, *samplers), spec['generator'](update_ids, *samplers))
+    write_csv_chunked(data_file, rows, spec['fields'], num_inserts + len(update_ids), show_progress=False)
+
+    deleted_at = day_date.strftime('%Y-%m-%d %H:%M:%S')
+    with open(tombstone_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow([spec['key_field'], 'DELETED_AT'])
+        writer.writerows([format_key(table, key), deleted_at] for key in delete_ids)
+
+    with open(truth_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['KEY', 'OP'])
+        writer.writerows([format_key(table, key), 'INSERT'] for key in insert_ids)
+        writer.writerows([format_key(table, key), 'UPDATE'] for key in update_ids)
+        writer.writerows([format_key(table, key), 'DELETE'] for key in delete_ids)
+    elapsed = time.time() - start
+
+    table_state['max_id'] += num_inserts
+    table_state['deleted'].update(delete_ids)
+
+    relative = f"{DELTA_DIR_NAME}/{day_dir.name}"
+    return {
+        'inserted': num_inserts,
+        'updated': len(update_ids),
+        'deleted': len(delete_ids),
+        'live_rows_after': table_state['max_id'] - len(table_state['deleted']),
+        'files': [f"{relative}/{table}/{data_file.name}",
+                  f"{relative}/{TOMBSTONE_DIR_NAME}/{tombstone_file.name}",
+                  f"{relative}/{GROUND_TRUTH_DIR}/{truth_file.name}"],
+        'bytes': sum(p.stat().st_size for p in (data_file, tombstone_file, truth_file)),
+        'elapsed_sec': round(elapsed, 3),
+    }
+
+
+def run_delta_generation(source_dir=BASE_DIR, days=1, ratios=None, tables=None, seed=None):
+    """
+    Generate `days` daily increments on top of the run recorded in source_dir.
+
+    Args:
+        source_dir: Output directory of a previous full run (must contain its manifest)
+        days: Number of daily increments to emit
+        ratios: {'insert', 'update', 'delete'} as fractions of each table's live rows per day
+        tables: Subset of tables (default: all tables in the manifest)
+        seed: Base seed (default: the seed recorded in the manifest)
+    """
+    source_dir = Path(source_dir)
+    manifest = load_manifest(source_dir)
+    delta_root = source_dir / DELTA_DIR_NAME
+    ratios = {'insert': DEFAULT_INSERT_RATIO, 'update': DEFAULT_UPDATE_RATIO,
+              'delete': DEFAULT_DELETE_RATIO, **(ratios or {})}
+    for op, ratio in ratios.items():
+        if not 0 <= ratio <= 1:
+            raise ValueError(f"{op} ratio must be between 0 and 1, got {ratio}")
+    if ratios['update'] + ratios['delete'] > 1:
+        raise ValueError("update + delete ratios cannot exceed 1")
+
+    seed = manifest.get('seed', SEED) if seed is None else seed
+    distributions = manifest.get('fk_distributions')
+    tables = dependency_order(tables or list(manifest['tables']))
+    state, days_done = load_delta_state(manifest, delta_root)
+    snapshot_date = datetime.fromisoformat(manifest['generated_at'])
+
+    start = time.time()
+    day_entries = {}
+    for day in range(days_done + 1, days_done + days + 1):
+        day_dir = delta_root / f"day_{day:03d}"
+        day_date = snapshot_date + timedelta(days=day)
+        print(f"\n📅 Day {day} ({day_date.strftime('%Y-%m-%d')})")
+
+        day_entries[day_dir.name] = {}
+        for table in tables:
+            entry = generate_table_delta(table, day, day_dir, state, ratios, seed, distributions, day_date)
+            day_entries[day_dir.name][table] = entry
+            print(f"   ✓ {table:<18} +{entry['inserted']:>9,}  ~{entry['updated']:>9,}  "
+                  f"-{entry['deleted']:>9,}  → {entry['live_rows_after']:>12,} live")
+
+    save_delta_state(state, delta_root)
+
+    # Append to the delta manifest of earlier runs so all days stay in one place
+    previous_days = {}
+    if (delta_root / DELTA_MANIFEST_FILE).exists():
+        previous_days = load_manifest(delta_root, DELTA_MANIFEST_FILE).get('days', {})
+
+    delta_manifest = {
+        'generated_at': datetime.now().isoformat(),
+        'source_manifest': str(source_dir / MANIFEST_FILE),
+        'seed': seed,
+        'ratios': ratios,
+        'days': {**previous_days, **day_entries},
+        'elapsed_sec': round(time.time() - start, 3),
+    }
+    write_manifest(delta_root, delta_manifest, DELTA_MANIFEST_FILE)
+
+    # Record where the next delta run should continue from
+    manifest['delta_state'] = {
+        'days_generated': days_done + days,
+        'tables': {table: {'max_id': s['max_id'], 'deleted_count': len(s['deleted'])}
+                   for table, s in state.items()},
+    }
+    write_manifest(source_dir, manifest)
+    return delta_manifest
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate daily delta batches on top of a full run")
+    parser.add_argument('--from-dir', default=str(BASE_DIR),
+                        help=f"Directory of the previous full run (default: {BASE_DIR})")
+    parser.add_argument('--days', type=int, default=1, help="Number of daily increments (default: 1)")
+    parser.add_argument('--insert-ratio', type=float, default=DEFAULT_INSERT_RATIO,
+                        help=f"New rows per day as a fraction of live rows (default: {DEFAULT_INSERT_RATIO})")
+    parser.add_argument('--update-ratio', type=float, default=DEFAULT_UPDATE_RATIO,
+                        help=f"Updated rows per day as a fraction of live rows (default: {DEFAULT_UPDATE_RATIO})")
+    parser.add_argument('--delete-ratio', type=float, default=DEFAULT_DELETE_RATIO,
+                        help=f"Deleted rows per day as a fraction of live rows (default: {DEFAULT_DELETE_RATIO})")
+    parser.add_argument('--tables', nargs='+', choices=TABLES, help="Only generate deltas for these tables")
+    parser.add_argument('--seed', type=int, help="Base seed (default: seed from the manifest)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print("\n🚀 Starting Delta Batch Generation")
+    print(f"📂 Source run: {args.from_dir} | Days: {args.days} | "
+          f"insert={args.insert_ratio} update={args.update_ratio} delete={args.delete_ratio}")
+
+    delta_manifest = run_delta_generation(
+        source_dir=args.from_dir,
+        days=args.days,
+        ratios={'insert': args.insert_ratio, 'update': args.update_ratio, 'delete': args.delete_ratio},
+        tables=args.tables,
+        seed=args.seed
+    )
+
+    print(f"\n✅ Delta batches generated in {delta_manifest['elapsed_sec']:.1f} seconds!")
+    print(f"🧾 Manifest: {Path(args.from_dir) / DELTA_DIR_NAME / DELTA_MANIFEST_FILE}")
+
+
+if __name__ == '__main__':
+    main()
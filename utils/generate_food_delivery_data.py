@@ -1,76 +1,85 @@
+import argparse
 import csv
 import random
-from datetime import datetime, timedelta
-from faker import Faker
+import time
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 import json
 import os
 from pathlib import Path
 from tqdm import tqdm
 import multiprocessing as mp
-from functools import partial
+import numpy as np
+from utils.key_distributions import KeySampler
+from utils.defect_injection import DefectInjector
 
-fake = Faker('en_IN')
-Faker.seed(42)
-random.seed(42)
+SEED = 42
 
-# Create base data directory structure
+random.seed(SEED)
+
+# Default output location (override with --output-dir)
 BASE_DIR = Path(__file__).parent.parent / 'data'
 TABLES = ['location', 'restaurant', 'customer', 'customer_address', 'menu',
           'delivery_agent', 'delivery', 'order', 'order_item']
 
-# Create directories if they don't exist
-for table in TABLES:
-    table_dir = BASE_DIR / table
-    table_dir.mkdir(parents=True, exist_ok=True)
+MANIFEST_FILE = 'generation_manifest.json'
+# Sidecar files (defect labels etc.) live here so stage uploads of the table directories skip them
+GROUND_TRUTH_DIR = '_ground_truth'
+
+# ===== SCALE PROFILES: PICK WITH --profile, OVERRIDE WITH --rows TABLE=N =====
+SCALE_PROFILES = {
+    # Testing - runs in seconds
+    'small': {
+        'location': 600,
+        'restaurant': 5_000,
+        'customer': 50_000,
+        'customer_address': 75_000,
+        'menu': 150_000,
+        'delivery_agent': 10_000,
+        'order': 200_000,
+        'order_item': 500_000,
+        'delivery': 200_000,
+    },
+    # Development - runs in 1-2 minutes
+    'medium': {
+        'location': 600,
+        'restaurant': 25_000,
+        'customer': 500_000,
+        'customer_address': 750_000,
+        'menu': 750_000,
+        'delivery_agent': 50_000,
+        'order': 2_000_000,
+        'order_item': 5_000_000,
+        'delivery': 2_000_000,
+    },
+    # Production - runs in 5-10 minutes with chunking
+    'large': {
+        'location': 600,
+        'restaurant': 250_000,
+        'customer': 5_000_000,
+        'customer_address': 7_500_000,
+        'menu': 7_500_000,
+        'delivery_agent': 350_000,
+        'order': 15_000_000,
+        'order_item': 40_000_000,
+        'delivery': 15_000_000,
+    },
+    # Realistic month of traffic
+    'realistic': {
+        'location': 600,                # Cities where service operates
+        'restaurant': 250_000,          # Restaurant partners
+        'customer': 18_000_000,         # Monthly active customers
+        'customer_address': 27_000_000,  # 1.5 addresses per customer
+        'menu': 7_500_000,              # ~30 items per restaurant
+        'delivery_agent': 350_000,      # Active delivery partners
+        'order': 45_000_000,            # Monthly orders
+        'order_item': 120_000_000,      # ~2.7 items per order average
+        'delivery': 45_000_000,         # One delivery per order
+    },
+}
+DEFAULT_PROFILE = 'medium'
 
-# ===== CONFIGURATION: ADJUST BASED ON YOUR NEEDS =====
-# Small Scale (Testing - runs in seconds)
-# NUM_LOCATIONS = 600
-# NUM_RESTAURANTS = 5_000
-# NUM_CUSTOMERS = 50_000
-# NUM_CUSTOMER_ADDRESSES = 75_000
-# NUM_MENU_ITEMS = 150_000
-# NUM_DELIVERY_AGENTS = 10_000
-# NUM_ORDERS = 200_000
-# NUM_ORDER_ITEMS = 500_000
-# NUM_DELIVERIES = 200_000
-
-# Medium Scale (Development - runs in 1-2 minutes)
-NUM_LOCATIONS = 600
-NUM_RESTAURANTS = 25_000
-NUM_CUSTOMERS = 500_000
-NUM_CUSTOMER_ADDRESSES = 750_000
-NUM_MENU_ITEMS = 750_000
-NUM_DELIVERY_AGENTS = 50_000
-NUM_ORDERS = 2_000_000
-NUM_ORDER_ITEMS = 5_000_000
-NUM_DELIVERIES = 2_000_000
-
-# Large Scale (Production - runs in 5-10 minutes with chunking)
-# NUM_LOCATIONS = 600
-# NUM_RESTAURANTS = 250_000
-# NUM_CUSTOMERS = 5_000_000
-# NUM_CUSTOMER_ADDRESSES = 7_500_000
-# NUM_MENU_ITEMS = 7_500_000
-# NUM_DELIVERY_AGENTS = 350_000
-# NUM_ORDERS = 15_000_000
-# NUM_ORDER_ITEMS = 40_000_000
-# NUM_DELIVERIES = 15_000_000
-
-# Updated realistic numbers
-# NUM_LOCATIONS = 600  # Cities where service operates
-# NUM_RESTAURANTS = 250_000  # Restaurant partners
-# NUM_CUSTOMERS = 18_000_000  # Monthly active customers
-# NUM_CUSTOMER_ADDRESSES = 27_000_000  # 1.5 addresses per customer
-# NUM_MENU_ITEMS = 7_500_000  # ~30 items per restaurant
-# NUM_DELIVERY_AGENTS = 350_000  # Active delivery partners
-# NUM_ORDERS_PER_DAY = 1_500_000  # Daily orders
-# NUM_ORDERS_PER_MONTH = 45_000_000  # Monthly orders
-# NUM_ORDER_ITEMS = 120_000_000  # ~2.7 items per order average
-# NUM_DELIVERIES = 45_000_000  # One delivery per order
-# NUM_ORDERS = 15_000_000
-
-# ORDERS BY TIME PERIOD:
+# ORDERS BY TIME PERIOD (realistic profile):
 # Per Hour (Average): 62,500 orders
 # Per Hour (Peak 6-10 PM): 225,000 orders
 # Per Day: 1,500,000 orders
@@ -79,6 +88,117 @@ NUM_DELIVERIES = 2_000_000
 
 CHUNK_SIZE = 50_000  # Write in chunks to avoid memory issues
 
+# ===== FOREIGN KEY DISTRIBUTIONS =====
+# Controls how child rows pick their parent keys. Production traffic is heavily
+# skewed (a few restaurants and power users take most orders), which is what
+# stresses MERGE/SCD2 and the marts' GROUP BYs. Supported types:
+#   {'type': 'uniform'}
+#   {'type': 'zipf', 'exponent': 1.1}                              # rank r gets 1/r^exponent
+#   {'type': 'head_tail', 'head_fraction': 0.01, 'head_weight': 0.5}  # 1% of keys get 50% of rows
+# Set every entry to uniform to reproduce the original flat datasets.
+FK_DISTRIBUTIONS = {
+    'restaurant.location_id': {'type': 'zipf', 'exponent': 0.8},
+    'customer_address.customer_id': {'type': 'uniform'},
+    'menu.restaurant_id': {'type': 'uniform'},
+    'delivery_agent.location_id': {'type': 'zipf', 'exponent': 0.8},
+    'order.customer_id': {'type': 'zipf', 'exponent': 1.1},
+    'order.restaurant_id': {'type': 'zipf', 'exponent': 1.2},
+    'order_item.order_id': {'type': 'uniform'},
+    'order_item.menu_id': {'type': 'zipf', 'exponent': 1.0},
+    'delivery.order_id': {'type': 'uniform'},
+    'delivery.delivery_agent_id': {'type': 'head_tail', 'head_fraction': 0.05, 'head_weight': 0.4},
+    'delivery.customer_address_id': {'type': 'uniform'},
+}
+
+# ===== DATA QUALITY DEFECTS =====
+# Defects injected per table, labelled in <output_dir>/_ground_truth/<table>_defects.csv
+# with the COMMON.DQ_CONFIG validation type expected to catch them:
+#   null -> MANDATORY_CHECK, bad_enum -> VALUE_CHECK,
+#   lookup_miss -> LOOKUP_CHECK, duplicate -> DUPLICATE_ALLOW_ONE_CHECK
+DQ_DEFECT_RATE = 0.005
+
+DELIVERY_RAW_DEFECTS = [
+    {'type': 'null', 'column': 'ORDER_ID_RAW', 'rate': 0.02},
+    {'type': 'bad_enum', 'column': 'DELIVERY_AGENT_ID_RAW', 'rate': 0.03, 'values': ['NULL']},
+    {'type': 'null', 'column': 'DELIVERY_STATUS_RAW', 'rate': 0.01},
+    {'type': 'bad_enum', 'column': 'ESTIMATED_TIME_RAW', 'rate': 0.05, 'values': ['TBD']},
+    {'type': 'null', 'column': 'CUSTOMER_ADDRESS_ID_RAW', 'rate': 0.02},
+    {'type': 'null', 'column': 'DELIVERY_DATE_RAW', 'rate': 0.04},
+]
+
+DEFECT_PROFILES = {
+    'none': {},
+    # Original behaviour: only the delivery *_RAW columns carry defects
+    'delivery_raw': {
+        'delivery': DELIVERY_RAW_DEFECTS,
+    },
+    # Defects for every table, matching the rule types in COMMON.DQ_CONFIG
+    'dq': {
+        'location': [
+            {'type': 'null', 'column': 'CITY', 'rate': DQ_DEFECT_RATE},
+            {'type': 'bad_enum', 'column': 'STATE', 'rate': DQ_DEFECT_RATE, 'values': ['Unknown', 'XX']},
+            {'type': 'duplicate', 'rate': DQ_DEFECT_RATE},
+        ],
+        'restaurant': [
+            {'type': 'null', 'column': 'RESTAURANT_NAME', 'rate': DQ_DEFECT_RATE},
+            {'type': 'bad_enum', 'column': 'ACTIVE_FLAG', 'rate': DQ_DEFECT_RATE, 'values': ['X', 'Maybe']},
+            {'type': 'lookup_miss', 'column': 'LOCATION_ID', 'parent': 'location', 'rate': DQ_DEFECT_RATE},
+            {'type': 'duplicate', 'rate': DQ_DEFECT_RATE},
+        ],
+        'customer': [
+            {'type': 'null', 'column': 'CUSTOMER_NAME', 'rate': DQ_DEFECT_RATE},
+            {'type': 'null', 'column': 'MOBILE', 'rate': DQ_DEFECT_RATE},
+            {'type': 'bad_enum', 'column': 'LOGIN_BY_USING', 'rate': DQ_DEFECT_RATE, 'values': ['Telegram', 'SSO']},
+            {'type': 'duplicate', 'rate': DQ_DEFECT_RATE},
+        ],
+        'customer_address': [
+            {'type': 'null', 'column': 'CUSTOMER_ID', 'rate': DQ_DEFECT_RATE},
+            {'type': 'bad_enum', 'column': 'ADDRESSTYPE', 'rate': DQ_DEFECT_RATE, 'values': ['Hotel', 'PG']},
+            {'type': 'lookup_miss', 'column': 'CUSTOMER_ID', 'parent': 'customer', 'rate': DQ_DEFECT_RATE},
+            {'type': 'duplicate', 'rate': DQ_DEFECT_RATE},
+        ],
+        'menu': [
+            {'type': 'null', 'column': 'ITEM_NAME', 'rate': DQ_DEFECT_RATE},
+            {'type': 'bad_enum', 'column': 'AVAILABILITY', 'rate': DQ_DEFECT_RATE, 'values': ['Discontinued']},
+            {'type': 'lookup_miss', 'column': 'RESTAURANT_ID', 'parent': 'restaurant', 'rate': DQ_DEFECT_RATE},
+            {'type': 'duplicate', 'rate': DQ_DEFECT_RATE},
+        ],
+        'delivery_agent': [
+            {'type': 'null', 'column': 'DELIVERY_AGENT_NAME', 'rate': DQ_DEFECT_RATE},
+            {'type': 'bad_enum', 'column': 'VEHICLE_TYPE', 'rate': DQ_DEFECT_RATE, 'values': ['Truck', 'Drone']},
+            {'type': 'lookup_miss', 'column': 'LOCATION_ID', 'parent': 'location', 'rate': DQ_DEFECT_RATE},
+            {'type': 'duplicate', 'rate': DQ_DEFECT_RATE},
+        ],
+        'order': [
+            {'type': 'null', 'column': 'CUSTOMER_ID', 'rate': DQ_DEFECT_RATE},
+            {'type': 'null', 'column': 'PAYMENT_METHOD', 'rate': DQ_DEFECT_RATE},
+            {'type': 'bad_enum', 'column': 'ORDER_STATUS', 'rate': DQ_DEFECT_RATE, 'values': ['SHIPPED', 'UNKNOWN']},
+            {'type': 'bad_enum', 'column': 'PAYMENT_METHOD', 'rate': DQ_DEFECT_RATE, 'values': ['Bitcoin', 'Cheque']},
+            {'type': 'lookup_miss', 'column': 'CUSTOMER_ID', 'parent': 'customer', 'rate': DQ_DEFECT_RATE},
+            {'type': 'lookup_miss', 'column': 'RESTAURANT_ID', 'parent': 'restaurant', 'rate': DQ_DEFECT_RATE},
+            {'type': 'duplicate', 'rate': DQ_DEFECT_RATE},
+        ],
+        'order_item': [
+            {'type': 'null', 'column': 'ORDER_ID', 'rate': DQ_DEFECT_RATE},
+            {'type': 'null', 'column': 'MENU_ID', 'rate': DQ_DEFECT_RATE},
+            {'type': 'null', 'column': 'QUANTITY', 'rate': DQ_DEFECT_RATE},
+            {'type': 'lookup_miss', 'column': 'ORDER_ID', 'parent': 'order', 'rate': DQ_DEFECT_RATE},
+            {'type': 'lookup_miss', 'column': 'MENU_ID', 'parent': 'menu', 'rate': DQ_DEFECT_RATE},
+            {'type': 'duplicate', 'rate': DQ_DEFECT_RATE},
+        ],
+        'delivery': DELIVERY_RAW_DEFECTS + [
+            {'type': 'null', 'column': 'ORDER_ID', 'rate': DQ_DEFECT_RATE},
+            {'type': 'null', 'column': 'DELIVERY_STATUS', 'rate': DQ_DEFECT_RATE},
+            {'type': 'bad_enum', 'column': 'DELIVERY_STATUS', 'rate': DQ_DEFECT_RATE, 'values': ['LOST', 'UNKNOWN']},
+            {'type': 'lookup_miss', 'column': 'ORDER_ID', 'parent': 'order', 'rate': DQ_DEFECT_RATE},
+            {'type': 'lookup_miss', 'column': 'DELIVERY_AGENT_ID', 'parent': 'delivery_agent',
+             'rate': DQ_DEFECT_RATE},
+            {'type': 'duplicate', 'rate': DQ_DEFECT_RATE},
+        ],
+    },
+}
+DEFAULT_DEFECT_PROFILE = 'delivery_raw'
+
 # ===== REFERENCE DATA POOLS (Pre-generated for speed) =====
 CITIES = [
     ('Mumbai', 'Maharashtra'),
@@ -137,12 +257,7 @@ DELIVERY_STATUSES = ['Assigned', 'Picked Up', 'In Transit', 'Delivered', 'Failed
 LOGIN_METHODS = ['Google', 'Facebook', 'Email', 'Phone', 'Apple']
 ADDRESS_TYPES = ['Home', 'Work', 'Other']
 
-# Pre-generate name pools for speed
-print("Pre-generating data pools...")
-NAME_POOL = [fake.name() for _ in range(10000)]
 RESTAURANT_SUFFIXES = ['Restaurant', 'Cafe', 'Kitchen', 'Dhaba', 'Bistro', 'Eatery', 'Express', 'Hub']
-COMPANY_POOL = [fake.company() for _ in range(5000)]
-STREET_POOL = [fake.street_name() for _ in range(5000)]
 BUILDING_SUFFIXES = ['Tower', 'Apartment', 'Complex', 'Villa', 'Residency', 'Heights']
 LANDMARKS = ['Mall', 'Park', 'School', 'Hospital', 'Metro Station', 'Market', 'Temple', 'Cinema']
 
@@ -159,32 +274,117 @@ ITEM_NAMES = {
 }
 
 
+# Word lists for synthesizing names, companies and streets without Faker
+FIRST_NAMES = ['Aarav', 'Vivaan', 'Aditya', 'Vihaan', 'Arjun', 'Sai', 'Reyansh', 'Ayaan', 'Krishna', 'Ishaan',
+               'Rohan', 'Rahul', 'Amit', 'Vikram', 'Suresh', 'Rajesh', 'Karan', 'Nikhil', 'Manish', 'Deepak',
+               'Anil', 'Sanjay', 'Harsh', 'Yash', 'Kunal', 'Pranav', 'Siddharth', 'Varun', 'Gaurav', 'Abhishek',
+               'Aadhya', 'Ananya', 'Diya', 'Saanvi', 'Aanya', 'Pari', 'Myra', 'Anika', 'Navya', 'Kiara',
+               'Priya', 'Pooja', 'Neha', 'Sneha', 'Kavya', 'Riya', 'Shreya', 'Divya', 'Meera', 'Lakshmi',
+               'Sunita', 'Anjali', 'Nisha', 'Swati', 'Aishwarya', 'Ritu', 'Tanvi', 'Ishita', 'Payal', 'Simran']
+LAST_NAMES = ['Sharma', 'Verma', 'Gupta', 'Singh', 'Kumar', 'Patel', 'Shah', 'Mehta', 'Iyer', 'Iyengar',
+              'Reddy', 'Rao', 'Naidu', 'Nair', 'Menon', 'Pillai', 'Das', 'Bose', 'Chatterjee', 'Banerjee',
+              'Mukherjee', 'Ghosh', 'Sen', 'Joshi', 'Kulkarni', 'Deshpande', 'Patil', 'Jadhav', 'Pawar', 'Kapoor',
+              'Malhotra', 'Khanna', 'Chopra', 'Arora', 'Bhatia', 'Sethi', 'Agarwal', 'Jain', 'Bansal', 'Goel',
+              'Mishra', 'Pandey', 'Tiwari', 'Dubey', 'Srivastava', 'Saxena', 'Yadav', 'Chauhan', 'Rathore', 'Thakur']
+COMPANY_WORDS = ['Spice', 'Saffron', 'Tandoor', 'Masala', 'Royal', 'Golden', 'Green', 'Urban', 'Desi', 'Curry',
+                 'Bombay', 'Madras', 'Punjab', 'Lotus', 'Peacock', 'Tiffin', 'Chutney', 'Mango', 'Silver', 'Blue',
+                 'Maharaja', 'Nawab', 'Zaika', 'Swad', 'Rasoi', 'Annapurna', 'Shree', 'Sagar', 'Amrit', 'Kesar']
+COMPANY_TYPES = ['Foods', 'Enterprises', 'Caterers', 'Hospitality', 'Group', 'Ventures', 'Traders', 'Brothers',
+                 'and Sons', 'Pvt Ltd', 'Associates', 'Industries']
+STREET_PREFIXES = ['MG', 'Gandhi', 'Nehru', 'Station', 'Temple', 'Church', 'Market', 'Lake', 'Hill', 'Park',
+                   'Ring', 'Link', 'Tilak', 'Patel', 'Subhash', 'Rajaji', 'Ambedkar', 'Shivaji', 'Tagore', 'Netaji',
+                   'Old Airport', 'New Colony', 'Cantonment', 'Civil Lines', 'Brigade', 'Residency', 'Mall', 'Fort']
+STREET_SUFFIXES = ['Road', 'Marg', 'Street', 'Lane', 'Nagar', 'Colony', 'Chowk', 'Bazaar', 'Layout', 'Cross']
+EMAIL_DOMAINS = ['gmail.com', 'yahoo.com', 'outlook.com']
+
+
+@lru_cache(maxsize=1)
+def get_pools():
+    """
+    Build the name, company and street pools on first use.
+
+    Pools are synthesized from the word lists above with their own seeded RNG,
+    so they are identical across runs and processes, and importing this module
+    for its constants costs nothing.
+    """
+    rng = random.Random(SEED)
+    names = [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}" for _ in range(10000)]
+    return {
+        'names': names,
+        # Email local parts derived from the name at the same index
+        'email_names': [name.lower().replace(' ', '.') for name in names],
+        'companies': [f"{' '.join(rng.sample(COMPANY_WORDS, 2))} {rng.choice(COMPANY_TYPES)}"
+                      for _ in range(5000)],
+        'streets': [f"{rng.choice(STREET_PREFIXES)} {rng.choice(STREET_SUFFIXES)}" for _ in range(5000)],
+    }
+
+
+def random_dates(start, end, batch_size=CHUNK_SIZE):
+    """
+    Yield 'YYYY-MM-DD' strings uniformly between start and end (inclusive).
+
+    Dates are drawn and formatted in numpy batches instead of one
+    datetime/strftime per row. The numpy generator is seeded from the
+    `random` module so output follows the per-table seed.
+    """
+    rng = np.random.default_rng(random.getrandbits(64))
+    start64 = np.datetime64(start, 'D')
+    span = int((np.datetime64(end, 'D') - start64).astype(int)) + 1
+    while True:
+        yield from (start64 + rng.integers(0, span, size=batch_size)).astype(str).tolist()
+
+
+def years_ago(years, today=None):
+    """Same calendar day `years` years before today (Feb 29 falls back to Feb 28)"""
+    today = today or date.today()
+    try:
+        return today.replace(year=today.year - years)
+    except ValueError:
+        return today.replace(year=today.year - years, day=28)
+
+
 def generate_indian_pincode():
     return str(random.randint(110001, 855118))
 
 
-def write_csv_chunked(filepath, data_generator, fieldnames, total, chunk_size=CHUNK_SIZE):
-    """Write CSV in chunks to handle large datasets"""
+def write_csv_chunked(filepath, data_generator, fieldnames, total, chunk_size=CHUNK_SIZE,
+                      show_progress=True):
+    """Write CSV in chunks to handle large datasets. Returns the number of rows written."""
+    rows_written = 0
     with open(filepath, 'w', newline='', encoding='utf-8') as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
 
         chunk = []
-        for i, row in enumerate(tqdm(data_generator, total=total, desc=f"Writing {filepath.name}")):
+        for row in tqdm(data_generator, total=total, desc=f"Writing {filepath.name}",
+                        disable=not show_progress):
             chunk.append(row)
             if len(chunk) >= chunk_size:
                 writer.writerows(chunk)
+                rows_written += len(chunk)
                 chunk = []
 
         # Write remaining rows
         if chunk:
             writer.writerows(chunk)
+            rows_written += len(chunk)
+
+    return rows_written
+
+
+def build_key_sampler(relationship, num_keys, distributions=None, seed=SEED):
+    """Create a KeySampler for a 'table.column' relationship using FK_DISTRIBUTIONS"""
+    distributions = FK_DISTRIBUTIONS if distributions is None else distributions
+    spec = distributions.get(relationship, {'type': 'uniform'})
+    # Derive a stable per-relationship seed so each FK stream is reproducible on its own
+    relationship_seed = seed + sum(ord(c) for c in relationship)
+    return KeySampler(num_keys, spec, seed=relationship_seed, batch_size=CHUNK_SIZE)
 
 
 # ===== DATA GENERATORS (Memory-efficient) =====
 
-def generate_locations():
-    for i in range(1, NUM_LOCATIONS + 1):
+def generate_locations(ids):
+    for i in ids:
         city, state = random.choice(CITIES)
         yield {
             'LOCATION_BRZ_ID': i,
@@ -194,35 +394,44 @@ def generate_locations():
         }
 
 
-def generate_restaurants(location_ids):
-    for i in range(1, NUM_RESTAURANTS + 1):
+def generate_restaurants(ids, location_sampler):
+    pools = get_pools()
+    for i in ids:
         lat = round(random.uniform(8.0, 35.0), 6)
         lon = round(random.uniform(68.0, 97.0), 6)
 
         yield {
             'RESTAURANT_BRZ_ID': i,
             'FSSAI_REGISTRATION_NO': random.randint(10000000000000, 99999999999999),
-            'RESTAURANT_NAME': random.choice(COMPANY_POOL) + ' ' + random.choice(RESTAURANT_SUFFIXES),
+            'RESTAURANT_NAME': random.choice(pools['companies']) + ' ' + random.choice(RESTAURANT_SUFFIXES),
             'CUISINE_TYPE': random.choice(CUISINES),
             'PRICING_FOR_TWO': str(random.choice([300, 400, 500, 600, 800, 1000, 1200, 1500, 2000])),
             'RESTAURANT_PHONE': f"+91{random.randint(7000000000, 9999999999)}",
             'OPERATING_HOURS': '10:00 AM - 11:00 PM',
-            'LOCATION_ID': random.choice(location_ids),
+            'LOCATION_ID': next(location_sampler),
             'ACTIVE_FLAG': random.choice(['Y', 'Y', 'Y', 'Y', 'N']),
             'OPEN_STATUS': random.choice(['Open', 'Open', 'Open', 'Closed', 'Temporarily Closed']),
-            'LOCALITY': random.choice(STREET_POOL),
-            'RESTAURANT_ADDRESS': f"{random.randint(1, 500)}, {random.choice(STREET_POOL)}",
+            'LOCALITY': random.choice(pools['streets']),
+            'RESTAURANT_ADDRESS': f"{random.randint(1, 500)}, {random.choice(pools['streets'])}",
             'LATITUDE': lat,
             'LONGITUDE': lon
         }
 
 
-def generate_customers():
-    for i in range(1, NUM_CUSTOMERS + 1):
+def generate_customers(ids):
+    pools = get_pools()
+    num_names = len(pools['names'])
+    today = date.today()
+    # Customers are 18-70 years old; anniversaries fall within the last 20 years
+    dobs = random_dates(years_ago(70, today) + timedelta(days=1), years_ago(18, today))
+    anniversaries = random_dates(years_ago(20, today), today)
+
+    for i in ids:
         gender = random.choice(['Male', 'Female', 'Other'])
-        dob = fake.date_of_birth(minimum_age=18, maximum_age=70)
+        name_idx = random.randrange(num_names)
+        dob = next(dobs)
         has_anniversary = random.random() > 0.4
-        anniversary = fake.date_between(start_date='-20y', end_date='today') if has_anniversary else None
+        anniversary = next(anniversaries) if has_anniversary else ''
 
         preferences = {
             'favorite_cuisines': random.sample(CUISINES, k=random.randint(1, 3)),
@@ -232,32 +441,33 @@ def generate_customers():
 
         yield {
             'CUSTOMER_BRZ_ID': i,
-            'CUSTOMER_NAME': random.choice(NAME_POOL),
+            'CUSTOMER_NAME': pools['names'][name_idx],
             'MOBILE': f"+91{random.randint(7000000000, 9999999999)}",
-            'EMAIL': f"user{i}@{random.choice(['gmail.com', 'yahoo.com', 'outlook.com'])}",
+            'EMAIL': f"{pools['email_names'][name_idx]}{i}@{random.choice(EMAIL_DOMAINS)}",
             'LOGIN_BY_USING': random.choice(LOGIN_METHODS),
             'GENDER': gender,
-            'DOB': dob.strftime('%Y-%m-%d'),
-            'ANNIVERSARY': anniversary.strftime('%Y-%m-%d') if anniversary else '',
+            'DOB': dob,
+            'ANNIVERSARY': anniversary,
             'PREFERENCES': json.dumps(preferences)
         }
 
 
-def generate_customer_addresses(customer_ids):
-    for i in range(1, NUM_CUSTOMER_ADDRESSES + 1):
+def generate_customer_addresses(ids, customer_sampler):
+    pools = get_pools()
+    for i in ids:
         city, state = random.choice(CITIES)
         lat = round(random.uniform(8.0, 35.0), 6)
         lon = round(random.uniform(68.0, 97.0), 6)
 
         yield {
             'CUSTOMER_ADDRESS_BRZ_ID': i,
-            'CUSTOMER_ID': random.choice(customer_ids),
+            'CUSTOMER_ID': next(customer_sampler),
             'FLAT_NO': random.randint(1, 500),
             'HOUSE_NO': random.randint(1, 999),
             'FLOOR_NO': random.randint(0, 20),
-            'BUILDING': f"{random.choice(COMPANY_POOL)[:15]} {random.choice(BUILDING_SUFFIXES)}",
+            'BUILDING': f"{random.choice(pools['companies'])[:15]} {random.choice(BUILDING_SUFFIXES)}",
             'LANDMARK': f"Near {random.choice(LANDMARKS)}",
-            'LOCALITY': random.choice(STREET_POOL),
+            'LOCALITY': random.choice(pools['streets']),
             'CITY': city,
             'STATE': state,
             'ZIPCODE': int(generate_indian_pincode()),
@@ -267,14 +477,14 @@ def generate_customer_addresses(customer_ids):
         }
 
 
-def generate_menu_items(restaurant_ids):
-    for i in range(1, NUM_MENU_ITEMS + 1):
+def generate_menu_items(ids, restaurant_sampler):
+    for i in ids:
         item_type = random.choice(ITEM_TYPES)
         category = random.choice(CATEGORIES)
 
         yield {
             'MENU_ID': i,
-            'RESTAURANT_ID': random.choice(restaurant_ids),
+            'RESTAURANT_ID': next(restaurant_sampler),
             'ITEM_NAME': random.choice(ITEM_NAMES[item_type]),
             'DESCRIPTION': f"Delicious {item_type} {category.lower()}",
             'PRICE': round(random.uniform(50, 500), 2),
@@ -284,205 +494,440 @@ def generate_menu_items(restaurant_ids):
         }
 
 
-def generate_delivery_agents(location_ids):
-    for i in range(1, NUM_DELIVERY_AGENTS + 1):
+def generate_delivery_agents(ids, location_sampler):
+    pools = get_pools()
+    for i in ids:
         yield {
             'DELIVERY_AGENT_ID': i,
-            'DELIVERY_AGENT_NAME': random.choice(NAME_POOL),
+            'DELIVERY_AGENT_NAME': random.choice(pools['names']),
             'PHONE': random.randint(7000000000, 9999999999),
             'VEHICLE_TYPE': random.choice(VEHICLE_TYPES),
-            'LOCATION_ID': random.choice(location_ids),
+            'LOCATION_ID': next(location_sampler),
             'IS_ACTIVE': random.choice(['Y', 'Y', 'Y', 'N']),
             'GENDER': random.choice(['Male', 'Female']),
             'RATING': round(random.uniform(3.5, 5.0), 1)
         }
 
 
-def generate_orders(customer_ids, restaurant_ids):
-    start_date = datetime.now() - timedelta(days=365)
-
-    for i in range(1, NUM_ORDERS + 1):
-        order_date = start_date + timedelta(days=random.randint(0, 365))
+def generate_orders(ids, customer_sampler, restaurant_sampler):
+    today = date.today()
+    order_dates = random_dates(today - timedelta(days=365), today)
 
+    for i in ids:
         yield {
             'ORDER_ID': f'ORD{i:08d}',
-            'CUSTOMER_ID': random.choice(customer_ids),
-            'RESTAURANT_ID': random.choice(restaurant_ids),
-            'ORDER_DATE': order_date.strftime('%Y-%m-%d'),
+            'CUSTOMER_ID': next(customer_sampler),
+            'RESTAURANT_ID': next(restaurant_sampler),
+            'ORDER_DATE': next(order_dates),
             'TOTAL_AMOUNT': round(random.uniform(200, 2000), 2),
             'ORDER_STATUS': random.choice(ORDER_STATUSES),
             'PAYMENT_METHOD': random.choice(PAYMENT_METHODS)
         }
 
 
-def generate_order_items(order_ids, menu_ids):
-    for i in range(1, NUM_ORDER_ITEMS + 1):
+def generate_order_items(ids, order_sampler, menu_sampler):
+    today = date.today()
+    order_dates = random_dates(today - timedelta(days=365), today)
+
+    for i in ids:
         quantity = random.randint(1, 5)
         price = round(random.uniform(50, 500), 2)
         subtotal = round(quantity * price, 2)
 
         yield {
             'ORDER_ITEM_ID': f'OI{i:09d}',
-            'ORDER_ID': random.choice(order_ids),
-            'MENU_ID': random.choice(menu_ids),
+            'ORDER_ID': f'ORD{next(order_sampler):08d}',
+            'MENU_ID': next(menu_sampler),
             'QUANTITY': quantity,
             'PRICE': price,
             'SUBTOTAL': subtotal,
-            'ORDER_TIMESTAMP': (datetime.now() - timedelta(days=random.randint(0, 365))).strftime('%Y-%m-%d')
+            'ORDER_TIMESTAMP': next(order_dates)
         }
 
 
-def generate_deliveries(order_ids, agent_ids, address_ids):
-    for i in range(1, NUM_DELIVERIES + 1):
+def generate_deliveries(ids, order_sampler, agent_sampler, address_sampler):
+    for i in ids:
         delivery_date = datetime.now() - timedelta(days=random.randint(0, 365),
                                                    minutes=random.randint(30, 120))
 
-        # Simulate data quality issues
-        order_id_raw = random.choice(order_ids) if random.random() > 0.02 else ''
-        agent_id_raw = str(random.choice(agent_ids)) if random.random() > 0.03 else 'NULL'
-        status_raw = random.choice(DELIVERY_STATUSES) if random.random() > 0.01 else ''
-        estimated_time_raw = f"{random.randint(20, 60)} mins" if random.random() > 0.05 else 'TBD'
-        address_id_raw = str(random.choice(address_ids)) if random.random() > 0.02 else ''
-        delivery_date_raw = delivery_date.strftime('%Y-%m-%d %H:%M:%S%z') if random.random() > 0.04 else ''
+        order_id = f'ORD{next(order_sampler):08d}'
+        agent_id = next(agent_sampler)
+        status = random.choice(DELIVERY_STATUSES)
+        estimated_time = f"{random.randint(20, 60)} mins"
+        address_id = next(address_sampler)
+        delivery_date_str = delivery_date.strftime('%Y-%m-%d %H:%M:%S+05:30')
 
+        # *_RAW columns carry the value as it arrived; data quality issues are
+        # injected into them by DefectInjector (see DEFECT_PROFILES)
         yield {
             'DELIVERY_ID': f'DEL{i:08d}',
-            'ORDER_ID': random.choice(order_ids),
-            'DELIVERY_AGENT_ID': random.choice(agent_ids),
-            'DELIVERY_STATUS': random.choice(DELIVERY_STATUSES),
-            'ESTIMATED_TIME': f"{random.randint(20, 60)} mins",
-            'CUSTOMER_ADDRESS_ID': random.choice(address_ids),
-            'DELIVERY_DATE': delivery_date.strftime('%Y-%m-%d %H:%M:%S+05:30'),
-            'ORDER_ID_RAW': order_id_raw,
-            'DELIVERY_AGENT_ID_RAW': agent_id_raw,
-            'DELIVERY_STATUS_RAW': status_raw,
-            'ESTIMATED_TIME_RAW': estimated_time_raw,
-            'CUSTOMER_ADDRESS_ID_RAW': address_id_raw,
-            'DELIVERY_DATE_RAW': delivery_date_raw,
+            'ORDER_ID': order_id,
+            'DELIVERY_AGENT_ID': agent_id,
+            'DELIVERY_STATUS': status,
+            'ESTIMATED_TIME': estimated_time,
+            'CUSTOMER_ADDRESS_ID': address_id,
+            'DELIVERY_DATE': delivery_date_str,
+            'ORDER_ID_RAW': order_id,
+            'DELIVERY_AGENT_ID_RAW': str(agent_id),
+            'DELIVERY_STATUS_RAW': status,
+            'ESTIMATED_TIME_RAW': estimated_time,
+            'CUSTOMER_ADDRESS_ID_RAW': str(address_id),
+            'DELIVERY_DATE_RAW': delivery_date_str,
             'INGEST_RUN_ID': f'RUN_{datetime.now().strftime("%Y%m%d_%H%M%S")}',
             'CREATED_AT': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             'UPDATED_AT': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         }
 
 
-# ===== MAIN EXECUTION =====
-if __name__ == '__main__':
-    print("\n🚀 Starting Optimized Food Delivery Data Generation")
-    print(f"📊 Scale: {NUM_ORDERS:,} orders | {NUM_CUSTOMERS:,} customers | {NUM_RESTAURANTS:,} restaurants\n")
+# ===== TABLE REGISTRY =====
+# Generators take an iterable of integer keys followed by one KeySampler per
+# foreign_keys entry (relationship, parent table), in that order. key_format
+# renders an integer key the way it appears in the CSV.
+TABLE_SPECS = {
+    'location': {
+        'file': 'location_brz.csv',
+        'key_field': 'LOCATION_BRZ_ID',
+        'key_format': '{}',
+        'generator': generate_locations,
+        'foreign_keys': [],
+        'fields': ['LOCATION_BRZ_ID', 'CITY', 'STATE', 'ZIP_CODE'],
+    },
+    'restaurant': {
+        'file': 'restaurant_brz.csv',
+        'key_field': 'RESTAURANT_BRZ_ID',
+        'key_format': '{}',
+        'generator': generate_restaurants,
+        'foreign_keys': [('restaurant.location_id', 'location')],
+        'fields': ['RESTAURANT_BRZ_ID', 'FSSAI_REGISTRATION_NO', 'RESTAURANT_NAME', 'CUISINE_TYPE',
+                   'PRICING_FOR_TWO', 'RESTAURANT_PHONE', 'OPERATING_HOURS', 'LOCATION_ID',
+                   'ACTIVE_FLAG', 'OPEN_STATUS', 'LOCALITY', 'RESTAURANT_ADDRESS', 'LATITUDE', 'LONGITUDE'],
+    },
+    'customer': {
+        'file': 'customer_brz.csv',
+        'key_field': 'CUSTOMER_BRZ_ID',
+        'key_format': '{}',
+        'generator': generate_customers,
+        'foreign_keys': [],
+        'fields': ['CUSTOMER_BRZ_ID', 'CUSTOMER_NAME', 'MOBILE', 'EMAIL', 'LOGIN_BY_USING',
+                   'GENDER', 'DOB', 'ANNIVERSARY', 'PREFERENCES'],
+    },
+    'customer_address': {
+        'file': 'customer_address_brz.csv',
+        'key_field': 'CUSTOMER_ADDRESS_BRZ_ID',
+        'key_format': '{}',
+        'generator': generate_customer_addresses,
+        'foreign_keys': [('customer_address.customer_id', 'customer')],
+        'fields': ['CUSTOMER_ADDRESS_BRZ_ID', 'CUSTOMER_ID', 'FLAT_NO', 'HOUSE_NO', 'FLOOR_NO',
+                   'BUILDING', 'LANDMARK', 'LOCALITY', 'CITY', 'STATE', 'ZIPCODE',
+                   'COORDINATES', 'PRIMARYFLAG', 'ADDRESSTYPE'],
+    },
+    'menu': {
+        'file': 'menu_brz.csv',
+        'key_field': 'MENU_ID',
+        'key_format': '{}',
+        'generator': generate_menu_items,
+        'foreign_keys': [('menu.restaurant_id', 'restaurant')],
+        'fields': ['MENU_ID', 'RESTAURANT_ID', 'ITEM_NAME', 'DESCRIPTION', 'PRICE',
+                   'CATEGORY', 'AVAILABILITY', 'ITEM_TYPE'],
+    },
+    'delivery_agent': {
+        'file': 'delivery_agent_brz.csv',
+        'key_field': 'DELIVERY_AGENT_ID',
+        'key_format': '{}',
+        'generator': generate_delivery_agents,
+        'foreign_keys': [('delivery_agent.location_id', 'location')],
+        'fields': ['DELIVERY_AGENT_ID', 'DELIVERY_AGENT_NAME', 'PHONE', 'VEHICLE_TYPE',
+                   'LOCATION_ID', 'IS_ACTIVE', 'GENDER', 'RATING'],
+    },
+    'order': {
+        'file': 'order_brz.csv',
+        'key_field': 'ORDER_ID',
+        'key_format': 'ORD{:08d}',
+        'generator': generate_orders,
+        'foreign_keys': [('order.customer_id', 'customer'), ('order.restaurant_id', 'restaurant')],
+        'fields': ['ORDER_ID', 'CUSTOMER_ID', 'RESTAURANT_ID', 'ORDER_DATE',
+                   'TOTAL_AMOUNT', 'ORDER_STATUS', 'PAYMENT_METHOD'],
+    },
+    'order_item': {
+        'file': 'order_item_brz.csv',
+        'key_field': 'ORDER_ITEM_ID',
+        'key_format': 'OI{:09d}',
+        'generator': generate_order_items,
+        'foreign_keys': [('order_item.order_id', 'order'), ('order_item.menu_id', 'menu')],
+        'fields': ['ORDER_ITEM_ID', 'ORDER_ID', 'MENU_ID', 'QUANTITY', 'PRICE', 'SUBTOTAL', 'ORDER_TIMESTAMP'],
+    },
+    'delivery': {
+        'file': 'delivery_brz.csv',
+        'key_field': 'DELIVERY_ID',
+        'key_format': 'DEL{:08d}',
+        'generator': generate_deliveries,
+        'foreign_keys': [('delivery.order_id', 'order'),
+                         ('delivery.delivery_agent_id', 'delivery_agent'),
+                         ('delivery.customer_address_id', 'customer_address')],
+        'fields': ['DELIVERY_ID', 'ORDER_ID', 'DELIVERY_AGENT_ID', 'DELIVERY_STATUS', 'ESTIMATED_TIME',
+                   'CUSTOMER_ADDRESS_ID', 'DELIVERY_DATE', 'ORDER_ID_RAW', 'DELIVERY_AGENT_ID_RAW',
+                   'DELIVERY_STATUS_RAW', 'ESTIMATED_TIME_RAW', 'CUSTOMER_ADDRESS_ID_RAW',
+                   'DELIVERY_DATE_RAW', 'INGEST_RUN_ID', 'CREATED_AT', 'UPDATED_AT'],
+    },
+}
 
-    start_time = datetime.now()
 
-    # Generate Location
-    print("1/9 Generating LOCATION_BRZ...")
-    write_csv_chunked(
-        BASE_DIR / 'location' / 'location_brz.csv',
-        generate_locations(),
-        ['LOCATION_BRZ_ID', 'CITY', 'STATE', 'ZIP_CODE'],
-        NUM_LOCATIONS
-    )
-    location_ids = list(range(1, NUM_LOCATIONS + 1))
-
-    # Generate Restaurant
-    print("\n2/9 Generating RESTAURANT_BRZ...")
-    write_csv_chunked(
-        BASE_DIR / 'restaurant' / 'restaurant_brz.csv',
-        generate_restaurants(location_ids),
-        ['RESTAURANT_BRZ_ID', 'FSSAI_REGISTRATION_NO', 'RESTAURANT_NAME', 'CUISINE_TYPE',
-         'PRICING_FOR_TWO', 'RESTAURANT_PHONE', 'OPERATING_HOURS', 'LOCATION_ID',
-         'ACTIVE_FLAG', 'OPEN_STATUS', 'LOCALITY', 'RESTAURANT_ADDRESS', 'LATITUDE', 'LONGITUDE'],
-        NUM_RESTAURANTS
-    )
-    restaurant_ids = list(range(1, NUM_RESTAURANTS + 1))
-
-    # Generate Customer
-    print("\n3/9 Generating CUSTOMER_BRZ...")
-    write_csv_chunked(
-        BASE_DIR / 'customer' / 'customer_brz.csv',
-        generate_customers(),
-        ['CUSTOMER_BRZ_ID', 'CUSTOMER_NAME', 'MOBILE', 'EMAIL', 'LOGIN_BY_USING',
-         'GENDER', 'DOB', 'ANNIVERSARY', 'PREFERENCES'],
-        NUM_CUSTOMERS
-    )
-    customer_ids = list(range(1, NUM_CUSTOMERS + 1))
-
-    # Generate Customer Address
-    print("\n4/9 Generating CUSTOMER_ADDRESS_BRZ...")
-    write_csv_chunked(
-        BASE_DIR / 'customer_address' / 'customer_address_brz.csv',
-        generate_customer_addresses(customer_ids),
-        ['CUSTOMER_ADDRESS_BRZ_ID', 'CUSTOMER_ID', 'FLAT_NO', 'HOUSE_NO', 'FLOOR_NO',
-         'BUILDING', 'LANDMARK', 'LOCALITY', 'CITY', 'STATE', 'ZIPCODE',
-         'COORDINATES', 'PRIMARYFLAG', 'ADDRESSTYPE'],
-        NUM_CUSTOMER_ADDRESSES
-    )
-    address_ids = list(range(1, NUM_CUSTOMER_ADDRESSES + 1))
-
-    # Generate Menu
-    print("\n5/9 Generating MENU_BRZ...")
-    write_csv_chunked(
-        BASE_DIR / 'menu' / 'menu_brz.csv',
-        generate_menu_items(restaurant_ids),
-        ['MENU_ID', 'RESTAURANT_ID', 'ITEM_NAME', 'DESCRIPTION', 'PRICE',
-         'CATEGORY', 'AVAILABILITY', 'ITEM_TYPE'],
-        NUM_MENU_ITEMS
-    )
-    menu_ids = list(range(1, NUM_MENU_ITEMS + 1))
-
-    # Generate Delivery Agent
-    print("\n6/9 Generating DELIVERY_AGENT_BRZ...")
-    write_csv_chunked(
-        BASE_DIR / 'delivery_agent' / 'delivery_agent_brz.csv',
-        generate_delivery_agents(location_ids),
-        ['DELIVERY_AGENT_ID', 'DELIVERY_AGENT_NAME', 'PHONE', 'VEHICLE_TYPE',
-         'LOCATION_ID', 'IS_ACTIVE', 'GENDER', 'RATING'],
-        NUM_DELIVERY_AGENTS
-    )
-    agent_ids = list(range(1, NUM_DELIVERY_AGENTS + 1))
-
-    # Generate Order
-    print("\n7/9 Generating ORDER_BRZ...")
-    write_csv_chunked(
-        BASE_DIR / 'order' / 'order_brz.csv',
-        generate_orders(customer_ids, restaurant_ids),
-        ['ORDER_ID', 'CUSTOMER_ID', 'RESTAURANT_ID', 'ORDER_DATE',
-         'TOTAL_AMOUNT', 'ORDER_STATUS', 'PAYMENT_METHOD'],
-        NUM_ORDERS
-    )
-    order_ids = [f'ORD{i:08d}' for i in range(1, min(NUM_ORDERS + 1, 100001))]  # Sample for memory
-
-    # Generate Order Item
-    print("\n8/9 Generating ORDER_ITEM_BRZ...")
-    write_csv_chunked(
-        BASE_DIR / 'order_item' / 'order_item_brz.csv',
-        generate_order_items(order_ids, menu_ids),
-        ['ORDER_ITEM_ID', 'ORDER_ID', 'MENU_ID', 'QUANTITY', 'PRICE', 'SUBTOTAL', 'ORDER_TIMESTAMP'],
-        NUM_ORDER_ITEMS
-    )
+# ===== RUN CONFIGURATION =====
+
+def load_config_file(config_path):
+    """
+    Load a JSON run configuration.
+
+    Recognised keys: profile, rows ({table: count}), fk_distributions,
+    defects (profile name or {table: [rules]}), output_dir, seed, workers, tables.
+    """
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    unknown = set(config) - {'profile', 'rows', 'fk_distributions', 'defects', 'output_dir', 'seed',
+                             'workers', 'tables'}
+    if unknown:
+        raise ValueError(f"Unknown keys in {config_path}: {sorted(unknown)}")
+    return config
+
+
+def resolve_row_counts(profile=DEFAULT_PROFILE, overrides=None):
+    """Start from a named profile and apply per-table row count overrides"""
+    if profile not in SCALE_PROFILES:
+        raise ValueError(f"Unknown profile '{profile}', expected one of {list(SCALE_PROFILES)}")
+
+    counts = dict(SCALE_PROFILES[profile])
+    for table, count in (overrides or {}).items():
+        if table not in TABLE_SPECS:
+            raise ValueError(f"Unknown table '{table}', expected one of {TABLES}")
+        if int(count) < 1:
+            raise ValueError(f"Row count for '{table}' must be >= 1, got {count}")
+        counts[table] = int(count)
+    return counts
+
+
+def parse_row_overrides(values):
+    """Parse repeated TABLE=N command line values into a dict"""
+    overrides = {}
+    for value in values or []:
+        if '=' not in value:
+            raise ValueError(f"Expected TABLE=N, got '{value}'")
+        table, count = value.split('=', 1)
+        overrides[table.strip()] = int(count.replace('_', '').replace(',', ''))
+    return overrides
+
+
+# ===== GENERATION =====
+
+def resolve_defect_rules(defects=DEFAULT_DEFECT_PROFILE):
+    """Accept a DEFECT_PROFILES name or an explicit {table: [rules]} dict"""
+    if isinstance(defects, dict):
+        return defects
+    if defects not in DEFECT_PROFILES:
+        raise ValueError(f"Unknown defect profile '{defects}', expected one of {list(DEFECT_PROFILES)}")
+    return DEFECT_PROFILES[defects]
+
+
+def table_rows(table, counts, seed=SEED, distributions=None):
+    """
+    Row dicts for one table, before defect injection.
 
-    # Generate Delivery
-    print("\n9/9 Generating DELIVERY_BRZ...")
-    write_csv_chunked(
-        BASE_DIR / 'delivery' / 'delivery_brz.csv',
-        generate_deliveries(order_ids, agent_ids, address_ids),
-        ['DELIVERY_ID', 'ORDER_ID', 'DELIVERY_AGENT_ID', 'DELIVERY_STATUS', 'ESTIMATED_TIME',
-         'CUSTOMER_ADDRESS_ID', 'DELIVERY_DATE', 'ORDER_ID_RAW', 'DELIVERY_AGENT_ID_RAW',
-         'DELIVERY_STATUS_RAW', 'ESTIMATED_TIME_RAW', 'CUSTOMER_ADDRESS_ID_RAW',
-         'DELIVERY_DATE_RAW', 'INGEST_RUN_ID', 'CREATED_AT', 'UPDATED_AT'],
-        NUM_DELIVERIES
+    Re-seeds per table so the rows are identical regardless of worker count,
+    table order or whether they end up in a CSV or are streamed elsewhere.
+    """
+    spec = TABLE_SPECS[table]
+
+    # Re-seed per table so output is identical regardless of worker count or order
+    random.seed(seed + TABLES.index(table))
+
+    samplers = [
+        build_key_sampler(relationship, counts[parent], distributions, seed)
+        for relationship, parent in spec['foreign_keys']
+    ]
+    return spec['generator'](range(1, counts[table] + 1), *samplers)
+
+
+def generate_table(table, counts, output_dir, seed=SEED, distributions=None, show_progress=True,
+                   defect_rules=None):
+    """
+    Generate a single table's CSV. Every table only depends on its parents' row
+    counts, so tables can be generated independently (and in parallel).
+
+    Returns:
+        Manifest entry with rows, bytes, files, elapsed time and injected defect counts
+    """
+    spec = TABLE_SPECS[table]
+    table_seed = seed + TABLES.index(table)
+
+    table_dir = Path(output_dir) / table
+    table_dir.mkdir(parents=True, exist_ok=True)
+    file_path = table_dir / spec['file']
+
+    rows = table_rows(table, counts, seed, distributions)
+
+    injector = None
+    rules = (defect_rules or {}).get(table)
+    if rules:
+        parent_keys = {parent: (counts[parent], TABLE_SPECS[parent]['key_format']) for parent in TABLES
+                       if parent in counts}
+        injector = DefectInjector(rules, spec['key_field'], parent_keys, seed=table_seed, batch_size=CHUNK_SIZE)
+        truth_dir = Path(output_dir) / GROUND_TRUTH_DIR
+        truth_dir.mkdir(parents=True, exist_ok=True)
+        truth_file = truth_dir / f"{table}_defects.csv"
+        rows = injector.inject(rows, truth_file)
+
+    start = time.time()
+    rows_written = write_csv_chunked(
+        file_path,
+        rows,
+        spec['fields'],
+        counts[table],
+        show_progress=show_progress
     )
+    elapsed = time.time() - start
+
+    entry = {
+        'table': table,
+        'rows': rows_written,
+        'files': [f"{table}/{spec['file']}"],
+        'bytes': file_path.stat().st_size,
+        'elapsed_sec': round(elapsed, 3),
+    }
+    if injector:
+        entry['defects'] = dict(injector.counts)
+        entry['ground_truth'] = f"{GROUND_TRUTH_DIR}/{truth_file.name}"
+    return entry
+
+
+def _generate_table_task(args):
+    """Process pool entry point"""
+    table, counts, output_dir, seed, distributions, defect_rules = args
+    return generate_table(table, counts, output_dir, seed, distributions, show_progress=False,
+                          defect_rules=defect_rules)
+
+
+def run_generation(counts, output_dir=BASE_DIR, seed=SEED, workers=1, tables=None,
+                   distributions=None, profile=None, defects=DEFAULT_DEFECT_PROFILE):
+    """
+    Generate the requested tables and write a manifest to output_dir.
+
+    Args:
+        counts: Row count per table (see resolve_row_counts)
+        output_dir: Root directory; one sub-directory per table
+        seed: Base random seed
+        workers: Number of worker processes (1 = run in-process with progress bars)
+        tables: Subset of TABLES to generate (default: all)
+        distributions: FK distribution overrides (default: FK_DISTRIBUTIONS)
+        profile: Profile name, recorded in the manifest
+        defects: DEFECT_PROFILES name or {table: [rules]} for DefectInjector
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    tables = tables or TABLES
+    distributions = FK_DISTRIBUTIONS if distributions is None else {**FK_DISTRIBUTIONS, **distributions}
+    defect_rules = resolve_defect_rules(defects)
+
+    start = time.time()
+    results = {}
+
+    if workers <= 1:
+        for idx, table in enumerate(tables, 1):
+            print(f"\n{idx}/{len(tables)} Generating {table.upper()}_BRZ...")
+            results[table] = generate_table(table, counts, output_dir, seed, distributions,
+                                            defect_rules=defect_rules)
+    else:
+        # Largest tables first so the pool isn't left waiting on one long straggler
+        ordered = sorted(tables, key=lambda t: counts[t], reverse=True)
+        tasks = [(table, counts, str(output_dir), seed, distributions, defect_rules) for table in ordered]
+        with mp.Pool(processes=min(workers, len(tasks))) as pool:
+            for entry in pool.imap_unordered(_generate_table_task, tasks):
+                results[entry['table']] = entry
+                print(f"   ✓ {entry['table']:<18} {entry['rows']:>12,} rows in {entry['elapsed_sec']:.1f}s")
+
+    manifest = {
+        'generated_at': datetime.now().isoformat(),
+        'profile': profile,
+        'seed': seed,
+        'workers': workers,
+        'output_dir': str(output_dir),
+        'row_counts': counts,
+        'fk_distributions': distributions,
+        'defects': defects if isinstance(defects, str) else 'custom',
+        'defect_rules': defect_rules,
+        'elapsed_sec': round(time.time() - start, 3),
+        'tables': {table: results[table] for table in tables},
+    }
+    write_manifest(output_dir, manifest)
+    return manifest
+
+
+def write_manifest(output_dir, manifest, filename=MANIFEST_FILE):
+    """Write the run manifest atomically next to the generated tables"""
+    manifest_path = Path(output_dir) / filename
+    tmp_path = manifest_path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+    return manifest_path
+
+
+def load_manifest(output_dir, filename=MANIFEST_FILE):
+    """Read the manifest written by a previous run"""
+    with open(Path(output_dir) / filename, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate DataVelocity food delivery CSV datasets")
+    parser.add_argument('--profile', choices=list(SCALE_PROFILES),
+                        help=f"Scale profile (default: {DEFAULT_PROFILE})")
+    parser.add_argument('--rows', action='append', metavar='TABLE=N',
+                        help="Override a table's row count, e.g. --rows order=1_000_000 (repeatable)")
+    parser.add_argument('--tables', nargs='+', choices=TABLES, help="Only generate these tables")
+    parser.add_argument('--config', help="JSON config file (command line flags take precedence)")
+    parser.add_argument('--output-dir', help=f"Output directory (default: {BASE_DIR})")
+    parser.add_argument('--seed', type=int, help=f"Random seed (default: {SEED})")
+    parser.add_argument('--workers', type=int, help="Worker processes, one table per worker (default: 1)")
+    parser.add_argument('--defects', choices=list(DEFECT_PROFILES),
+                        help=f"Data quality defect profile (default: {DEFAULT_DEFECT_PROFILE})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = load_config_file(args.config) if args.config else {}
+
+    profile = args.profile or config.get('profile', DEFAULT_PROFILE)
+    overrides = {**config.get('rows', {}), **parse_row_overrides(args.rows)}
+    counts = resolve_row_counts(profile, overrides)
+    output_dir = Path(args.output_dir or config.get('output_dir', BASE_DIR))
+    seed = args.seed if args.seed is not None else config.get('seed', SEED)
+    workers = args.workers or config.get('workers', 1)
+    tables = args.tables or config.get('tables')
+    distributions = config.get('fk_distributions')
+    defects = args.defects or config.get('defects', DEFAULT_DEFECT_PROFILE)
 
-    end_time = datetime.now()
-    duration = (end_time - start_time).total_seconds()
+    print("\n🚀 Starting Optimized Food Delivery Data Generation")
+    print(f"📊 Profile: {profile} | {counts['order']:,} orders | {counts['customer']:,} customers | "
+          f"{counts['restaurant']:,} restaurants")
+    effective = {**FK_DISTRIBUTIONS, **(distributions or {})}
+    skewed = {rel: spec for rel, spec in effective.items() if spec.get('type', 'uniform') != 'uniform'}
+    print(f"🎯 Skewed FK relationships: {', '.join(f'{rel}={spec}' for rel, spec in skewed.items()) or 'none'}")
+    print(f"🧪 Defects: {defects if isinstance(defects, str) else 'custom'}")
+    print(f"⚙️  Seed: {seed} | Workers: {workers} | Output: {output_dir}\n")
+
+    manifest = run_generation(counts, output_dir, seed, workers, tables, distributions, profile, defects)
 
-    print(f"\n✅ All CSV files generated successfully in {duration:.1f} seconds!")
+    print(f"\n✅ All CSV files generated successfully in {manifest['elapsed_sec']:.1f} seconds!")
     print(f"\n📈 Generated:")
-    print(f"   • {NUM_LOCATIONS:,} locations")
-    print(f"   • {NUM_RESTAURANTS:,} restaurants")
-    print(f"   • {NUM_CUSTOMERS:,} customers")
-    print(f"   • {NUM_CUSTOMER_ADDRESSES:,} customer addresses")
-    print(f"   • {NUM_MENU_ITEMS:,} menu items")
-    print(f"   • {NUM_DELIVERY_AGENTS:,} delivery agents")
-    print(f"   • {NUM_ORDERS:,} orders")
-    print(f"   • {NUM_ORDER_ITEMS:,} order items")
-    print(f"   • {NUM_DELIVERIES:,} deliveries")
-    print(f"\n💾 Files saved to: {BASE_DIR}")
\ No newline at end of file
+    for table, entry in manifest['tables'].items():
+        defect_total = sum(entry.get('defects', {}).values())
+        print(f"   • {entry['rows']:>12,} {table:<18} {entry['bytes'] / 1024 / 1024:>9.1f} MB "
+              f"in {entry['elapsed_sec']:.1f}s" + (f" | {defect_total:,} defects" if defect_total else ""))
+    print(f"\n💾 Files saved to: {output_dir}")
+    print(f"🧾 Manifest: {output_dir / MANIFEST_FILE}")
+
+
+# ===== MAIN EXECUTION =====
+if __name__ == '__main__':
+    main()
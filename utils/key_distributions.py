@@ -0,0 +1,108 @@
+import numpy as np
+
+# Supported distribution types for foreign-key sampling
+DISTRIBUTION_TYPES = ['uniform', 'zipf', 'head_tail']
+
+DEFAULT_BATCH_SIZE = 50_000
+
+
+class KeySampler:
+    """
+    Draws foreign keys in the range [1, num_keys] from a configurable distribution.
+
+    Keys are sampled in vectorized batches with numpy and handed out one at a
+    time through next(), so row-by-row generators keep their simple shape while
+    the expensive part (the random draw) runs once per batch.
+
+    Supported specs:
+        {'type': 'uniform'}
+        {'type': 'zipf', 'exponent': 1.1}
+        {'type': 'head_tail', 'head_fraction': 0.01, 'head_weight': 0.5}
+
+    'zipf' uses a bounded Zipf law (weight of rank r is 1 / r^exponent) over the
+    key range. 'head_tail' sends head_weight of the traffic to the hottest
+    head_fraction of keys and spreads the rest uniformly over the tail. With
+    'shuffle' (default True) hot ranks are mapped onto random key IDs instead of
+    always being the lowest IDs.
+    """
+
+    def __init__(self, num_keys: int, spec: dict = None, seed: int = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        if num_keys < 1:
+            raise ValueError(f"num_keys must be >= 1, got {num_keys}")
+
+        self.num_keys = num_keys
+        self.spec = dict(spec or {'type': 'uniform'})
+        self.kind = self.spec.get('type', 'uniform')
+        self.batch_size = batch_size
+        self.rng = np.random.default_rng(seed)
+
+        if self.kind not in DISTRIBUTION_TYPES:
+            raise ValueError(f"Unknown distribution type '{self.kind}', expected one of {DISTRIBUTION_TYPES}")
+
+        self._cdf = None
+        self._head_size = 0
+        self._permutation = None
+
+        if self.kind == 'zipf':
+            exponent = float(self.spec.get('exponent', 1.1))
+            if exponent <= 0:
+                raise ValueError(f"Zipf exponent must be > 0, got {exponent}")
+            weights = np.arange(1, num_keys + 1, dtype=np.float64) ** -exponent
+            self._cdf = np.cumsum(weights)
+            self._cdf /= self._cdf[-1]
+
+        elif self.kind == 'head_tail':
+            head_fraction = float(self.spec.get('head_fraction', 0.01))
+            self.head_weight = float(self.spec.get('head_weight', 0.5))
+            if not 0 < head_fraction <= 1:
+                raise ValueError(f"head_fraction must be in (0, 1], got {head_fraction}")
+            if not 0 <= self.head_weight <= 1:
+                raise ValueError(f"head_weight must be in [0, 1], got {self.head_weight}")
+            self._head_size = max(1, int(num_keys * head_fraction))
+
+        if self.kind != 'uniform' and self.spec.get('shuffle', True):
+            self._permutation = self.rng.permutation(num_keys) + 1
+
+        self._buffer = np.empty(0, dtype=np.int64)
+        self._pos = 0
+
+    def sample(self, size: int) -> np.ndarray:
+        """Return an array of `size` keys drawn from the distribution."""
+        if self.kind == 'uniform':
+            return self.rng.integers(1, self.num_keys + 1, size=size)
+
+        if self.kind == 'zipf':
+            ranks = np.searchsorted(self._cdf, self.rng.random(size), side='right')
+            # Guard against floating point rounding at the top of the CDF
+            np.minimum(ranks, self.num_keys - 1, out=ranks)
+        else:
+            tail_size = self.num_keys - self._head_size
+            in_head = (self.rng.random(size) < self.head_weight) | (tail_size == 0)
+            ranks = np.where(
+                in_head,
+                self.rng.integers(0, self._head_size, size=size),
+                self._head_size + self.rng.integers(0, max(tail_size, 1), size=size)
+            )
+
+        if self._permutation is not None:
+            return self._permutation[ranks]
+        return ranks + 1
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> int:
+        if self._pos >= len(self._buffer):
+            self._buffer = self.sample(self.batch_size)
+            self._pos = 0
+        key = self._buffer[self._pos]
+        self._pos += 1
+        return int(key)
+
+    def top_share(self, top_fraction: float = 0.01, sample_size: int = 1_000_000) -> float:
+        """Estimate the share of draws that land on the hottest `top_fraction` of keys."""
+        draws = self.sample(sample_size)
+        counts = np.bincount(draws, minlength=self.num_keys + 1)[1:]
+        top_n = max(1, int(self.num_keys * top_fraction))
+        return float(np.sort(counts)[::-1][:top_n].sum() / sample_size)
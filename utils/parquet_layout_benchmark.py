@@ -0,0 +1,196 @@
+"""
+Flat vs Hive-partitioned Parquet layout benchmark for a one-month incremental load.
+
+Converts the fact tables once per layout and then measures what a one-month
+incremental load has to touch in each:
+
+    flat         every file of the table is staged/scanned; the date filter
+                 can only skip row groups via footer statistics
+    partitioned  only year=YYYY/month=M/ files are staged/scanned
+
+Usage:
+    python -m utils.parquet_layout_benchmark --input-dir data --month 2025-06
+"""
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from utils.csv_to_parquet import (
+    BASE_DIR, DEFAULT_ROW_GROUP_SIZE, PARTITION_COLUMNS, PARTITION_FIELDS,
+    csv_to_parquet_arrow, csv_to_parquet_partitioned, schema_for_table,
+)
+from utils.generate_food_delivery_data import TABLE_SPECS
+
+BENCHMARK_DIR = BASE_DIR.parent / "data_parquet_benchmark"
+REPORT_FILE = "layout_benchmark.json"
+
+
+def month_bounds(month):
+    """'2025-06' -> (date(2025, 6, 1), date(2025, 7, 1))"""
+    start = datetime.strptime(month, '%Y-%m').date()
+    end = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start, end
+
+
+def last_full_month(dataset, column):
+    """The last calendar month that ends before the latest value of column"""
+    latest = pc.max(dataset.to_table(columns=[column]).column(column)).as_py()
+    if isinstance(latest, datetime):
+        latest = latest.date()
+    previous = latest.replace(day=1) - timedelta(days=1)
+    return previous.strftime('%Y-%m')
+
+
+def _bound(value, arrow_type):
+    """Filter bound matching the column type (date32 vs timestamp with tz)"""
+    if pa.types.is_timestamp(arrow_type):
+        return pa.scalar(datetime(value.year, value.month, value.day), type=pa.timestamp('s')).cast(arrow_type)
+    return pa.scalar(value, type=arrow_type)
+
+
+def row_groups_matching(path, column, start, end):
+    """Row groups of a Parquet file whose min/max on column overlaps [start, end)"""
+    metadata = pq.ParquetFile(path).metadata
+    index = metadata.schema.to_arrow_schema().get_field_index(column)
+    matching = 0
+    for rg in range(metadata.num_row_groups):
+        stats = metadata.row_group(rg).column(index).statistics
+        if stats is None or not stats.has_min_max:
+            matching += 1
+            continue
+        low, high = stats.min, stats.max
+        if isinstance(low, datetime):
+            low, high = low.date(), high.date()
+        if low < end and high >= start:
+            matching += 1
+    return matching, metadata.num_row_groups
+
+
+def build_layouts(input_dir, output_dir, table, row_group_size):
+    """Convert one table's CSV to both layouts; returns (flat_dir, partitioned_dir)"""
+    csv_path = Path(input_dir) / table / TABLE_SPECS[table]['file']
+    schema = schema_for_table(table)
+    flat_dir = Path(output_dir) / 'flat' / table
+    partitioned_dir = Path(output_dir) / 'partitioned' / table
+    for directory in (flat_dir, partitioned_dir):
+        directory.mkdir(parents=True, exist_ok=True)
+        for stale in directory.rglob('*.parquet'):
+            stale.unlink()
+
+    csv_to_parquet_arrow(csv_path, flat_dir / f"{csv_path.stem}.parquet", schema, row_group_size=row_group_size)
+    csv_to_parquet_partitioned(csv_path, partitioned_dir, schema, PARTITION_COLUMNS[table],
+                               row_group_size=row_group_size)
+    return flat_dir, partitioned_dir
+
+
+def measure_layout(dataset, expression, column, start, end, repeats):
+    """Files/bytes an incremental load has to touch and the median scan time"""
+    fragments = list(dataset.get_fragments(filter=expression))
+    files = [fragment.path for fragment in fragments]
+    row_groups = [row_groups_matching(path, column, start, end) for path in files]
+
+    timings = []
+    rows = 0
+    for _ in range(repeats):
+        started = time.perf_counter()
+        rows = dataset.to_table(filter=expression).num_rows
+        timings.append(time.perf_counter() - started)
+
+    return {
+        'files_total': len(dataset.files),
+        'files_selected': len(files),
+        'bytes_selected': sum(Path(path).stat().st_size for path in files),
+        'row_groups_selected': sum(total for _, total in row_groups),
+        'row_groups_matching': sum(matching for matching, _ in row_groups),
+        'rows': rows,
+        'scan_sec_median': round(statistics.median(timings), 4),
+    }
+
+
+def benchmark_table(input_dir, output_dir, table, month=None, row_group_size=DEFAULT_ROW_GROUP_SIZE, repeats=5):
+    """
+    Benchmark a one-month incremental load of table in both layouts.
+
+    Returns:
+        {'table', 'month', 'flat': {...}, 'partitioned': {...}}
+    """
+    column = PARTITION_COLUMNS[table]
+    flat_dir, partitioned_dir = build_layouts(input_dir, output_dir, table, row_group_size)
+
+    flat = ds.dataset(flat_dir, format='parquet')
+    partitioned = ds.dataset(partitioned_dir, format='parquet',
+                             partitioning=ds.partitioning(PARTITION_FIELDS, flavor='hive'))
+
+    month = month or last_full_month(flat, column)
+    start, end = month_bounds(month)
+    arrow_type = flat.schema.field(column).type
+    date_filter = (ds.field(column) >= _bound(start, arrow_type)) & (ds.field(column) < _bound(end, arrow_type))
+    partition_filter = (ds.field('year') == start.year) & (ds.field('month') == start.month)
+
+    return {
+        'table': table,
+        'month': month,
+        'flat': measure_layout(flat, date_filter, column, start, end, repeats),
+        # Keep the date filter as well: DELIVERY_DATE is partitioned by UTC day, so the bound is exact
+        'partitioned': measure_layout(partitioned, partition_filter & date_filter, column, start, end, repeats),
+    }
+
+
+def print_results(results):
+    print("\n" + "=" * 104)
+    print("📊 ONE-MONTH INCREMENTAL LOAD: FLAT vs PARTITIONED")
+    print("=" * 104)
+    print(f"{'Table':<12} {'Month':<8} {'Layout':<12} {'Files':>12} {'MB to load':>11} "
+          f"{'Row groups':>14} {'Rows':>10} {'Scan ms':>9}")
+    print("-" * 104)
+    for result in results:
+        for layout in ('flat', 'partitioned'):
+            m = result[layout]
+            print(f"{result['table']:<12} {result['month']:<8} {layout:<12} "
+                  f"{m['files_selected']:>5}/{m['files_total']:<6} {m['bytes_selected'] / 1024 / 1024:>11.2f} "
+                  f"{m['row_groups_matching']:>6}/{m['row_groups_selected']:<7} {m['rows']:>10,} "
+                  f"{m['scan_sec_median'] * 1000:>9.1f}")
+        flat_bytes = result['flat']['bytes_selected']
+        part_bytes = result['partitioned']['bytes_selected']
+        if part_bytes:
+            print(f"{'':<12} {'':<8} → {flat_bytes / part_bytes:.1f}x fewer bytes to stage with partitions")
+    print("=" * 104)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark flat vs partitioned Parquet for a one-month load")
+    parser.add_argument('--input-dir', default=str(BASE_DIR), help=f"CSV root (default: {BASE_DIR})")
+    parser.add_argument('--output-dir', default=str(BENCHMARK_DIR),
+                        help=f"Scratch root for both layouts (default: {BENCHMARK_DIR})")
+    parser.add_argument('--tables', nargs='+', choices=list(PARTITION_COLUMNS), default=list(PARTITION_COLUMNS))
+    parser.add_argument('--month', help="Month to load as YYYY-MM (default: last full month in the data)")
+    parser.add_argument('--row-group-size', type=int, default=DEFAULT_ROW_GROUP_SIZE)
+    parser.add_argument('--repeats', type=int, default=5, help="Scans per layout; the median is reported")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = []
+    for table in args.tables:
+        print(f"⏳ Benchmarking {table}...")
+        results.append(benchmark_table(args.input_dir, args.output_dir, table, args.month,
+                                       args.row_group_size, args.repeats))
+    print_results(results)
+
+    report_path = Path(args.output_dir) / REPORT_FILE
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump({'generated_at': datetime.now().isoformat(), 'results': results}, f, indent=2)
+    print(f"📝 Report saved to {report_path}")
+
+
+if __name__ == "__main__":
+    main()
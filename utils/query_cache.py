@@ -0,0 +1,256 @@
+"""
+Result cache for repeated read queries (metadata lookups, context queries).
+
+Results are kept as Arrow tables, keyed by normalized SQL plus parameters
+plus the session context they ran in (account, user, role, database,
+schema), so connections with different settings never share results:
+
+    memory  LRU bounded by max_bytes (Arrow nbytes)
+    disk    optional write-through tier of Arrow IPC files under disk_dir,
+            bounded by max_disk_bytes. It survives restarts (the directory
+            is indexed when the cache is created) but is not live-shared:
+            entries and invalidations another process writes after that
+            aren't seen, so concurrent processes should use their own
+            directories or short TTLs
+
+Entries expire after their TTL and can be dropped by table name: each
+entry remembers the tables its query reads (FROM / JOIN), and
+invalidate_statement() maps a DML statement to the table it writes.
+
+Used by SnowflakeConnection when constructed with cache=QueryCache(...):
+
+    sf = SnowflakeConnection(cache=QueryCache(max_bytes=64 * 1024 * 1024))
+    sf.execute_query("SELECT * FROM COMMON.TARGET_TABLE_MAPPING", cache_ttl=300)
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import pyarrow as pa
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_DISK_BYTES = 1024 * 1024 * 1024
+METADATA_KEY = b'datavelocity.query_cache'
+
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_IDENTIFIER = r'((?:"[^"]+"|[\w$]+)(?:\.(?:"[^"]+"|[\w$]+)){0,2})'
+_READ_TABLES = re.compile(r"\b(?:FROM|JOIN)\s+" + _IDENTIFIER, re.IGNORECASE)
+_WRITE_TABLE = re.compile(
+    r"^\s*(?:INSERT\s+(?:OVERWRITE\s+)?INTO|UPDATE|DELETE\s+FROM|MERGE\s+INTO|TRUNCATE\s+(?:TABLE\s+)?(?:IF\s+EXISTS\s+)?"
+    r"|COPY\s+INTO|(?:CREATE\s+OR\s+REPLACE|DROP)\s+TABLE(?:\s+IF\s+EXISTS)?)\s+" + _IDENTIFIER,
+    re.IGNORECASE,
+)
+
+
+def normalize_sql(query):
+    """Strip comments, collapse whitespace outside string literals and drop a trailing ';'"""
+    query = _COMMENTS.sub(' ', query)
+    parts = []
+    last = 0
+    for match in _STRINGS.finditer(query):
+        parts.append(re.sub(r'\s+', ' ', query[last:match.start()]))
+        parts.append(match.group(0))
+        last = match.end()
+    parts.append(re.sub(r'\s+', ' ', query[last:]))
+    return ''.join(parts).strip().rstrip(';').strip()
+
+
+def table_key(name):
+    """Unqualified, unquoted, upper-case table name ('common."Dq_Config"' -> 'DQ_CONFIG')"""
+    last = name.split('.')[-1]
+    return last[1:-1] if last.startswith('"') else last.upper()
+
+
+def tables_read(query):
+    """Tables a query reads, as table_key() names"""
+    stripped = _STRINGS.sub("''", _COMMENTS.sub(' ', query))
+    return sorted({table_key(match.group(1)) for match in _READ_TABLES.finditer(stripped)
+                   if match.group(1).upper() != 'TABLE'})
+
+
+def table_written(statement):
+    """Table a DML/DDL statement writes, or None"""
+    match = _WRITE_TABLE.match(_COMMENTS.sub(' ', statement))
+    return table_key(match.group(1)) if match else None
+
+
+def cache_key(query, params=None, context=None):
+    """Key for a query's result; context is the session it runs in (see SnowflakeConnection.cache_context)"""
+    payload = json.dumps([normalize_sql(query), params, context], default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class QueryCache:
+    """Thread-safe TTL + byte-bounded LRU cache of Arrow results, with an optional disk tier."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, default_ttl=None, disk_dir=None,
+                 max_disk_bytes=DEFAULT_MAX_DISK_BYTES):
+        """
+        Args:
+            max_bytes: Memory budget for cached tables
+            default_ttl: TTL in seconds when a call doesn't pass one (None = only cache when asked)
+            disk_dir: Directory for the Arrow file tier (None = memory only)
+            max_disk_bytes: Budget for the disk tier
+        """
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.max_disk_bytes = max_disk_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+
+        self._lock = threading.RLock()
+        self._memory = OrderedDict()  # key -> (table, expires_at, tables)
+        self._memory_bytes = 0
+        self._disk = {}  # key -> (path, expires_at, tables, size)
+        self.stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+        if self.disk_dir:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            self._load_disk_index()
+
+    def ttl_for(self, ttl):
+        """TTL to use for a call, or None when the call shouldn't be cached"""
+        ttl = self.default_ttl if ttl is None else ttl
+        return ttl if ttl and ttl > 0 else None
+
+    # ----- lookup / store -----
+    def get(self, key):
+        """Cached table for key, or None"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                table, expires_at, _ = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.stats['hits'] += 1
+                    return table
+                self._drop_memory(key)
+
+            disk_entry = self._disk.get(key)
+            if disk_entry is not None:
+                path, expires_at, tables, _ = disk_entry
+                if expires_at > now:
+                    try:
+                        with pa.memory_map(str(path)) as source:
+                            table = pa.ipc.open_file(source).read_all()
+                    except (OSError, pa.ArrowInvalid):
+                        self._drop_disk(key)
+                    else:
+                        self.stats['disk_hits'] += 1
+                        self._put_memory(key, table, expires_at, tables)
+                        return table
+                else:
+                    self._drop_disk(key)
+
+            self.stats['misses'] += 1
+            return None
+
+    def put(self, key, table, ttl, query):
+        """Cache table for ttl seconds; query is used to record which tables it depends on"""
+        expires_at = time.time() + ttl
+        tables = tables_read(query)
+        with self._lock:
+            self._put_memory(key, table, expires_at, tables)
+            if self.disk_dir:
+                self._put_disk(key, table, expires_at, tables)
+
+    def _put_memory(self, key, table, expires_at, tables):
+        if key in self._memory:
+            self._drop_memory(key)
+        if table.nbytes > self.max_bytes:
+            return
+        self._memory[key] = (table, expires_at, tables)
+        self._memory_bytes += table.nbytes
+        while self._memory_bytes > self.max_bytes:
+            oldest = next(iter(self._memory))
+            self._drop_memory(oldest)
+            self.stats['evictions'] += 1
+
+    def _put_disk(self, key, table, expires_at, tables):
+        metadata = dict(table.schema.metadata or {})
+        metadata[METADATA_KEY] = json.dumps({'expires_at': expires_at, 'tables': tables}).encode('utf-8')
+        table = table.replace_schema_metadata(metadata)
+
+        path = self.disk_dir / f"{key}.arrow"
+        tmp_path = path.with_suffix('.arrow.tmp')
+        with pa.OSFile(str(tmp_path), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+
+        size = path.stat().st_size
+        if size > self.max_disk_bytes:
+            path.unlink(missing_ok=True)
+            return
+        self._disk[key] = (path, expires_at, tables, size)
+        self._trim_disk()
+
+    def _trim_disk(self):
+        total = sum(entry[3] for entry in self._disk.values())
+        # Evict soonest-to-expire first
+        for key in sorted(self._disk, key=lambda k: self._disk[k][1]):
+            if total <= self.max_disk_bytes:
+                break
+            total -= self._disk[key][3]
+            self._drop_disk(key)
+            self.stats['evictions'] += 1
+
+    def _load_disk_index(self):
+        now = time.time()
+        for path in self.disk_dir.glob('*.arrow'):
+            try:
+                with pa.memory_map(str(path)) as source:
+                    schema = pa.ipc.open_file(source).schema
+                info = json.loads(schema.metadata[METADATA_KEY])
+            except (OSError, KeyError, TypeError, ValueError, pa.ArrowInvalid):
+                path.unlink(missing_ok=True)
+                continue
+            if info['expires_at'] <= now:
+                path.unlink(missing_ok=True)
+                continue
+            self._disk[path.stem] = (path, info['expires_at'], info['tables'], path.stat().st_size)
+        self._trim_disk()
+
+    def _drop_memory(self, key):
+        table, _, _ = self._memory.pop(key)
+        self._memory_bytes -= table.nbytes
+
+    def _drop_disk(self, key):
+        path = self._disk.pop(key)[0]
+        path.unlink(missing_ok=True)
+
+    # ----- invalidation -----
+    def invalidate(self, table=None):
+        """Drop entries that read table (any schema); no table clears everything. Returns entries dropped."""
+        target = table_key(table) if table else None
+        with self._lock:
+            memory_keys = [key for key, (_, _, tables) in self._memory.items() if target is None or target in tables]
+            disk_keys = [key for key, (_, _, tables, _) in self._disk.items() if target is None or target in tables]
+            for key in memory_keys:
+                self._drop_memory(key)
+            for key in disk_keys:
+                self._drop_disk(key)
+            dropped = len(set(memory_keys) | set(disk_keys))
+            self.stats['invalidations'] += dropped
+            return dropped
+
+    def invalidate_statement(self, statement):
+        """Invalidate whatever a write statement touches; returns entries dropped"""
+        table = table_written(statement)
+        return self.invalidate(table) if table else 0
+
+    def status(self):
+        with self._lock:
+            return {
+                'memory_entries': len(self._memory),
+                'memory_bytes': self._memory_bytes,
+                'disk_entries': len(self._disk),
+                'disk_bytes': sum(entry[3] for entry in self._disk.values()),
+                **self.stats,
+            }
@@ -0,0 +1,267 @@
+"""
+Client-side query profiling for SnowflakeConnection.
+
+Every statement executed through SnowflakeConnection.get_cursor() (and so
+through execute_query, fetch_arrow, execute_update, ...) produces one event
+dict, passed to each registered hook:
+
+    ts            ISO timestamp of the execute call
+    fingerprint   16-char id of the statement with literals replaced by ?
+    sql           the statement (truncated to 500 characters)
+    operation     execute / executemany / execute_async / cache
+    query_id      Snowflake query id (sfqid), when there is one
+    execute_sec   time spent in execute()
+    elapsed_sec   execute plus fetching, until the next execute or close
+    rows          rows fetched, or cursor.rowcount when nothing was fetched
+    bytes         size of Arrow/pandas results fetched (None for tuples)
+    error         "ExceptionType: message", or None
+
+Hooks are plain callables taking the event. Built-in sinks:
+
+    QueryStats      in-memory aggregate per fingerprint, top-N report
+    JsonlTraceSink  appends events to a JSONL file
+    LoggerSink      logs events through utils.logger.setup_logger
+
+    stats = QueryStats()
+    sf = SnowflakeConnection(hooks=[stats, JsonlTraceSink('logs/query_trace.jsonl')])
+    ...
+    stats.print_report()
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from utils.query_cache import normalize_sql
+
+SQL_PREVIEW_CHARS = 500
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.$])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+def fingerprint_sql(query):
+    """Statement shape with literals and parameter lists replaced by ?, upper-cased"""
+    text = normalize_sql(query)
+    text = _STRING_LITERAL.sub('?', text)
+    text = _NUMBER_LITERAL.sub('?', text)
+    text = text.replace('%s', '?')
+    text = _VALUE_LIST.sub('(?, ...)', text)
+    return text.upper()
+
+
+def fingerprint(query):
+    """Short stable id for fingerprint_sql(query)"""
+    return hashlib.sha1(fingerprint_sql(query).encode('utf-8')).hexdigest()[:16]
+
+
+def new_event(query, operation):
+    return {
+        'ts': datetime.now().isoformat(timespec='milliseconds'),
+        'fingerprint': fingerprint(query),
+        'sql': query.strip()[:SQL_PREVIEW_CHARS],
+        'operation': operation,
+        'query_id': None,
+        'execute_sec': None,
+        'elapsed_sec': None,
+        'rows': None,
+        'bytes': None,
+        'error': None,
+    }
+
+
+def _result_bytes(result):
+    if hasattr(result, 'nbytes'):
+        return result.nbytes
+    if hasattr(result, 'memory_usage'):
+        return int(result.memory_usage(deep=True).sum())
+    return None
+
+
+class ObservedCursor:
+    """
+    Cursor proxy that times execute/fetch calls and hands an event to emit()
+    once the statement's results are done with (next execute or close).
+    """
+
+    def __init__(self, cursor, emit):
+        self._cursor = cursor
+        self._emit = emit
+        self._event = None
+        self._started = None
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def _run(self, operation, method, query, *args, **kwargs):
+        self._finish()
+        event = new_event(query, operation)
+        started = time.perf_counter()
+        try:
+            method(query, *args, **kwargs)
+        except Exception as e:
+            event['execute_sec'] = event['elapsed_sec'] = round(time.perf_counter() - started, 6)
+            event['query_id'] = getattr(self._cursor, 'sfqid', None)
+            event['error'] = f"{type(e).__name__}: {e}"
+            self._emit(event)
+            raise
+        event['execute_sec'] = round(time.perf_counter() - started, 6)
+        event['query_id'] = getattr(self._cursor, 'sfqid', None)
+        self._event, self._started = event, started
+        return self
+
+    def execute(self, query, *args, **kwargs):
+        return self._run('execute', self._cursor.execute, query, *args, **kwargs)
+
+    def executemany(self, query, *args, **kwargs):
+        return self._run('executemany', self._cursor.executemany, query, *args, **kwargs)
+
+    def execute_async(self, query, *args, **kwargs):
+        return self._run('execute_async', self._cursor.execute_async, query, *args, **kwargs)
+
+    def _fetched(self, result, rows):
+        if self._event is not None:
+            self._event['rows'] = (self._event['rows'] or 0) + rows
+            size = _result_bytes(result)
+            if size is not None:
+                self._event['bytes'] = (self._event['bytes'] or 0) + size
+        return result
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        return self._fetched(row, 0 if row is None else 1)
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        return self._fetched(rows, len(rows))
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        return self._fetched(rows, len(rows))
+
+    def fetch_arrow_all(self, *args, **kwargs):
+        table = self._cursor.fetch_arrow_all(*args, **kwargs)
+        return self._fetched(table, table.num_rows if table is not None else 0)
+
+    def fetch_pandas_all(self, *args, **kwargs):
+        frame = self._cursor.fetch_pandas_all(*args, **kwargs)
+        return self._fetched(frame, len(frame))
+
+    def fetch_arrow_batches(self, *args, **kwargs):
+        for batch in self._cursor.fetch_arrow_batches(*args, **kwargs):
+            yield self._fetched(batch, batch.num_rows)
+
+    def fetch_pandas_batches(self, *args, **kwargs):
+        for frame in self._cursor.fetch_pandas_batches(*args, **kwargs):
+            yield self._fetched(frame, len(frame))
+
+    def _finish(self):
+        event, self._event = self._event, None
+        if event is None:
+            return
+        event['elapsed_sec'] = round(time.perf_counter() - self._started, 6)
+        if event['rows'] is None:
+            rowcount = getattr(self._cursor, 'rowcount', None)
+            event['rows'] = rowcount if rowcount is not None and rowcount >= 0 else None
+        self._emit(event)
+
+    def close(self):
+        self._finish()
+        return self._cursor.close()
+
+
+# ===== SINKS =====
+class QueryStats:
+    """In-memory aggregate per fingerprint: calls, total/max time, rows, bytes, errors"""
+
+    def __init__(self, top_n=10):
+        self.top_n = top_n
+        self._lock = threading.Lock()
+        self.fingerprints = {}
+
+    def __call__(self, event):
+        with self._lock:
+            entry = self.fingerprints.setdefault(event['fingerprint'], {
+                'fingerprint': event['fingerprint'],
+                'sql': event['sql'],
+                'calls': 0,
+                'total_sec': 0.0,
+                'max_sec': 0.0,
+                'rows': 0,
+                'bytes': 0,
+                'errors': 0,
+            })
+            elapsed = event['elapsed_sec'] or 0.0
+            entry['calls'] += 1
+            entry['total_sec'] += elapsed
+            entry['max_sec'] = max(entry['max_sec'], elapsed)
+            entry['rows'] += event['rows'] or 0
+            entry['bytes'] += event['bytes'] or 0
+            entry['errors'] += 1 if event['error'] else 0
+
+    def top(self, n=None, by='total_sec'):
+        """The n heaviest fingerprints by total_sec, max_sec, calls, rows or bytes"""
+        with self._lock:
+            entries = [dict(entry) for entry in self.fingerprints.values()]
+        for entry in entries:
+            entry['avg_sec'] = entry['total_sec'] / entry['calls']
+        return sorted(entries, key=lambda entry: entry[by], reverse=True)[:n or self.top_n]
+
+    def print_report(self, n=None, by='total_sec'):
+        top = self.top(n, by)
+        print("\n" + "=" * 110)
+        print(f"🐢 TOP {len(top)} QUERY FINGERPRINTS BY {by.upper()}")
+        print("=" * 110)
+        print(f"{'Fingerprint':<17} {'Calls':>6} {'Total s':>9} {'Avg s':>8} {'Max s':>8} {'Rows':>11} "
+              f"{'Errors':>6}  SQL")
+        print("-" * 110)
+        for entry in top:
+            sql = ' '.join(entry['sql'].split())[:40]
+            print(f"{entry['fingerprint']:<17} {entry['calls']:>6} {entry['total_sec']:>9.3f} "
+                  f"{entry['avg_sec']:>8.3f} {entry['max_sec']:>8.3f} {entry['rows']:>11,} "
+                  f"{entry['errors']:>6}  {sql}")
+        print("=" * 110)
+
+
+class JsonlTraceSink:
+    """Appends each event as one JSON line"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        line = json.dumps(event, default=str)
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+
+class LoggerSink:
+    """Logs events: INFO normally, WARNING for errors and statements slower than slow_sec"""
+
+    def __init__(self, logger=None, slow_sec=5.0):
+        if logger is None:
+            from utils.logger import setup_logger
+            logger = setup_logger('snowflake_queries')
+        self.logger = logger
+        self.slow_sec = slow_sec
+
+    def __call__(self, event):
+        sql = ' '.join(event['sql'].split())[:120]
+        message = (f"[{event['fingerprint']}] {event['operation']} qid={event['query_id']} "
+                   f"elapsed={event['elapsed_sec']}s rows={event['rows']} bytes={event['bytes']} | {sql}")
+        if event['error']:
+            self.logger.warning(f"{message} | ERROR {' '.join(event['error'].split())}")
+        elif (event['elapsed_sec'] or 0) >= self.slow_sec:
+            self.logger.warning(f"SLOW {message}")
+        else:
+            self.logger.info(message)
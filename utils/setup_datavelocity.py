@@ -1,27 +1,224 @@
+import argparse
+import hashlib
+import json
 import os
+import re
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
-from utils.snowflake_connector import SnowflakeConnection
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from utils.snowflake_connector import (SnowflakePool, backoff_delay, create_connection,
+                                       is_session_expired, is_transient_error)
+from utils.sql_splitter import SqlStatement, split_sql
 from utils.logger import setup_logger
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_WORKERS = 4
+DEFAULT_STATEMENT_RETRIES = 2
+# Execution logs, statement profiles and the ledger all live under the repo's logs/, whatever the cwd
+LOG_DIR = Path(BASE_DIR).parent / "logs"
+DEPLOYMENT_LEDGER_FILE = LOG_DIR / "deployment_ledger.json"
+SLOWEST_STATEMENTS = 10
+
+# Server-side stats for the deploy's statements, looked up by query id afterwards
+QUERY_HISTORY_SQL = """
+    SELECT QUERY_ID, QUERY_TYPE, BYTES_SCANNED, ROWS_PRODUCED,
+           COMPILATION_TIME, EXECUTION_TIME, TOTAL_ELAPSED_TIME
+    FROM TABLE(INFORMATION_SCHEMA.QUERY_HISTORY(
+        END_TIME_RANGE_START => DATEADD('minute', -{minutes}, CURRENT_TIMESTAMP()),
+        RESULT_LIMIT => 10000))
+    WHERE QUERY_ID IN ({placeholders})
+"""
+QUERY_HISTORY_BATCH = 1000
+
+# One row per executed statement in the Parquet profile
+STATEMENT_PROFILE_SCHEMA = pa.schema([
+    ('script', pa.string()),
+    ('statement', pa.int32()),
+    ('line', pa.int32()),
+    ('started_at', pa.string()),
+    ('query_id', pa.string()),
+    ('query_type', pa.string()),
+    ('execution_time', pa.float64()),
+    ('attempts', pa.int32()),
+    ('rows', pa.int64()),
+    ('rows_produced', pa.int64()),
+    ('bytes_scanned', pa.int64()),
+    ('server_compilation_sec', pa.float64()),
+    ('server_execution_sec', pa.float64()),
+    ('server_elapsed_sec', pa.float64()),
+    ('sql', pa.string()),
+])
+
+# Objects a script creates / refers to, for dependency inference
+CREATED_OBJECT = re.compile(
+    r"\bCREATE\s+(?:OR\s+REPLACE\s+)?(?:SECURE\s+|TRANSIENT\s+|TEMPORARY\s+|DYNAMIC\s+|MATERIALIZED\s+|RECURSIVE\s+)*"
+    r"(?P<kind>TABLE|VIEW|SEQUENCE|PROCEDURE|FUNCTION|STREAM|TASK|STAGE|FILE\s+FORMAT|PIPE|SCHEMA|TAG|MASKING\s+POLICY)"
+    r"\s+(?:IF\s+NOT\s+EXISTS\s+)?(?P<name>[\w$.\"]+)",
+    re.IGNORECASE,
+)
+QUALIFIED_NAME = re.compile(r'(?<![\w$."])((?:"[^"]+"|[A-Za-z_][\w$]*)(?:\.(?:"[^"]+"|[A-Za-z_][\w$]*)){1,2})')
+SQL_COMMENT = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+
+
+def _name_parts(name: str) -> List[str]:
+    return [part.strip('"').upper() for part in name.split('.')]
+
+
+def script_objects(sql: str):
+    """
+    (created, referenced) object keys of a script: 'SCHEMA.NAME' for objects,
+    'SCHEMA:NAME' for schemas. Database prefixes are dropped; unqualified
+    names are ignored since they can't be told apart from columns.
+    """
+    sql = SQL_COMMENT.sub(' ', sql)
+    created = set()
+    for match in CREATED_OBJECT.finditer(sql):
+        parts = _name_parts(match.group('name'))
+        if match.group('kind').upper() == 'SCHEMA':
+            created.add(f"SCHEMA:{parts[-1]}")
+        elif len(parts) >= 2:
+            created.add('.'.join(parts[-2:]))
+
+    referenced = set()
+    for match in QUALIFIED_NAME.finditer(sql):
+        parts = _name_parts(match.group(1))
+        referenced.add('.'.join(parts[-2:]))
+        referenced.add(f"SCHEMA:{parts[-2]}")
+    return created, referenced - created
+
+
+def build_dependency_graph(script_definitions: List[Dict], base_dir: Optional[str] = None) -> Dict[int, set]:
+    """
+    {script index: indexes it must wait for}.
+
+    Uses each definition's 'depends_on' (list of script files) when given,
+    otherwise infers edges from object names: a script waits for the latest
+    earlier script that creates something it references. Inferred edges
+    only point backwards in the list, so the list order stays a valid
+    order; declared edges are checked for cycles.
+    """
+    index_of = {definition['file']: i for i, definition in enumerate(script_definitions)}
+    graph = {}
+    creators = {}  # object key -> latest earlier script index creating it
+
+    for i, definition in enumerate(script_definitions):
+        if 'depends_on' in definition:
+            missing = [dep for dep in definition['depends_on'] if dep not in index_of]
+            if missing:
+                raise ValueError(f"{definition['file']} depends on scripts not in this deploy: {missing}")
+            graph[i] = {index_of[dep] for dep in definition['depends_on']}
+            created = set()
+            path = script_path(definition['file'], base_dir)
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    created, _ = script_objects(f.read())
+        else:
+            path = script_path(definition['file'], base_dir)
+            created, referenced = set(), set()
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    created, referenced = script_objects(f.read())
+            graph[i] = {creators[key] for key in referenced if key in creators}
+        for key in created:
+            creators[key] = i
+
+    # Kahn's algorithm, only to reject cycles in declared dependencies
+    remaining = {i: set(deps) for i, deps in graph.items()}
+    while remaining:
+        ready = [i for i, deps in remaining.items() if not deps]
+        if not ready:
+            cycle = ', '.join(script_definitions[i]['file'] for i in sorted(remaining))
+            raise ValueError(f"Dependency cycle between: {cycle}")
+        for i in ready:
+            del remaining[i]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return graph
+
+
+def script_path(script_file: str, base_dir: Optional[str] = None) -> str:
+    """Absolute path of a script file given relative to the repo root (the parent of base_dir)"""
+    return os.path.abspath(os.path.join(base_dir or BASE_DIR, "..", script_file))
+
+
+def script_digest(script_file: str) -> Optional[str]:
+    """SHA-256 of a script's content, or None when the file is missing"""
+    path = script_path(script_file)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def load_deployment_ledger(path) -> Dict:
+    """{target: {script file: {sha256, status, deployed_at, execution_time}}}"""
+    if Path(path).exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def save_deployment_ledger(path, ledger: Dict):
+    """Write the ledger atomically (tmp file + rename) so an interrupted deploy can't corrupt it"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(ledger, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
 class SQLScriptExecutor:
     """Robust SQL script executor with logging, error handling, and rollback"""
 
-    def __init__(self):
-        self.sf = SnowflakeConnection()
+    def __init__(self, statement_retries: int = DEFAULT_STATEMENT_RETRIES,
+                 ledger_path=DEPLOYMENT_LEDGER_FILE, log_dir=LOG_DIR):
+        """
+        Args:
+            statement_retries: Times a statement failing with a transient (network,
+                throttling) error is re-run before its script fails
+            ledger_path: Deployment ledger file (None = no ledger, deploy everything)
+            log_dir: Directory for the execution log and statement profile
+        """
+        self.sf = create_connection()
+        self.statement_retries = statement_retries
+        self.ledger_path = ledger_path
+        self.log_dir = Path(log_dir)
         self.execution_log: List[Dict] = []
         self.failed_scripts: List[str] = []
+        self.target = None
+        self._print_lock = threading.Lock()
 
     def execute_scripts(self, script_definitions: List[Dict],
                         stop_on_error: bool = True,
-                        create_savepoint: bool = True):
+                        create_savepoint: bool = True,
+                        workers: int = DEFAULT_WORKERS,
+                        force: bool = False):
         """
         Execute multiple SQL scripts with robust error handling
 
+        Scripts run as a dependency graph (see build_dependency_graph): a script
+        starts once everything it depends on has succeeded, with up to `workers`
+        scripts running at once, each on its own pooled connection.
+
+        With a ledger, a script is skipped when its content hash matches its last
+        successful deploy to the same account/database and none of its
+        dependencies were redeployed in this run.
+
         Args:
-            script_definitions: List of dicts with 'file' and optional 'description'
-            stop_on_error: Whether to stop execution on first error
+            script_definitions: List of dicts with 'file' and optional 'description',
+                'optional' and 'depends_on' (list of script files)
+            stop_on_error: Whether to stop starting new scripts on the first error
             create_savepoint: Create savepoints before each script
+            workers: Scripts run concurrently (1 = one at a time, in dependency order)
+            force: Deploy every script even if the ledger says it is unchanged
         """
         self.sf.connect()
         start_time = datetime.now()
@@ -29,10 +226,11 @@ class SQLScriptExecutor:
         print("=" * 80)
         print(f"🚀 Starting SQL Script Execution Pipeline")
         print(f"📅 Started at: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"📋 Total scripts: {len(script_definitions)}")
+        print(f"📋 Total scripts: {len(script_definitions)} (workers: {workers})")
         print("=" * 80)
         print()
 
+        pool = None
         try:
             with self.sf.get_cursor() as cursor:
                 # Show current context
@@ -40,28 +238,25 @@ class SQLScriptExecutor:
                 role, db, schema, warehouse = cursor.fetchone()
                 print(f"🔐 Context: Role={role}, DB={db}, Schema={schema}, Warehouse={warehouse}\n")
 
-                # Execute each script
-                for idx, script_def in enumerate(script_definitions, 1):
-                    script_file = script_def['file']
-                    description = script_def.get('description', script_file)
-                    is_optional = script_def.get('optional', False)
+            # Ledger entries are per deploy target
+            target = self.target = f"{getattr(self.sf, 'database_path', None) or self.sf.account}/{db}"
+            ledger = load_deployment_ledger(self.ledger_path) if self.ledger_path else None
+            if ledger is not None and force:
+                print("💪 --force: ignoring the deployment ledger\n")
 
-                    success = self._execute_single_script(
-                        cursor=cursor,
-                        script_file=script_file,
-                        description=description,
-                        script_number=idx,
-                        total_scripts=len(script_definitions),
-                        create_savepoint=create_savepoint,
-                        is_optional=is_optional
-                    )
+            graph = build_dependency_graph(script_definitions)
+            self._print_dependencies(script_definitions, graph)
 
-                    if not success and not is_optional and stop_on_error:
-                        print(f"\n❌ Stopping execution due to error in: {script_file}")
-                        break
+            pool = SnowflakePool(min_size=0, max_size=max(workers, 1),
+                                 connect_fn=lambda: create_connection().connect())
+            self._run_graph(pool, script_definitions, graph, stop_on_error, create_savepoint, max(workers, 1),
+                            ledger, target, force)
+
+            self._add_query_history(start_time)
 
-                # Summary
-                self._print_summary(start_time)
+            # Summary
+            self._print_summary(start_time)
+            self._print_slowest_statements()
 
         except Exception as e:
             print(f"\n💥 Critical error during execution: {e}")
@@ -69,20 +264,160 @@ class SQLScriptExecutor:
             traceback.print_exc()
 
         finally:
+            if pool is not None:
+                pool.close()
             self.sf.close()
-            self._save_execution_log()
+            self._save_execution_log(start_time)
+
+    def _print_dependencies(self, script_definitions: List[Dict], graph: Dict[int, set]):
+        edges = [(i, sorted(deps)) for i, deps in graph.items() if deps]
+        if not edges:
+            print("🔗 No dependencies between scripts - all can run in parallel\n")
+            return
+        print("🔗 Dependencies:")
+        for i, deps in edges:
+            names = ', '.join(script_definitions[d]['file'] for d in deps)
+            print(f"   {script_definitions[i]['file']} ← {names}")
+        print()
+
+    def _run_graph(self, pool: SnowflakePool, script_definitions: List[Dict], graph: Dict[int, set],
+                   stop_on_error: bool, create_savepoint: bool, workers: int,
+                   ledger: Optional[Dict] = None, target: str = '', force: bool = False):
+        """Run scripts as their dependencies complete, at most `workers` at a time"""
+        total = len(script_definitions)
+        waiting = {i: set(deps) for i, deps in graph.items()}
+        dependents = {i: {j for j, deps in graph.items() if i in deps} for i in graph}
+        deployed = set()
+        digests = {}
+        stopped = False
+        history = ledger.setdefault(target, {}) if ledger is not None else {}
+
+        def unchanged(idx):
+            script_file = script_definitions[idx]['file']
+            digests[idx] = script_digest(script_file)
+            entry = history.get(script_file)
+            return (ledger is not None and not force and digests[idx] is not None
+                    and entry is not None and entry['status'] == 'success'
+                    and entry['sha256'] == digests[idx] and not graph[idx] & deployed)
+
+        def release(idx):
+            for j in dependents[idx]:
+                if j in waiting:
+                    waiting[j].discard(idx)
+
+        def run(idx):
+            script_def = script_definitions[idx]
+            # With several scripts in flight, collect each one's output and print it as a block
+            lines = []
+
+            def collect(*args):
+                lines.append(' '.join(str(arg) for arg in args))
+
+            out = print if workers == 1 else collect
+            started = time.time()
+            with pool.connection() as connection:
+                cursor = connection.cursor()
+                try:
+                    success = self._execute_single_script(
+                        cursor=cursor,
+                        script_file=script_def['file'],
+                        description=script_def.get('description', script_def['file']),
+                        script_number=idx + 1,
+                        total_scripts=total,
+                        create_savepoint=create_savepoint,
+                        is_optional=script_def.get('optional', False),
+                        out=out
+                    )
+                    return success, time.time() - started
+                finally:
+                    cursor.close()
+                    if lines:
+                        with self._print_lock:
+                            print('\n'.join(lines))
+
+        def block(idx, reason):
+            # Everything downstream of a failed script is skipped, not attempted
+            for j in sorted(dependents[idx]):
+                if j in waiting:
+                    del waiting[j]
+                    print(f"⏭️  Skipping {script_definitions[j]['file']}: depends on failed {reason}")
+                    self.execution_log.append({
+                        'script': script_definitions[j]['file'],
+                        'description': script_definitions[j].get('description', script_definitions[j]['file']),
+                        'start_time': datetime.now().isoformat(),
+                        'status': 'blocked',
+                        'error': f"Dependency failed: {reason}",
+                    })
+                    block(j, reason)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='deploy') as executor:
+            running = {}
+            while waiting or running:
+                while not stopped and len(running) < workers:
+                    ready = sorted(i for i, deps in waiting.items() if not deps)
+                    if not ready:
+                        break
+                    idx = ready[0]
+                    del waiting[idx]
+                    if unchanged(idx):
+                        script_file = script_definitions[idx]['file']
+                        print(f"⏩ Unchanged since {history[script_file]['deployed_at']}: {script_file}")
+                        self.execution_log.append({
+                            'script': script_file,
+                            'description': script_definitions[idx].get('description', script_file),
+                            'start_time': datetime.now().isoformat(),
+                            'status': 'unchanged',
+                        })
+                        release(idx)
+                    else:
+                        running[executor.submit(run, idx)] = idx
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    idx = running.pop(future)
+                    script_def = script_definitions[idx]
+                    success, execution_time = future.result()
+                    deployed.add(idx)
+                    if ledger is not None and digests[idx] is not None:
+                        history[script_def['file']] = {
+                            'sha256': digests[idx],
+                            'status': 'success' if success else 'failed',
+                            'deployed_at': datetime.now().isoformat(timespec='seconds'),
+                            'execution_time': round(execution_time, 3),
+                        }
+                        save_deployment_ledger(self.ledger_path, ledger)
+                    if success or script_def.get('optional', False):
+                        release(idx)
+                    else:
+                        block(idx, script_def['file'])
+                        if stop_on_error and not stopped:
+                            stopped = True
+                            print(f"\n❌ Stopping execution due to error in: {script_def['file']}")
+
+        # Scripts a stop kept from starting still count towards the summary
+        for idx in sorted(waiting):
+            script_file = script_definitions[idx]['file']
+            print(f"⏹️  Not started (execution stopped): {script_file}")
+            self.execution_log.append({
+                'script': script_file,
+                'description': script_definitions[idx].get('description', script_file),
+                'start_time': datetime.now().isoformat(),
+                'status': 'skipped',
+                'error': "Execution stopped on an earlier error",
+            })
 
     def _execute_single_script(self, cursor, script_file: str, description: str,
                                script_number: int, total_scripts: int,
-                               create_savepoint: bool, is_optional: bool) -> bool:
+                               create_savepoint: bool, is_optional: bool, out=print) -> bool:
         """Execute a single SQL script with error handling"""
 
-        print("=" * 80)
-        print(f"📄 [{script_number}/{total_scripts}] {description}")
-        print(f"📂 File: {script_file}")
+        out("=" * 80)
+        out(f"📄 [{script_number}/{total_scripts}] {description}")
+        out(f"📂 File: {script_file}")
         if is_optional:
-            print("⚠️  Optional script - errors will not stop execution")
-        print("=" * 80)
+            out("⚠️  Optional script - errors will not stop execution")
+        out("=" * 80)
 
         start_time = time.time()
         log_entry = {
@@ -94,69 +429,40 @@ class SQLScriptExecutor:
 
         try:
             # Construct file path
-            base_dir = os.path.dirname(os.path.abspath(__file__))
-            file_path = os.path.abspath(os.path.join(base_dir, "..", script_file))
+            file_path = script_path(script_file)
 
             if not os.path.exists(file_path):
                 raise FileNotFoundError(f"Script file not found: {file_path}")
 
-            # Read SQL content
-            with open(file_path, 'r', encoding='utf-8') as f:
-                sql_content = f.read()
-
-            if not sql_content.strip():
-                raise ValueError(f"Script file is empty: {script_file}")
-
-            # Clean SQL content - remove empty statements and comments
-            cleaned_sql = self._clean_sql_content(sql_content)
-
             # Create savepoint if requested
-            savepoint_name = None
             if create_savepoint:
-                savepoint_name = f"sp_{script_number}_{int(time.time())}"
                 try:
                     cursor.execute(f"BEGIN")
-                    print(f"💾 Transaction started")
+                    out(f"💾 Transaction started")
                 except Exception as e:
-                    print(f"⚠️  Could not create transaction: {e}")
+                    out(f"⚠️  Could not create transaction: {e}")
 
-            # Execute entire script as one block using connection.execute_string for multi-statement support
-            print(f"📊 Executing entire script...\n")
+            # Statements are split while the file is read and run one at a time,
+            # so progress, timing and retries are per statement
+            out(f"📊 Executing statements...\n")
+            statements = log_entry['statements'] = []
+            with open(file_path, 'r', encoding='utf-8') as f:
+                for number, statement in enumerate(split_sql(f), start=1):
+                    statements.append(self._execute_statement(cursor, statement, number, out))
 
-            try:
-                print(f"  ⚙️  Running script...")
-                # Use connection.execute_string() which supports multiple statements
-                results_generator = self.sf.connection.execute_string(cleaned_sql)
-
-                # Process all results from all statements
-                statement_count = 0
-                for cur in results_generator:
-                    statement_count += 1
-                    try:
-                        results = cur.fetchall()
-                        if results:
-                            print(f"  ✅ Statement {statement_count} returned {len(results)} row(s)")
-                            if len(results) <= 10:  # Only show small result sets
-                                for row in results:
-                                    print(f"     {row}")
-                    except:
-                        pass  # No results to fetch
-
-                print(f"  ✅ Executed {statement_count} statement(s)")
-
-            except Exception as script_error:
-                print(f"  ❌ Script execution failed: {script_error}")
-                raise
+            if not statements:
+                raise ValueError(f"Script file is empty: {script_file}")
+            out(f"  ✅ Executed {len(statements)} statement(s)")
 
             # Commit transaction
             if create_savepoint:
                 cursor.execute("COMMIT")
-                print(f"✅ Transaction committed")
+                out(f"✅ Transaction committed")
 
             # Success
             execution_time = time.time() - start_time
-            print(f"\n✅ Completed successfully in {execution_time:.2f}s")
-            print()
+            out(f"\n✅ Completed successfully in {execution_time:.2f}s")
+            out()
 
             log_entry['status'] = 'success'
             log_entry['execution_time'] = execution_time
@@ -165,7 +471,7 @@ class SQLScriptExecutor:
             return True
 
         except FileNotFoundError as e:
-            print(f"\n❌ File Error: {e}\n")
+            out(f"\n❌ File Error: {e}\n")
             log_entry['status'] = 'file_not_found'
             log_entry['error'] = str(e)
             self.execution_log.append(log_entry)
@@ -174,14 +480,14 @@ class SQLScriptExecutor:
 
         except Exception as e:
             execution_time = time.time() - start_time
-            print(f"\n❌ Execution Failed after {execution_time:.2f}s")
-            print(f"Error: {e}\n")
+            out(f"\n❌ Execution Failed after {execution_time:.2f}s")
+            out(f"Error: {e}\n")
 
             # Rollback if in transaction
             if create_savepoint:
                 try:
                     cursor.execute("ROLLBACK")
-                    print(f"↩️  Transaction rolled back\n")
+                    out(f"↩️  Transaction rolled back\n")
                 except:
                     pass
 
@@ -196,23 +502,110 @@ class SQLScriptExecutor:
             # Print traceback for debugging
             if not is_optional:
                 import traceback
-                traceback.print_exc()
-                print()
+                out(traceback.format_exc())
 
             return False
 
-    def _clean_sql_content(self, sql_content: str) -> str:
-        """Clean SQL content by removing comments and empty statements"""
-        lines = []
-        for line in sql_content.split('\n'):
-            # Remove single-line comments
-            if '--' in line:
-                line = line[:line.index('--')]
-            # Keep non-empty lines
-            if line.strip():
-                lines.append(line)
+    def _execute_statement(self, cursor, statement: SqlStatement, number: int, out=print) -> Dict:
+        """Run one statement, retrying transient failures; returns its timing record"""
+        preview = ' '.join(statement.sql.split())[:80]
+        for attempt in range(self.statement_retries + 1):
+            started_at = datetime.now().isoformat(timespec='milliseconds')
+            started = time.perf_counter()
+            try:
+                cursor.execute(statement.sql)
+            except Exception as e:
+                elapsed = time.perf_counter() - started
+                # A dropped session can't be retried on this cursor; the script fails instead
+                if attempt < self.statement_retries and is_transient_error(e) and not is_session_expired(e):
+                    delay = backoff_delay(attempt)
+                    out(f"  🔁 [{number}] line {statement.line} failed after {elapsed:.2f}s: {e} "
+                        f"- retry {attempt + 1}/{self.statement_retries} in {delay:.1f}s")
+                    time.sleep(delay)
+                    continue
+                out(f"  ❌ [{number}] line {statement.line} failed after {elapsed:.2f}s: {preview}")
+                raise
 
-        return '\n'.join(lines)
+            try:
+                results = cursor.fetchall()
+            except Exception:
+                results = None  # No results to fetch
+            elapsed = time.perf_counter() - started
+
+            out(f"  ✅ [{number}] {elapsed:6.2f}s  {preview}")
+            if results and len(results) <= 10:  # Only show small result sets
+                for row in results:
+                    out(f"     {row}")
+
+            rowcount = getattr(cursor, 'rowcount', None)
+            return {
+                'statement': number,
+                'line': statement.line,
+                'started_at': started_at,
+                'query_id': getattr(cursor, 'sfqid', None),
+                'execution_time': elapsed,
+                'attempts': attempt + 1,
+                'rows': rowcount if rowcount is not None and rowcount >= 0 else None,
+                'sql': statement.sql,
+            }
+
+    def _statements(self) -> List[Dict]:
+        """Every executed statement across the deploy, with its script"""
+        return [{'script': log_entry['script'], **statement}
+                for log_entry in self.execution_log for statement in log_entry.get('statements', [])]
+
+    def _add_query_history(self, start_time: datetime):
+        """
+        Add bytes scanned, rows produced and server-side timings to each statement
+        record from INFORMATION_SCHEMA.QUERY_HISTORY, matched on query id.
+        """
+        records = {statement['query_id']: statement
+                   for log_entry in self.execution_log for statement in log_entry.get('statements', [])
+                   if statement.get('query_id')}
+        if not records:
+            return
+        minutes = int((datetime.now() - start_time).total_seconds() // 60) + 5
+        query_ids = list(records)
+        try:
+            for offset in range(0, len(query_ids), QUERY_HISTORY_BATCH):
+                batch = query_ids[offset:offset + QUERY_HISTORY_BATCH]
+                sql = QUERY_HISTORY_SQL.format(minutes=minutes, placeholders=', '.join(['%s'] * len(batch)))
+                for query_id, query_type, bytes_scanned, rows_produced, compilation_ms, execution_ms, elapsed_ms \
+                        in self.sf.execute_query(sql, batch):
+                    records[query_id].update({
+                        'query_type': query_type,
+                        'bytes_scanned': bytes_scanned,
+                        'rows_produced': rows_produced,
+                        'server_compilation_sec': compilation_ms / 1000 if compilation_ms is not None else None,
+                        'server_execution_sec': execution_ms / 1000 if execution_ms is not None else None,
+                        'server_elapsed_sec': elapsed_ms / 1000 if elapsed_ms is not None else None,
+                    })
+        except Exception as e:
+            print(f"⚠️  Query history unavailable, profile has client-side timings only: {' '.join(str(e).split())[:200]}")
+
+    def slowest_statements(self, n: int = SLOWEST_STATEMENTS) -> List[Dict]:
+        """The n slowest statements across the deploy, by client-side elapsed time"""
+        return sorted(self._statements(), key=lambda statement: statement['execution_time'], reverse=True)[:n]
+
+    def _print_slowest_statements(self, n: int = SLOWEST_STATEMENTS):
+        slowest = self.slowest_statements(n)
+        if not slowest:
+            return
+        print("\n" + "=" * 110)
+        print(f"🐢 TOP {len(slowest)} SLOWEST STATEMENTS")
+        print("=" * 110)
+        print(f"{'Seconds':>8} {'Rows':>10} {'Scanned MB':>11}  {'Script:line':<36} SQL")
+        print("-" * 110)
+        for statement in slowest:
+            rows = statement.get('rows_produced')
+            rows = statement['rows'] if rows is None else rows
+            scanned = statement.get('bytes_scanned')
+            rows_text = f"{rows:,}" if rows is not None else '-'
+            scanned_text = f"{scanned / 1024 / 1024:,.1f}" if scanned is not None else '-'
+            location = f"{statement['script']}:{statement['line']}"
+            print(f"{statement['execution_time']:>8.2f} {rows_text:>10} {scanned_text:>11}  "
+                  f"{location:<36} {' '.join(statement['sql'].split())[:45]}")
+        print("=" * 110)
 
     def _print_summary(self, start_time: datetime):
         """Print execution summary"""
@@ -222,6 +615,9 @@ class SQLScriptExecutor:
         success_count = sum(1 for log in self.execution_log if log['status'] == 'success')
         failed_count = sum(1 for log in self.execution_log if log['status'] == 'failed')
         optional_failed = sum(1 for log in self.execution_log if log['status'] == 'optional_failed')
+        blocked_count = sum(1 for log in self.execution_log if log['status'] == 'blocked')
+        unchanged_count = sum(1 for log in self.execution_log if log['status'] == 'unchanged')
+        skipped_count = sum(1 for log in self.execution_log if log['status'] == 'skipped')
 
         print("\n" + "=" * 80)
         print("📊 EXECUTION SUMMARY")
@@ -229,8 +625,14 @@ class SQLScriptExecutor:
         print(f"⏱️  Total Duration: {duration:.2f}s")
         print(f"✅ Successful: {success_count}")
         print(f"❌ Failed: {failed_count}")
+        if unchanged_count > 0:
+            print(f"⏩ Unchanged (skipped): {unchanged_count}")
         if optional_failed > 0:
             print(f"⚠️  Optional Failed: {optional_failed}")
+        if blocked_count > 0:
+            print(f"⏭️  Skipped (failed dependency): {blocked_count}")
+        if skipped_count > 0:
+            print(f"⏹️  Not started (stopped on error): {skipped_count}")
         print(f"📋 Total: {len(self.execution_log)}")
 
         if self.failed_scripts:
@@ -246,38 +648,42 @@ class SQLScriptExecutor:
             print("⚠️  Some scripts failed. Check logs for details.")
         print("=" * 80)
 
-    def _save_execution_log(self):
-        """Save execution log to file"""
-        log_dir = "logs"
+    def _save_execution_log(self, start_time: datetime):
+        """
+        Save the execution profile: <log_dir>/sql_execution_<ts>.json (scripts with
+        their statements, plus the slowest statements) and a Parquet file with one
+        row per statement, for loading into Snowflake or pandas.
+        """
+        log_dir = self.log_dir
         os.makedirs(log_dir, exist_ok=True)
 
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        log_file = os.path.join(log_dir, f"sql_execution_{timestamp}.log")
+        log_file = os.path.join(log_dir, f"sql_execution_{timestamp}.json")
+        profile_file = os.path.join(log_dir, f"sql_execution_{timestamp}_statements.parquet")
 
         try:
-            with open(log_file, 'w') as f:
-                f.write("SQL Script Execution Log\n")
-                f.write("=" * 80 + "\n\n")
-
-                for log_entry in self.execution_log:
-                    f.write(f"Script: {log_entry['script']}\n")
-                    f.write(f"Status: {log_entry['status']}\n")
-                    f.write(f"Start Time: {log_entry['start_time']}\n")
-
-                    if 'execution_time' in log_entry:
-                        f.write(f"Execution Time: {log_entry['execution_time']:.2f}s\n")
-
-                    if 'error' in log_entry:
-                        f.write(f"Error: {log_entry['error']}\n")
-
-                    f.write("\n" + "-" * 80 + "\n\n")
-
+            with open(log_file, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'started_at': start_time.isoformat(),
+                    'finished_at': datetime.now().isoformat(),
+                    'target': self.target,
+                    'scripts': self.execution_log,
+                    'slowest_statements': self.slowest_statements(),
+                }, f, indent=2, default=str)
             print(f"📝 Execution log saved to: {log_file}")
 
+            statements = self._statements()
+            if statements:
+                rows = [{field: statement.get(field) for field in STATEMENT_PROFILE_SCHEMA.names}
+                        for statement in statements]
+                pq.write_table(pa.Table.from_pylist(rows, schema=STATEMENT_PROFILE_SCHEMA), profile_file)
+                print(f"📝 Statement profile saved to: {profile_file}")
+
         except Exception as e:
             print(f"⚠️  Could not save log file: {e}")
 
-def run_datavelocity_pipeline():
+def run_datavelocity_pipeline(workers: int = DEFAULT_WORKERS, statement_retries: int = DEFAULT_STATEMENT_RETRIES,
+                              force: bool = False, ledger_path=DEPLOYMENT_LEDGER_FILE):
     """Run the complete DataVelocity pipeline"""
 
     # Define all scripts in execution order
@@ -358,13 +764,27 @@ def run_datavelocity_pipeline():
     ]
 
     # Execute all scripts
-    executor = SQLScriptExecutor()
+    executor = SQLScriptExecutor(statement_retries=statement_retries, ledger_path=ledger_path)
     executor.execute_scripts(
         script_definitions=scripts,
         stop_on_error=True,  # Stop on first error
-        create_savepoint=True  # Create transactions for rollback
+        create_savepoint=True,  # Create transactions for rollback
+        workers=workers,
+        force=force
     )
 
 
 if __name__ == "__main__":
-    run_datavelocity_pipeline()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Deploy the DataVelocity SQL scripts")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f"Scripts deployed concurrently (default: {DEFAULT_WORKERS}; 1 = one at a time)")
+    parser.add_argument('--retries', type=int, default=DEFAULT_STATEMENT_RETRIES,
+                        help=f"Retries of a statement failing with a transient error (default: {DEFAULT_STATEMENT_RETRIES})")
+    parser.add_argument('--force', action='store_true',
+                        help="Deploy every script, even those unchanged since their last successful deploy")
+    parser.add_argument('--ledger', default=str(DEPLOYMENT_LEDGER_FILE),
+                        help=f"Deployment ledger path (default: {DEPLOYMENT_LEDGER_FILE})")
+    parser.add_argument('--no-ledger', action='store_true', help="Don't read or write the deployment ledger")
+    args = parser.parse_args()
+    run_datavelocity_pipeline(workers=args.workers, statement_retries=args.retries, force=args.force,
+                              ledger_path=None if args.no_ledger else args.ledger)
\ No newline at end of file
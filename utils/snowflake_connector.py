@@ -1,17 +1,84 @@
-import snowflake.connector
-from snowflake.connector import DictCursor
+import asyncio
+import logging
 import os
+import random
+import re
+import threading
+import time
+from collections import deque
 from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Optional, Sequence
+import pyarrow as pa
 from dotenv import load_dotenv
 
+if TYPE_CHECKING:
+    import pandas
+
+try:
+    import snowflake.connector
+    from snowflake.connector import DictCursor
+except ImportError:  # only the DuckDB backend (utils.duckdb_backend) is usable
+    snowflake = None
+    DictCursor = None
+
+from utils.query_cache import QueryCache, cache_key
+from utils.query_hooks import ObservedCursor, new_event
+
 # Load environment variables from .env file
 load_dotenv()
 
+DEFAULT_RETRIES = 3
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+# Snowflake accepts 900-3600 seconds
+KEEP_ALIVE_HEARTBEAT_SEC = 900
+
+TRANSIENT_ERROR_TYPES = {'OperationalError', 'InterfaceError', 'ConnectionError', 'TimeoutError',
+                         'ConnectionResetError', 'ConnectionAbortedError', 'BrokenPipeError'}
+TRANSIENT_ERROR_MARKERS = ('timeout', 'timed out', 'connection reset', 'connection aborted', 'temporarily',
+                           'throttl', 'too many requests', '429', '502', '503', '504')
+# Session no longer exists / authentication token expired / invalid token
+SESSION_EXPIRED_ERRNOS = {390111, 390112, 390114}
+SESSION_EXPIRED_MARKERS = ('session no longer exists', 'token has expired', 'connection is closed')
+READ_ONLY_STATEMENT = re.compile(r"^\s*(?:\(\s*)*(SELECT|WITH|SHOW|DESCRIBE|DESC|LIST|LS)\b", re.IGNORECASE)
+
+
+def is_session_expired(error) -> bool:
+    """The session behind the connection is gone; a new connection is needed"""
+    if getattr(error, 'errno', None) in SESSION_EXPIRED_ERRNOS:
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in SESSION_EXPIRED_MARKERS)
+
+
+def is_transient_error(error) -> bool:
+    """Network/timeout/throttling errors worth retrying; SQL and auth errors are not"""
+    if is_session_expired(error):
+        return True
+    if any(cls.__name__ in TRANSIENT_ERROR_TYPES for cls in type(error).__mro__):
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in TRANSIENT_ERROR_MARKERS)
+
+
+def is_read_only(query: str) -> bool:
+    """SELECT/WITH/SHOW/DESCRIBE/LIST statements, which are safe to run again"""
+    return bool(READ_ONLY_STATEMENT.match(re.sub(r"--[^\n]*|/\*.*?\*/", " ", query, flags=re.DOTALL)))
+
+
+def backoff_delay(attempt: int, base: float = RETRY_BASE_DELAY, cap: float = RETRY_MAX_DELAY) -> float:
+    """Exponential backoff with full jitter for the given (0-based) retry attempt"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
 class SnowflakeConnection:
     """
     A class to manage Snowflake database connections.
     """
 
+    # Cursor class for get_cursor(dict_cursor=True); backends override it
+    dict_cursor_class = DictCursor
+
     def __init__(
             self,
             user: Optional[str] = None,
@@ -20,11 +87,23 @@ class SnowflakeConnection:
             warehouse: Optional[str] = None,
             database: Optional[str] = None,
             schema: Optional[str] = None,
-            role: Optional[str] = None
+            role: Optional[str] = None,
+            cache: Optional[QueryCache] = None,
+            retries: int = DEFAULT_RETRIES,
+            keep_alive: bool = True,
+            logger: Optional[logging.Logger] = None,
+            hooks: Optional[list] = None
     ):
         """
         Initialize Snowflake connection parameters.
         Defaults to environment variables if parameters not provided.
+
+        Args:
+            cache: Optional QueryCache for execute_query/fetch_arrow calls that pass cache_ttl
+            retries: Extra attempts for connect() and for read-only queries on transient errors
+            keep_alive: Keep the session alive with heartbeats instead of letting it expire when idle
+            logger: Logger for per-attempt timings (default: the 'snowflake_connector' logger)
+            hooks: Callables receiving a timing event per executed statement (see utils.query_hooks)
         """
         self.user = os.getenv('SNOWFLAKE_USER')
         self.password = os.getenv('SNOWFLAKE_PASSWORD')
@@ -34,39 +113,133 @@ class SnowflakeConnection:
         self.schema = os.getenv('SNOWFLAKE_SCHEMA')
         self.role = os.getenv('SNOWFLAKE_ROLE')
         self.connection = None
+        self.cache = cache
+        self.retries = retries
+        self.keep_alive = keep_alive
+        self.logger = logger or logging.getLogger('snowflake_connector')
+        self.hooks = list(hooks or [])
+        # Serialises lazy connects so concurrent callers (run_async, threads) share one session
+        self._connect_lock = threading.RLock()
+
+    def connection_params(self) -> dict:
+        """
+        Keyword arguments for snowflake.connector.connect().
+        """
+        conn_params = {
+            'user': self.user,
+            'password': self.password,
+            'account': self.account
+        }
+
+        # Add optional parameters only if they are provided
+        if self.warehouse:
+            conn_params['warehouse'] = self.warehouse
+        if self.database:
+            conn_params['database'] = self.database
+        if self.schema:
+            conn_params['schema'] = self.schema
+        if self.role:
+            conn_params['role'] = self.role
+        if self.keep_alive:
+            conn_params['client_session_keep_alive'] = True
+            conn_params['client_session_keep_alive_heartbeat_frequency'] = KEEP_ALIVE_HEARTBEAT_SEC
+        return conn_params
 
-    def connect(self) -> snowflake.connector.SnowflakeConnection:
+    def connect(self) -> "snowflake.connector.SnowflakeConnection":
         """
         Establish connection to Snowflake.
+
+        Transient failures (network, timeouts, throttling) are retried up to
+        self.retries times with exponential backoff; each attempt is logged
+        with its duration.
         """
-        try:
-            conn_params = {
-                'user': self.user,
-                'password': self.password,
-                'account': self.account
-            }
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                self.connection = snowflake.connector.connect(**self.connection_params())
+                self.logger.info("Connected to Snowflake on attempt %d in %.2fs",
+                                 attempt + 1, time.perf_counter() - started)
+                return self.connection
+            except Exception as e:
+                elapsed = time.perf_counter() - started
+                if attempt >= self.retries or not is_transient_error(e):
+                    self.logger.error("Connect attempt %d failed after %.2fs: %s", attempt + 1, elapsed, e)
+                    print(f"Error connecting to Snowflake: {e}")
+                    raise
+                delay = backoff_delay(attempt)
+                self.logger.warning("Connect attempt %d failed after %.2fs: %s; retrying in %.1fs",
+                                    attempt + 1, elapsed, e, delay)
+                time.sleep(delay)
+                attempt += 1
 
-            # Add optional parameters only if they are provided
-            if self.warehouse:
-                conn_params['warehouse'] = self.warehouse
-            if self.database:
-                conn_params['database'] = self.database
-            if self.schema:
-                conn_params['schema'] = self.schema
-            if self.role:
-                conn_params['role'] = self.role
-
-            self.connection = snowflake.connector.connect(**conn_params)
+    def _ensure_connected(self):
+        """Return the open connection, connecting first if needed (at most once across threads)."""
+        connection = self.connection
+        if connection is not None and not connection.is_closed():
+            return connection
+        with self._connect_lock:
+            if not self.connection or self.connection.is_closed():
+                self.connect()
             return self.connection
-        except Exception as e:
-            print(f"Error connecting to Snowflake: {e}")
-            raise
+
+    def reconnect(self) -> "snowflake.connector.SnowflakeConnection":
+        """Drop the current connection (ignoring errors) and open a new one."""
+        with self._connect_lock:
+            self._reset_connection()
+            return self.connect()
+
+    def _reset_connection(self):
+        connection, self.connection = self.connection, None
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
 
     def close(self):
         """Close the Snowflake connection."""
         if self.connection:
             self.connection.close()
 
+    def add_hook(self, hook: Callable):
+        """Register a callable that receives one event dict per executed statement."""
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook: Callable):
+        self.hooks.remove(hook)
+
+    def _emit(self, event: dict):
+        for hook in list(self.hooks):
+            try:
+                hook(event)
+            except Exception as e:
+                # A broken sink must never fail the query it is observing
+                self.logger.warning("Query hook %r failed: %s", hook, e)
+
+    def cache_context(self) -> tuple:
+        """
+        Session context a cached result depends on: account, user, role, database, schema.
+
+        Taken from the live connection when it reports them (the Snowflake connector
+        tracks USE ROLE/DATABASE/SCHEMA), else from the configured values.
+        """
+        session = self.connection
+        return tuple(getattr(session, name, None) or getattr(self, name)
+                     for name in ('account', 'user', 'role', 'database', 'schema'))
+
+    def _cache_ttl(self, query: str, cache_ttl: Optional[float]) -> Optional[float]:
+        """TTL to cache this call's result for, or None; only read-only statements are ever cached"""
+        if not self.cache or not is_read_only(query):
+            return None
+        return self.cache.ttl_for(cache_ttl)
+
+    def _emit_cache_hit(self, query: str, table: pa.Table):
+        if self.hooks:
+            event = new_event(query, 'cache')
+            event.update(execute_sec=0.0, elapsed_sec=0.0, rows=table.num_rows, bytes=table.nbytes)
+            self._emit(event)
+
     @contextmanager
     def get_cursor(self, dict_cursor: bool = False):
         """
@@ -76,30 +249,91 @@ class SnowflakeConnection:
             dict_cursor: If True, returns results as dictionaries
         """
         cursor = None
+        expired = False
         try:
-            if not self.connection:
-                self.connect()
+            connection = self._ensure_connected()
 
-            cursor = self.connection.cursor(DictCursor) if dict_cursor else self.connection.cursor()
+            cursor = connection.cursor(self.dict_cursor_class) if dict_cursor else connection.cursor()
+            if self.hooks:
+                cursor = ObservedCursor(cursor, self._emit)
             yield cursor
+        except Exception as e:
+            # Forget a dead session so the next call reconnects instead of failing the same way
+            expired = is_session_expired(e)
+            raise
         finally:
             if cursor:
-                cursor.close()
+                try:
+                    cursor.close()
+                except Exception:
+                    if not expired:
+                        raise
+            if expired:
+                self._reset_connection()
 
-    def execute_query(self, query: str, params: Optional[tuple] = None) -> list:
+    def _with_read_retry(self, query: str, run: Callable):
+        """
+        Call run(cursor) on a fresh cursor; if query is read-only, retry transient
+        failures with backoff, reconnecting in between. Writes are never retried.
+        """
+        retryable = is_read_only(query)
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                with self.get_cursor() as cursor:
+                    result = run(cursor)
+                if attempt:
+                    self.logger.info("Query succeeded on attempt %d in %.2fs", attempt + 1,
+                                     time.perf_counter() - started)
+                return result
+            except Exception as e:
+                elapsed = time.perf_counter() - started
+                if not retryable or attempt >= self.retries or not is_transient_error(e):
+                    raise
+                delay = backoff_delay(attempt)
+                self.logger.warning("Query attempt %d failed after %.2fs: %s; reconnecting in %.1fs",
+                                    attempt + 1, elapsed, e, delay)
+                time.sleep(delay)
+                self._reset_connection()
+                attempt += 1
+
+    def execute_query(self, query: str, params: Optional[tuple] = None, cache_ttl: Optional[float] = None) -> list:
         """
         Execute a SELECT query and return results.
 
         Args:
             query: SQL query to execute
             params: Optional query parameters
+            cache_ttl: Serve from / store in self.cache for this many seconds
+                (None = the cache's default_ttl; ignored without a cache and for
+                statements that aren't read-only, e.g. CALL or DML)
 
         Returns:
             List of query results
         """
-        with self.get_cursor() as cursor:
+        def run(cursor):
             cursor.execute(query, params) if params else cursor.execute(query)
-            return cursor.fetchall()
+            return cursor.fetchall(), [column[0] for column in cursor.description or []]
+
+        ttl = self._cache_ttl(query, cache_ttl)
+        if ttl is None:
+            return self._with_read_retry(query, run)[0]
+
+        self._ensure_connected()
+        key = cache_key(query, params, self.cache_context())
+        table = self.cache.get(key)
+        if table is not None:
+            self._emit_cache_hit(query, table)
+            return list(zip(*(column.to_pylist() for column in table.columns))) if table.num_columns else []
+
+        rows, names = self._with_read_retry(query, run)
+        try:
+            table = pa.table([list(column) for column in zip(*rows)] if rows else [[] for _ in names], names=names)
+        except (pa.ArrowException, TypeError, ValueError):
+            return rows  # values Arrow can't represent are just not cached
+        self.cache.put(key, table, ttl, query)
+        return rows
 
     def execute_update(self, query: str, params: Optional[tuple] = None) -> int:
         """
@@ -115,8 +349,570 @@ class SnowflakeConnection:
         with self.get_cursor() as cursor:
             cursor.execute(query, params) if params else cursor.execute(query)
             self.connection.commit()
+            if self.cache:
+                self.cache.invalidate_statement(query)
             return cursor.rowcount
 
+    def execute_many(self, query: str, rows: Iterable[Sequence], batch_size: int = 10000) -> int:
+        """
+        Execute one parameterized statement for many rows, committing once per batch.
+
+        With the default pyformat paramstyle the connector folds each batch of
+        an INSERT ... VALUES (%s, ...) into a single multi-row INSERT; other
+        statements run once per row but still share one commit per batch.
+
+        Args:
+            query: SQL with %s placeholders
+            rows: Iterable of parameter tuples (consumed lazily)
+            batch_size: Rows sent and committed together
+
+        Returns:
+            Total number of affected rows
+        """
+        total = 0
+        with self.get_cursor() as cursor:
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    cursor.executemany(query, batch)
+                    self.connection.commit()
+                    total += max(cursor.rowcount or 0, 0)
+                    batch = []
+            if batch:
+                cursor.executemany(query, batch)
+                self.connection.commit()
+                total += max(cursor.rowcount or 0, 0)
+        if self.cache:
+            self.cache.invalidate_statement(query)
+        return total
+
+    def bulk_load(
+            self,
+            data,
+            table: str,
+            schema: Optional[str] = None,
+            chunk_size: Optional[int] = None,
+            auto_create_table: bool = False,
+            overwrite: bool = False,
+            parallel: int = 4,
+            compression: str = 'gzip'
+    ) -> dict:
+        """
+        Load a DataFrame or Arrow table into a table with write_pandas.
+
+        write_pandas writes the data to Parquet, PUTs it to the table's stage
+        and runs one COPY INTO, so the row count doesn't change the number of
+        round trips.
+
+        Args:
+            data: pandas.DataFrame or pyarrow.Table; column names must match the table
+            table: Target table name, optionally schema-qualified (BRONZE.ORDER_BRZ)
+            schema: Target schema (default: from table, else the connection's schema)
+            chunk_size: Rows per Parquet file (default: all rows in one file)
+            auto_create_table: Create the table from the data's schema if missing
+            overwrite: Truncate the table before loading
+            parallel: PUT threads
+            compression: Parquet codec for the uploaded files ('gzip' or 'snappy')
+
+        Returns:
+            Dict with success, chunks, rows
+        """
+        from snowflake.connector.pandas_tools import write_pandas
+
+        if hasattr(data, 'to_pandas'):
+            data = data.to_pandas()
+        if schema is None and '.' in table:
+            schema, table = table.rsplit('.', 1)
+        self._ensure_connected()
+
+        success, chunks, rows, _ = write_pandas(
+            self.connection,
+            data,
+            table_name=table,
+            schema=schema,
+            chunk_size=chunk_size,
+            parallel=parallel,
+            compression=compression,
+            auto_create_table=auto_create_table,
+            overwrite=overwrite,
+            quote_identifiers=False,
+            use_logical_type=True,
+        )
+        if self.cache:
+            self.cache.invalidate(table)
+        return {'success': success, 'chunks': chunks, 'rows': rows}
+
+    def fetch_arrow(self, query: str, params: Optional[tuple] = None, cache_ttl: Optional[float] = None) -> pa.Table:
+        """
+        Execute a query and return the whole result as one Arrow table.
+
+        Uses the connector's Arrow result format, so no per-row Python objects
+        are built. An empty result still comes back as a (zero-row) table.
+        cache_ttl works as in execute_query().
+        """
+        ttl = self._cache_ttl(query, cache_ttl)
+        if ttl is not None:
+            self._ensure_connected()
+            key = cache_key(query, params, self.cache_context())
+            table = self.cache.get(key)
+            if table is not None:
+                self._emit_cache_hit(query, table)
+                return table
+
+        def run(cursor):
+            cursor.execute(query, params) if params else cursor.execute(query)
+            return cursor.fetch_arrow_all(force_return_table=True)
+
+        table = self._with_read_retry(query, run)
+        if ttl is not None:
+            self.cache.put(key, table, ttl, query)
+        return table
+
+    def fetch_pandas(self, query: str, params: Optional[tuple] = None) -> "pandas.DataFrame":
+        """
+        Execute a query and return the result as a pandas DataFrame (built from Arrow).
+        """
+        def run(cursor):
+            cursor.execute(query, params) if params else cursor.execute(query)
+            return cursor.fetch_pandas_all()
+
+        return self._with_read_retry(query, run)
+
+    def iter_arrow_batches(self, query: str, params: Optional[tuple] = None) -> Iterator[pa.Table]:
+        """
+        Execute a query and yield the result as Arrow tables, one per result chunk.
+
+        Chunks are downloaded as they are consumed, so memory stays bounded by
+        the chunk size rather than the result size. The cursor stays open until
+        the generator is exhausted or closed.
+        """
+        with self.get_cursor() as cursor:
+            cursor.execute(query, params) if params else cursor.execute(query)
+            for batch in cursor.fetch_arrow_batches():
+                if batch.num_rows:
+                    yield batch
+
+
+    def submit_async(self, query: str, params: Optional[tuple] = None) -> str:
+        """
+        Start a query on the server and return its query id without waiting.
+
+        The query keeps running after this returns, so several long procedure
+        calls (e.g. one CALL COMMON.SP_ETL_MASTER per entity) can run at once
+        from a single thread. Collect them with wait() and results().
+        """
+        with self.get_cursor() as cursor:
+            cursor.execute_async(query, params) if params else cursor.execute_async(query)
+            return cursor.sfqid
+
+    def query_status(self, query_id: str) -> str:
+        """Current status name of a query (RUNNING, SUCCESS, FAILED_WITH_ERROR, ...)."""
+        self._ensure_connected()
+        return self.connection.get_query_status(query_id).name
+
+    def wait(
+            self,
+            query_ids,
+            timeout: Optional[float] = None,
+            poll_interval: float = 1.0,
+            max_poll_interval: float = 10.0
+    ) -> dict:
+        """
+        Block until the given queries have finished.
+
+        Polls with a growing interval (poll_interval up to max_poll_interval).
+        Failed queries don't raise here; their status says so and results()
+        raises their error.
+
+        Args:
+            query_ids: One query id or a list of them
+            timeout: Seconds to wait in total (None = no limit)
+
+        Returns:
+            {query_id: final status name}
+
+        Raises:
+            TimeoutError: if any query is still running after timeout seconds
+        """
+        if isinstance(query_ids, str):
+            query_ids = [query_ids]
+        self._ensure_connected()
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        pending = list(query_ids)
+        finished = {}
+        interval = poll_interval
+        while True:
+            for query_id in list(pending):
+                status = self.connection.get_query_status(query_id)
+                if not self.connection.is_still_running(status):
+                    finished[query_id] = status.name
+                    pending.remove(query_id)
+            if not pending:
+                return {query_id: finished[query_id] for query_id in query_ids}
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"{len(pending)} quer{'y' if len(pending) == 1 else 'ies'} still running "
+                                   f"after {timeout}s: {', '.join(pending)}")
+            sleep_for = interval if deadline is None else min(interval, max(deadline - time.monotonic(), 0))
+            time.sleep(sleep_for)
+            interval = min(interval * 1.5, max_poll_interval)
+
+    def results(self, query_id: str) -> list:
+        """
+        Rows of a finished query started with submit_async().
+
+        Raises:
+            snowflake.connector.errors.ProgrammingError: if the query failed
+        """
+        self._ensure_connected()
+        self.connection.get_query_status_throw_if_error(query_id)
+        with self.get_cursor() as cursor:
+            cursor.get_results_from_sfqid(query_id)
+            return cursor.fetchall()
+
+    async def run_async(
+            self,
+            query: str,
+            params: Optional[tuple] = None,
+            poll_interval: float = 1.0,
+            max_poll_interval: float = 10.0,
+            timeout: Optional[float] = None
+    ) -> list:
+        """
+        asyncio wrapper: submit, poll without blocking the event loop, return the rows.
+
+        Independent loads can be gathered from one event loop:
+
+            await asyncio.gather(*(sf.run_async(f"CALL ... ('{e}')") for e in entities))
+        """
+        # Connect once up front: gathered calls then share the session instead of racing to open one each
+        connection = await asyncio.to_thread(self._ensure_connected)
+        query_id = await asyncio.to_thread(self.submit_async, query, params)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        interval = poll_interval
+        while True:
+            status = await asyncio.to_thread(connection.get_query_status, query_id)
+            if not connection.is_still_running(status):
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Query {query_id} still running after {timeout}s")
+            await asyncio.sleep(interval)
+            interval = min(interval * 1.5, max_poll_interval)
+        return await asyncio.to_thread(self.results, query_id)
+
+class _PooledConnection:
+    """A raw connection plus the timestamps the pool needs to expire it."""
+
+    __slots__ = ('raw', 'created_at', 'last_used')
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class SnowflakePool:
+    """
+    Thread-safe pool of Snowflake connections.
+
+    Logging in to Snowflake takes seconds, so callers that run many short
+    queries (parallel uploads, script deployment, dashboards) borrow a warm
+    session instead of opening their own:
+
+        pool = SnowflakePool(min_size=2, max_size=8)
+        with pool.cursor() as cursor:
+            cursor.execute("SELECT CURRENT_VERSION()")
+
+    Connections are health-checked on checkout and replaced once they have
+    been idle longer than idle_timeout or open longer than max_lifetime.
+    connect_fn builds a new raw DB-API connection; it defaults to
+    snowflake.connector.connect with the same .env settings as
+    SnowflakeConnection and can be swapped for any other driver.
+    """
+
+    def __init__(
+            self,
+            min_size: int = 1,
+            max_size: int = 8,
+            idle_timeout: Optional[float] = 300,
+            max_lifetime: Optional[float] = 3600,
+            checkout_timeout: Optional[float] = 30,
+            health_check_sql: Optional[str] = "SELECT 1",
+            connect_fn: Optional[Callable] = None
+    ):
+        """
+        Args:
+            min_size: Connections opened up front and kept through idle expiry
+            max_size: Upper bound on open connections (borrowed + idle)
+            idle_timeout: Seconds an idle connection is kept (None = forever)
+            max_lifetime: Seconds after which a connection is retired (None = forever)
+            checkout_timeout: Seconds to wait for a free connection before TimeoutError
+            health_check_sql: Query run on checkout; None disables the check
+            connect_fn: Zero-argument callable returning a new DB-API connection
+        """
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError(f"Invalid pool size: min_size={min_size}, max_size={max_size}")
+
+        if connect_fn is None:
+            if snowflake is None:
+                raise ImportError("snowflake-connector-python is required unless connect_fn is given")
+            params = SnowflakeConnection().connection_params()
+            connect_fn = lambda: snowflake.connector.connect(**params)
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.checkout_timeout = checkout_timeout
+        self.health_check_sql = health_check_sql
+        self.connect_fn = connect_fn
+
+        self._idle = deque()
+        self._borrowed = {}
+        self._size = 0
+        self._closed = False
+        self._lock = threading.Condition()
+        self.stats = {'created': 0, 'reused': 0, 'discarded': 0, 'waits': 0}
+
+        for _ in range(min_size):
+            with self._lock:
+                self._size += 1
+            self._idle.append(self._open())
+
+    def _open(self) -> _PooledConnection:
+        """Open a new connection; the caller has already reserved a slot in _size."""
+        try:
+            entry = _PooledConnection(self.connect_fn())
+        except Exception:
+            with self._lock:
+                self._size -= 1
+                self._lock.notify()
+            raise
+        with self._lock:
+            self.stats['created'] += 1
+        return entry
+
+    def _discard(self, entry: _PooledConnection):
+        """Close a connection and free its slot."""
+        try:
+            entry.raw.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._size -= 1
+            self.stats['discarded'] += 1
+            self._lock.notify()
+
+    def _expired(self, entry: _PooledConnection, now: float, keep_idle: bool = False) -> bool:
+        if self.max_lifetime is not None and now - entry.created_at >= self.max_lifetime:
+            return True
+        if keep_idle or self.idle_timeout is None:
+            return False
+        return now - entry.last_used >= self.idle_timeout
+
+    def _healthy(self, entry: _PooledConnection) -> bool:
+        if not self.health_check_sql:
+            return True
+        cursor = None
+        try:
+            cursor = entry.raw.cursor()
+            cursor.execute(self.health_check_sql)
+            cursor.fetchall()
+            return True
+        except Exception:
+            return False
+        finally:
+            if cursor is not None:
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+
+    def acquire(self, timeout: Optional[float] = None):
+        """
+        Borrow a raw connection. Prefer the connection() context manager;
+        a connection taken here must be handed back with release().
+
+        Raises:
+            TimeoutError: if no connection frees up within timeout seconds
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            entry, stale = None, []
+            with self._lock:
+                while entry is None:
+                    if self._closed:
+                        raise RuntimeError("SnowflakePool is closed")
+                    now = time.monotonic()
+                    while self._idle:
+                        candidate = self._idle.pop()  # most recently used first
+                        if self._expired(candidate, now):
+                            stale.append(candidate)
+                        else:
+                            entry = candidate
+                            break
+                    if entry is not None or stale:
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+                    remaining = None if deadline is None else deadline - now
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"No Snowflake connection available within {timeout}s "
+                                           f"(max_size={self.max_size})")
+                    self.stats['waits'] += 1
+                    self._lock.wait(remaining)
+
+            for candidate in stale:
+                self._discard(candidate)
+            if entry is None and stale:
+                continue  # freed slots: look again before opening a new one
+            if entry is None:
+                return self._checked_out(self._open())
+            if self._healthy(entry):
+                with self._lock:
+                    self.stats['reused'] += 1
+                return self._checked_out(entry)
+            self._discard(entry)
+
+    def _checked_out(self, entry: _PooledConnection):
+        with self._lock:
+            self._borrowed[id(entry.raw)] = entry
+        return entry.raw
+
+    def release(self, raw, discard: bool = False):
+        """
+        Return a borrowed connection. discard=True closes it instead (use after
+        a connection-level error); closed pools and expired connections are
+        always closed.
+        """
+        with self._lock:
+            entry = self._borrowed.pop(id(raw), None)
+        if entry is None:
+            raise ValueError("Connection was not borrowed from this pool")
+
+        entry.last_used = time.monotonic()
+        if discard or self._closed or self._expired(entry, entry.last_used, keep_idle=True):
+            self._discard(entry)
+            return
+        with self._lock:
+            self._idle.append(entry)
+            self._lock.notify()
+        self.prune()
+
+    def prune(self):
+        """Close idle connections past idle_timeout/max_lifetime, keeping min_size open."""
+        stale = []
+        with self._lock:
+            now = time.monotonic()
+            for entry in list(self._idle):
+                retired = self._expired(entry, now, keep_idle=True)
+                surplus = self._size - len(stale) > self.min_size
+                if retired or (surplus and self._expired(entry, now)):
+                    self._idle.remove(entry)
+                    stale.append(entry)
+        for entry in stale:
+            self._discard(entry)
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """
+        Borrow a connection for the duration of a with block.
+
+        On an exception the transaction is rolled back; if the rollback itself
+        fails the connection is assumed broken and dropped from the pool.
+        """
+        raw = self.acquire(timeout)
+        discard = False
+        try:
+            yield raw
+        except Exception:
+            try:
+                raw.rollback()
+            except Exception:
+                discard = True
+            raise
+        finally:
+            self.release(raw, discard=discard)
+
+    @contextmanager
+    def cursor(self, dict_cursor: bool = False, timeout: Optional[float] = None):
+        """
+        Borrow a connection and yield a cursor on it (see SnowflakeConnection.get_cursor).
+        """
+        with self.connection(timeout) as raw:
+            cursor = raw.cursor(DictCursor) if dict_cursor else raw.cursor()
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+
+    def execute_query(self, query: str, params: Optional[tuple] = None) -> list:
+        """SnowflakeConnection.execute_query on a pooled connection."""
+        with self.cursor() as cursor:
+            cursor.execute(query, params) if params else cursor.execute(query)
+            return cursor.fetchall()
+
+    def execute_update(self, query: str, params: Optional[tuple] = None) -> int:
+        """SnowflakeConnection.execute_update on a pooled connection."""
+        with self.connection() as raw:
+            cursor = raw.cursor()
+            try:
+                cursor.execute(query, params) if params else cursor.execute(query)
+                raw.commit()
+                return cursor.rowcount
+            finally:
+                cursor.close()
+
+    def status(self) -> dict:
+        """Current size plus lifetime counters."""
+        with self._lock:
+            return {
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle),
+                **self.stats,
+            }
+
+    def close(self):
+        """Close idle connections now; borrowed ones are closed as they come back."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            self._lock.notify_all()
+        for entry in idle:
+            self._discard(entry)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def create_connection(backend: Optional[str] = None, **kwargs) -> SnowflakeConnection:
+    """
+    Connection for the configured backend.
+
+    Args:
+        backend: 'snowflake' or 'duckdb' (default: DATAVELOCITY_BACKEND, else 'snowflake').
+            DuckDB uses DATAVELOCITY_DUCKDB_PATH (default in-memory) and bootstraps
+            the metadata and Bronze tables.
+        **kwargs: Passed to the connection class (cache, hooks, logger, ...)
+    """
+    backend = (backend or os.getenv('DATAVELOCITY_BACKEND') or 'snowflake').lower()
+    if backend == 'snowflake':
+        return SnowflakeConnection(**kwargs)
+    if backend == 'duckdb':
+        from utils.duckdb_backend import DuckDBConnection
+        kwargs.setdefault('database', os.getenv('DATAVELOCITY_DUCKDB_PATH', ':memory:'))
+        kwargs.setdefault('bootstrap', True)
+        return DuckDBConnection(**kwargs)
+    raise ValueError(f"Unknown backend '{backend}' (expected 'snowflake' or 'duckdb')")
+
 
 # Example usage
 if __name__ == "__main__":
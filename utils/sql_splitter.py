@@ -0,0 +1,100 @@
+"""
+Statement splitter for the repo's Snowflake SQL scripts.
+
+Splits on ';' outside of everything that can legitimately contain one (or a
+comment marker):
+
+    'string literals'     with '' and backslash escapes
+    "quoted identifiers"  with "" escapes
+    $$ ... $$             procedure / function bodies
+    -- and // comments    dropped
+    /* block comments */  dropped
+
+Statements are yielded one at a time as the source is read, so a script can
+be executed while it is still being split:
+
+    with open('entities/customer.sql', encoding='utf-8') as f:
+        for statement in split_sql(f):
+            cursor.execute(statement.sql)
+"""
+import re
+from typing import Iterable, Iterator, NamedTuple, Union
+
+# Next token that changes state, per state
+_TOKENS = {
+    None: re.compile(r"--|//|/\*|\$\$|['\";]"),
+    "'": re.compile(r"\\.|''|'", re.DOTALL),
+    '"': re.compile(r'""|"'),
+    '$$': re.compile(r"\$\$"),
+    '/*': re.compile(r"\*/"),
+}
+_STATE_NAMES = {"'": 'string literal', '"': 'quoted identifier', '$$': '$$ block', '/*': 'block comment'}
+
+
+class SqlStatement(NamedTuple):
+    sql: str    # statement text without comments or the trailing ';'
+    line: int   # line of the source the statement starts on
+
+
+def split_sql(source: Union[str, Iterable[str]]) -> Iterator[SqlStatement]:
+    """
+    Yield the statements of source (a string, or an iterable of lines such as an open file).
+
+    Raises:
+        ValueError: if the source ends inside a literal, identifier, $$ block or block comment
+    """
+    lines = source.splitlines(keepends=True) if isinstance(source, str) else source
+    parts = []
+    start_line = None
+    state = None
+    state_line = None
+    line_number = 0
+
+    def add(text):
+        nonlocal start_line
+        if text:
+            parts.append(text)
+            if start_line is None and text.strip():
+                start_line = line_number
+
+    for line_number, line in enumerate(lines, start=1):
+        position = 0
+        while position < len(line):
+            match = _TOKENS[state].search(line, position)
+            if match is None:
+                # Rest of the line belongs to the current state
+                if state != '/*':
+                    add(line[position:])
+                break
+
+            token = match.group(0)
+            if state != '/*':
+                add(line[position:match.start()])
+            position = match.end()
+
+            if state is None:
+                if token in ('--', '//'):
+                    add('\n' if line.endswith('\n') else '')
+                    break
+                if token == '/*':
+                    add(' ')
+                    state, state_line = '/*', line_number
+                elif token == ';':
+                    if start_line is not None:
+                        yield SqlStatement(''.join(parts).strip(), start_line)
+                    parts, start_line = [], None
+                else:
+                    add(token)
+                    state, state_line = token, line_number
+            elif state == '/*':
+                state = None
+            else:
+                add(token)
+                # Closing delimiter (escapes like '' or \' keep the state)
+                if token == state:
+                    state = None
+
+    if state is not None:
+        raise ValueError(f"Unterminated {_STATE_NAMES[state]} starting at line {state_line}")
+    if start_line is not None:
+        yield SqlStatement(''.join(parts).strip(), start_line)
@@ -1,68 +1,982 @@
+"""
+Upload the generated data/ tree to the Bronze CSV stage.
+
+Files are PUT one per task from a thread pool, so several tables upload at
+once. Each worker thread reuses its own Snowflake connection for every file
+it handles instead of connecting per folder. CSV files larger than
+--chunk-mb are split on line boundaries into <stem>_part_NNN.csv chunks
+(header repeated, since the CSV file formats use SKIP_HEADER = 1) before the
+PUT. Snowflake loads many medium files in parallel much faster than one huge
+file.
+
+A manifest (data/upload_manifest.json) records each uploaded file's size,
+mtime and SHA-256. On a re-run, files whose size and mtime are unchanged are
+skipped without reading them, and files that were only touched are hashed
+and skipped if the content matches. Files that were never uploaded are PUT
+with OVERWRITE = FALSE, so copies already on the stage are left alone;
+files whose content changed are PUT with OVERWRITE = TRUE.
+
+With --compression gzip|zstd every file (or chunk) is compressed into
+data/_compressed/<table>/ by the worker that uploads it, so compression of
+one file overlaps the PUT of another. The temporary file is removed after
+the PUT. The sources landing in the uploaded stage paths are then pointed at
+a COMMON.FILE_FORMAT_MASTER row with that compression_type (a copy of their
+current format, added if missing), and the Bronze COPY uses it. Formats are
+shared between sources, so the shared row itself is never changed and tables
+not in the run keep their codec. Files of the previous codec (x.csv after an
+upload as x.csv.gz) are REMOVEd from the stage. --compare-codecs uploads the
+same files once per codec under @<stage>/_codec_benchmark/<codec>/ and
+reports bytes sent and time.
+
+Every run keeps a journal (data/upload_journal.json) with one entry per
+file to PUT: PENDING, UPLOADING, DONE or FAILED, plus attempt counts and
+the last error. It is rewritten atomically on every status change.
+Transient failures (network, timeouts, throttling) are retried with
+exponential backoff and full jitter. If a run dies or ends with failures,
+--resume re-runs only the files that are not DONE, with the codec the run
+started with.
+
+Chunk names still match the SOURCE_FILE_CONFIG patterns (e.g. delivery_*.csv).
+The manifest records the stage files each source was uploaded as, and after
+a successful upload the files it superseded are REMOVEd from the stage: the
+whole file when a source is now chunked (and vice versa), and chunks beyond
+the new chunk count. Otherwise the next COPY would load those rows twice.
+
+Usage:
+    python -m utils.upload_files_to_stage                       # all tables to BRONZE.CSV_STG
+    python -m utils.upload_files_to_stage --tables order delivery --workers 8 --parallel 8
+    python -m utils.upload_files_to_stage --local-stage /tmp/stage   # dry run, copies instead of PUT
+    python -m utils.upload_files_to_stage --compression zstd
+    python -m utils.upload_files_to_stage --compare-codecs none gzip zstd --tables order_item
+    python -m utils.upload_files_to_stage --resume                 # finish a failed/interrupted run
+"""
+import argparse
+import gzip
+import hashlib
+import json
 import os
-from utils.snowflake_connector import SnowflakeConnection
+import random
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
 
-sf = SnowflakeConnection()
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / "data"
+CHUNK_DIR_NAME = "_chunks"
+COMPRESSED_DIR_NAME = "_compressed"
 
+DEFAULT_STAGE = "BRONZE.CSV_STG"
+DEFAULT_WORKERS = 4
+DEFAULT_PARALLEL = 4
+DEFAULT_CHUNK_MB = 200
+MAX_PARALLEL = 99  # Snowflake's limit for PUT ... PARALLEL
+UPLOAD_MANIFEST_FILE = "upload_manifest.json"
+HASH_BLOCK_SIZE = 8 * 1024 * 1024
+CODEC_REPORT_FILE = "upload_codec_report.json"
+UPLOAD_JOURNAL_FILE = "upload_journal.json"
 
-def upload_file_to_stage(folder_path, stage_name, subdirectory=None):
-    sf.connect()
+# Retries for transient PUT failures: delay = uniform(0, min(MAX, BASE * 2^attempt))
+DEFAULT_RETRIES = 4
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 60.0
+# Error class names / message fragments treated as transient (snowflake.connector isn't imported here)
+TRANSIENT_ERROR_TYPES = {'OperationalError', 'InterfaceError', 'ConnectionError', 'TimeoutError',
+                         'ConnectionResetError', 'ConnectionAbortedError', 'BrokenPipeError'}
+TRANSIENT_ERROR_MARKERS = ('timeout', 'timed out', 'connection reset', 'connection aborted', 'temporarily',
+                           'throttl', 'too many requests', '429', '502', '503', '504')
 
-    try:
-        with sf.get_cursor() as cursor:
-            # Check context
-            cursor.execute("SELECT CURRENT_ROLE(), CURRENT_DATABASE(), CURRENT_SCHEMA()")
-            role, db, schema = cursor.fetchone()
-            print(f"Context: Role={role}, DB={db}, Schema={schema}")
-
-            # Get absolute path
-            base_dir = os.path.dirname(os.path.abspath(__file__))
-            folder_path = os.path.abspath(os.path.join(base_dir, "..", folder_path))
-
-            if not os.path.isdir(folder_path):
-                raise FileNotFoundError(f"Folder not found: {folder_path}")
-
-            # Convert to forward slashes for Snowflake
-            folder_path_snowflake = folder_path.replace("\\", "/")
-
-            # Build stage path
-            if subdirectory:
-                subdirectory = subdirectory.strip("/")
-                stage_path = f"@{stage_name}/{subdirectory}/"
-            else:
-                stage_path = f"@{stage_name}/"
-
-            print(f"\n🎯 Target stage: {stage_path}")
-
-            # PUT command
-            put_sql = f"PUT 'file://{folder_path_snowflake}/*' {stage_path}"
-
-            put_sql = f"""
-                PUT 'file://{folder_path_snowflake}/*'
-                {stage_path}
-                AUTO_COMPRESS = FALSE
-                OVERWRITE = TRUE
-                PARALLEL = 4
-            """
+# Client-side codec -> (file suffix, PUT SOURCE_COMPRESSION / FILE_FORMAT_MASTER.compression_type)
+COMPRESSION_CODECS = {
+    'none': ('', 'NONE'),
+    'gzip': ('.gz', 'GZIP'),
+    'zstd': ('.zst', 'ZSTD'),
+}
+DEFAULT_CODEC = 'none'
+DEFAULT_COMPRESSION_LEVELS = {'gzip': 6, 'zstd': 3}
+
+# FILE_FORMAT_MASTER columns that, with compression_type, make up a file format
+FILE_FORMAT_ATTRIBUTES = ['format_type', 'delimiter', 'quote_char', 'escape_char', 'header_present',
+                          'record_separator', 'encoding']
+
+# (folder under the repo root, stage, stage subdirectory)
+UPLOAD_JOBS = [
+    ("data/restaurant", DEFAULT_STAGE, "restaurant"),
+    ("data/order_item", DEFAULT_STAGE, "order_item"),
+    ("data/menu", DEFAULT_STAGE, "menu"),
+    ("data/login_audit", DEFAULT_STAGE, "login_audit"),
+    ("data/location", DEFAULT_STAGE, "location"),
+    ("data/order", DEFAULT_STAGE, "order"),
+    ("data/delivery_agent", DEFAULT_STAGE, "delivery_agent"),
+    ("data/delivery", DEFAULT_STAGE, "delivery"),
+    ("data/customer", DEFAULT_STAGE, "customer"),
+    ("data/customer_address", DEFAULT_STAGE, "customer_address"),
+]
 
+# Columns of a PUT result row, in Snowflake's order
+PUT_RESULT_FIELDS = ['source', 'target', 'source_size', 'target_size', 'source_compression',
+                     'target_compression', 'status', 'message']
+
+
+def stage_path_for(stage_name, subdirectory=None):
+    """'BRONZE.CSV_STG', 'order' -> '@BRONZE.CSV_STG/order/'"""
+    if subdirectory:
+        return f"@{stage_name}/{subdirectory.strip('/')}/"
+    return f"@{stage_name}/"
+
+
+class SnowflakePutExecutor:
+    """
+    Runs PUT commands, reusing one Snowflake connection per worker thread.
+
+    Connections are opened lazily the first time a thread uploads a file and
+    are all closed by close().
+    """
+
+    def __init__(self, connection_factory=None):
+        if connection_factory is None:
+            from utils.snowflake_connector import SnowflakeConnection
+            connection_factory = SnowflakeConnection
+        self.connection_factory = connection_factory
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        sf = getattr(self._local, 'sf', None)
+        if sf is None:
+            sf = self.connection_factory()
+            sf.connect()
+            self._local.sf = sf
+            with self._lock:
+                if not self._connections:
+                    with sf.get_cursor() as cursor:
+                        cursor.execute("SELECT CURRENT_ROLE(), CURRENT_DATABASE(), CURRENT_SCHEMA()")
+                        role, db, schema = cursor.fetchone()
+                        print(f"Context: Role={role}, DB={db}, Schema={schema}")
+                self._connections.append(sf)
+        return sf
+
+    def put(self, local_path, stage_path, parallel=DEFAULT_PARALLEL, overwrite=True, source_compression='NONE'):
+        """PUT one local file to stage_path; returns the PUT result rows as dicts"""
+        # Snowflake wants forward slashes, also on Windows
+        local_path = str(Path(local_path).resolve()).replace("\\", "/")
+        put_sql = f"""
+            PUT 'file://{local_path}'
+            {stage_path}
+            AUTO_COMPRESS = FALSE
+            SOURCE_COMPRESSION = {source_compression}
+            OVERWRITE = {'TRUE' if overwrite else 'FALSE'}
+            PARALLEL = {parallel}
+        """
+        with self._connection().get_cursor() as cursor:
             cursor.execute(put_sql)
-            result = cursor.fetchall()
+            return [dict(zip(PUT_RESULT_FIELDS, row)) for row in cursor.fetchall()]
+
+    def remove(self, stage_path, file_names):
+        """REMOVE exactly these files from stage_path (a plain REMOVE <path> would match by prefix)"""
+        with self._connection().get_cursor() as cursor:
+            cursor.execute(f"REMOVE {stage_path} PATTERN = '{stage_file_pattern(file_names)}'")
+            return [row[0] for row in cursor.fetchall()]
+
+    def record_compression_type(self, stage_paths, compression_type):
+        """
+        Point the sources that land in stage_paths at a FILE_FORMAT_MASTER row with compression_type.
+
+        All CSV sources share one format row, so it is never updated in place:
+        each source moves to a copy of its current format with the new
+        compression (reused if one exists), and other sources are untouched.
+        """
+        sf = self._connection()
+        columns = ', '.join(f"ffm.{column}" for column in FILE_FORMAT_ATTRIBUTES)
+        for stage_path in stage_paths:
+            # landing_path is fully qualified (@DATAVELOCITY.BRONZE.CSV_STG/order/), stage_path may not be
+            rows = sf.execute_query(
+                f"""
+                SELECT sfc.source_id, UPPER(ffm.compression_type), {columns}
+                FROM COMMON.SOURCE_FILE_CONFIG sfc
+                JOIN COMMON.FILE_FORMAT_MASTER ffm ON sfc.file_format_id = ffm.file_format_id
+                WHERE LOWER(sfc.landing_path) LIKE %s
+                """,
+                ('%' + stage_path.lstrip('@').lower(),),
+            )
+            by_format = {}
+            for source_id, current, *attributes in rows:
+                if current != compression_type:
+                    by_format.setdefault(tuple(attributes), []).append(source_id)
+
+            for attributes, source_ids in by_format.items():
+                format_id = self._file_format_variant(sf, attributes, compression_type)
+                sf.execute_update(
+                    f"""
+                    UPDATE COMMON.SOURCE_FILE_CONFIG
+                    SET file_format_id = %s, updated_at = CURRENT_TIMESTAMP
+                    WHERE source_id IN ({', '.join(['%s'] * len(source_ids))})
+                    """,
+                    (format_id, *source_ids),
+                )
+
+    @staticmethod
+    def _file_format_variant(sf, attributes, compression_type):
+        """file_format_id of the format with these attributes and compression_type, added if missing"""
+        match = ' AND '.join(f"{column} IS NOT DISTINCT FROM %s" for column in FILE_FORMAT_ATTRIBUTES)
+        format_id = sf.execute_query(
+            f"SELECT MIN(file_format_id) FROM COMMON.FILE_FORMAT_MASTER "
+            f"WHERE UPPER(compression_type) = %s AND {match}",
+            (compression_type, *attributes),
+        )[0][0]
+        if format_id is None:
+            format_id = sf.execute_query(
+                "SELECT COALESCE(MAX(file_format_id), 0) + 1 FROM COMMON.FILE_FORMAT_MASTER")[0][0]
+            sf.execute_update(
+                f"INSERT INTO COMMON.FILE_FORMAT_MASTER (file_format_id, compression_type, "
+                f"{', '.join(FILE_FORMAT_ATTRIBUTES)}) VALUES (%s, %s, {', '.join(['%s'] * len(attributes))})",
+                (format_id, compression_type, *attributes),
+            )
+        return format_id
+
+    def reset(self):
+        """Drop this thread's connection after a failure so the next attempt reconnects"""
+        sf = getattr(self._local, 'sf', None)
+        if sf is None:
+            return
+        self._local.sf = None
+        with self._lock:
+            if sf in self._connections:
+                self._connections.remove(sf)
+        try:
+            sf.close()
+        except Exception:
+            pass
+
+    def close(self):
+        with self._lock:
+            for sf in self._connections:
+                sf.close()
+            self._connections = []
+
+
+class LocalPutExecutor:
+    """
+    Stand-in for SnowflakePutExecutor that copies files into a local directory.
+
+    '@BRONZE.CSV_STG/order/' maps to <root>/BRONZE.CSV_STG/order/. Result rows
+    have the same shape as Snowflake's PUT output, so the driver and reports
+    can be exercised without an account. failure_rate makes that fraction of
+    PUTs raise ConnectionError, to exercise retries and --resume.
+    """
+
+    def __init__(self, root, failure_rate=0.0):
+        self.root = Path(root)
+        self.failure_rate = failure_rate
+
+    def stage_dir(self, stage_path):
+        return self.root / stage_path.lstrip('@').strip('/')
+
+    def put(self, local_path, stage_path, parallel=DEFAULT_PARALLEL, overwrite=True, source_compression='NONE'):
+        local_path = Path(local_path)
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise ConnectionError(f"Simulated transient failure uploading {local_path.name}")
+        target_dir = self.stage_dir(stage_path)
+        target_dir.mkdir(parents=True, exist_ok=True)
+        target = target_dir / local_path.name
+        size = local_path.stat().st_size
+
+        if target.exists() and not overwrite:
+            status = 'SKIPPED'
+        else:
+            shutil.copyfile(local_path, target)
+            status = 'UPLOADED'
+        return [dict(zip(PUT_RESULT_FIELDS, [local_path.name, local_path.name, size, size,
+                                             source_compression, source_compression, status, '']))]
+
+    def remove(self, stage_path, file_names):
+        removed = []
+        for name in file_names:
+            target = self.stage_dir(stage_path) / name
+            if target.exists():
+                target.unlink()
+                removed.append(name)
+        return removed
+
+    def record_compression_type(self, stage_paths, compression_type):
+        """Stand-in for the FILE_FORMAT_MASTER update: <root>/file_format_master.json"""
+        path = self.root / "file_format_master.json"
+        formats = load_upload_manifest(path)
+        formats.update({stage_path: compression_type for stage_path in stage_paths})
+        self.root.mkdir(parents=True, exist_ok=True)
+        save_upload_manifest(path, formats)
+
+    def reset(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def stage_file_pattern(file_names):
+    """REMOVE/LIST PATTERN matching exactly these file names in any directory"""
+    # Character classes instead of backslash escapes, which would need doubling in a SQL string
+    names = [re.sub(r'([.+*?^$()\[\]{}|])', r'[\1]', name) for name in sorted(file_names)]
+    return f"(.*/)?({'|'.join(names)})"
+
+
+def split_csv(csv_path, chunk_dir, chunk_bytes):
+    """
+    Split a CSV with a header row into chunks of roughly chunk_bytes each.
+
+    Splits happen on line boundaries and every chunk repeats the header.
+    Assumes no quoted field contains a newline, which holds for everything
+    the generators write.
+
+    Returns:
+        List of chunk paths (<stem>_part_000.csv, ...)
+    """
+    csv_path, chunk_dir = Path(csv_path), Path(chunk_dir)
+    chunk_dir.mkdir(parents=True, exist_ok=True)
+    for stale in chunk_dir.glob(f"{csv_path.stem}_part_*{csv_path.suffix}"):
+        stale.unlink()
+
+    chunks = []
+    with open(csv_path, 'rb') as source:
+        header = source.readline()
+        out = None
+        written = 0
+        for line in source:
+            if out is None or written >= chunk_bytes:
+                if out:
+                    out.close()
+                chunk_path = chunk_dir / f"{csv_path.stem}_part_{len(chunks):03d}{csv_path.suffix}"
+                out = open(chunk_path, 'wb')
+                out.write(header)
+                written = len(header)
+                chunks.append(chunk_path)
+            out.write(line)
+            written += len(line)
+        if out:
+            out.close()
+    return chunks
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise RuntimeError("zstd compression needs the 'zstandard' package: pip install zstandard") from e
+    return zstandard
+
+
+def compress_file(path, out_dir, codec, level=None):
+    """
+    Stream-compress path into out_dir/<name><suffix>.
+
+    zstd uses all cores for a single file (threads=-1); gzip is single-threaded
+    per file, so its parallelism comes from the upload workers compressing
+    different files at once (zlib releases the GIL).
+
+    Returns:
+        Path of the compressed file
+    """
+    suffix, _ = COMPRESSION_CODECS[codec]
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_path = out_dir / f"{Path(path).name}{suffix}"
+    level = level or DEFAULT_COMPRESSION_LEVELS[codec]
+
+    with open(path, 'rb') as source:
+        if codec == 'gzip':
+            with gzip.open(out_path, 'wb', compresslevel=level) as target:
+                shutil.copyfileobj(source, target, HASH_BLOCK_SIZE)
+        elif codec == 'zstd':
+            compressor = _zstandard().ZstdCompressor(level=level, threads=-1)
+            with open(out_path, 'wb') as target:
+                compressor.copy_stream(source, target, read_size=HASH_BLOCK_SIZE)
+        else:
+            raise ValueError(f"Unknown codec '{codec}', expected one of {list(COMPRESSION_CODECS)}")
+    return out_path
+
+
+def file_digest(path, block_size=HASH_BLOCK_SIZE):
+    """SHA-256 of a file, read in blocks so multi-GB files don't load into memory"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def manifest_key(stage_path, file_path, codec=DEFAULT_CODEC):
+    """Manifest entries are keyed by where the file lands on the stage (so a new codec is a new file)"""
+    return f"{stage_path}{Path(file_path).name}{COMPRESSION_CODECS[codec][0]}"
+
+
+def load_upload_manifest(path):
+    if Path(path).exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def save_upload_manifest(path, manifest):
+    """Write the manifest atomically (tmp file + rename) so an interrupted run can't corrupt it"""
+    tmp_path = Path(path).with_suffix('.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def check_file(file_path, entry):
+    """
+    Compare a local file with its manifest entry.
+
+    Returns:
+        (state, sha256) where state is 'new', 'changed' or 'unchanged'. The
+        hash is only computed when size or mtime differ from the entry.
+    """
+    stat = Path(file_path).stat()
+    if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+        return 'unchanged', entry['sha256']
+
+    digest = file_digest(file_path)
+    if not entry:
+        return 'new', digest
+    return ('unchanged' if entry['sha256'] == digest else 'changed'), digest
+
+
+def plan_uploads(jobs, data_root=BASE_DIR, chunk_mb=DEFAULT_CHUNK_MB, manifest=None, workers=DEFAULT_WORKERS,
+                 codec=DEFAULT_CODEC, force=False):
+    """
+    Expand upload jobs into per-file uploads, splitting oversized CSVs.
+
+    A CSV is split when it is more than 25% over chunk_mb, so files just
+    above the target aren't cut into one full chunk and one sliver. With a
+    manifest, source files are checked first (hashing in parallel) and
+    unchanged ones are neither split nor uploaded. force plans every file
+    as 'forced', which always overwrites what is on the stage.
+
+    Returns:
+        (uploads, sources): uploads are dicts with table, source, path (file to
+        PUT), stage_path and overwrite; sources maps each source path to its
+        table, stage_path, manifest key, state, sha256, size and mtime_ns
+    """
+    chunk_bytes = int(chunk_mb * 1024 * 1024) if chunk_mb else None
+    candidates = []
+    for folder, stage_name, subdirectory in jobs:
+        folder_path = Path(data_root) / folder
+        if not folder_path.is_dir():
+            print(f"⚠️  Folder not found, skipping: {folder_path}")
+            continue
+
+        table = subdirectory or folder_path.name
+        stage_path = stage_path_for(stage_name, subdirectory)
+        candidates.extend((table, stage_path, file_path)
+                          for file_path in sorted(p for p in folder_path.iterdir() if p.is_file()))
+
+    sources = {}
+    if manifest is not None:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            checks = pool.map(lambda c: check_file(c[2], manifest.get(manifest_key(c[1], c[2], codec))), candidates)
+            for (table, stage_path, file_path), (state, digest) in zip(candidates, checks):
+                if force:
+                    state = 'forced'
+                stat = file_path.stat()
+                sources[str(file_path)] = {'table': table, 'stage_path': stage_path,
+                                           'key': manifest_key(stage_path, file_path, codec), 'state': state,
+                                           'sha256': digest, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    planned = []
+    for table, stage_path, file_path in candidates:
+        source = sources.get(str(file_path))
+        if source and source['state'] == 'unchanged':
+            continue
+
+        if chunk_bytes and file_path.suffix == '.csv' and file_path.stat().st_size > chunk_bytes * 1.25:
+            chunk_dir = file_path.parent.parent / CHUNK_DIR_NAME / table
+            paths = split_csv(file_path, chunk_dir, chunk_bytes)
+            print(f"✂️  {table}/{file_path.name}: split into {len(paths)} chunks")
+        else:
+            paths = [file_path]
+        # Only replace stage files we know hold older content (or were told to); anything else is
+        # skip-if-present, and a SKIPPED file isn't recorded as uploaded
+        overwrite = source is None or source['state'] in ('changed', 'forced')
+        compress_dir = file_path.parent.parent / COMPRESSED_DIR_NAME / table
+        planned.extend({'table': table, 'source': str(file_path), 'path': str(path), 'stage_path': stage_path,
+                        'overwrite': overwrite, 'compress_dir': str(compress_dir)} for path in paths)
+    return planned, sources
 
-    except Exception as e:
-        print(f"\n❌ ERROR: {e}")
-        import traceback
-        traceback.print_exc()
 
+def _put_status(result):
+    # Journal entries from an earlier attempt carry the PUT status next to their DONE status
+    return result.get('put_status') or result['status']
+
+
+def unrecorded_sources(results):
+    """Sources with a failed upload, or a file PUT kept as SKIPPED (the stage holds unknown content)"""
+    return {result['source'] for result in results if _put_status(result) in ('ERROR', 'SKIPPED')}
+
+
+def stale_stage_files(manifest, sources, results):
+    """
+    Stage files superseded by this run's uploads.
+
+    For every source whose uploads all succeeded, the files of its previous
+    manifest entry that the new upload didn't produce: chunks beyond the new
+    chunk count, or the whole file after a switch to chunks (and the chunks
+    after a switch back). OVERWRITE only replaces names that still exist, so
+    these would otherwise be loaded again by the next COPY.
+
+    Returns:
+        {stage_path: sorted file names}
+    """
+    failed = unrecorded_sources(results)
+    uploaded = {}
+    for result in results:
+        uploaded.setdefault(result['source'], set()).add(result.get('stage_file', Path(result['path']).name))
+
+    stale = {}
+    for source_path, source in sources.items():
+        if source['state'] == 'unchanged' or source_path in failed or source_path not in uploaded:
+            continue
+        previous = set()
+        for key in [source['key'], *superseded_keys(manifest, source_path, source)]:
+            entry = manifest.get(key)
+            if entry:
+                # Entries written before chunk names were recorded: the file landed whole under its key
+                previous.update(entry.get('files') or [key[len(source['stage_path']):]])
+        names = previous - uploaded[source_path]
+        if names:
+            stale.setdefault(source['stage_path'], set()).update(names)
+    return {stage_path: sorted(names) for stage_path, names in stale.items()}
+
+
+def superseded_keys(manifest, source_path, source):
+    """Manifest keys of the same source and stage path under another codec (x.csv vs x.csv.gz)"""
+    return [key for key, entry in manifest.items()
+            if key != source['key'] and entry.get('source') == source_path and key.startswith(source['stage_path'])]
+
+
+def remove_stale_files(executor, stale):
+    """REMOVE superseded stage files; failures are reported, not raised, since the upload itself succeeded"""
+    for stage_path, names in sorted(stale.items()):
+        try:
+            executor.remove(stage_path, names)
+            print(f"   🧹 Removed {len(names)} superseded file(s) from {stage_path}: {', '.join(names)}")
+        except Exception as e:
+            print(f"   ⚠️  Could not remove superseded files from {stage_path} ({e}); "
+                  f"REMOVE them before the next COPY: {', '.join(names)}")
+
+
+def update_manifest(manifest, sources, results):
+    """Record every source whose uploads (all chunks) succeeded, and refresh unchanged ones"""
+    failed = unrecorded_sources(results)
+    uploaded = {}
+    for result in results:
+        uploaded.setdefault(result['source'], []).append(result.get('stage_file', Path(result['path']).name))
+
+    now = datetime.now().isoformat()
+    for source_path, source in sources.items():
+        if source_path in failed:
+            continue
+        entry = manifest.get(source['key'], {})
+        if source['state'] != 'unchanged':
+            entry = {'uploaded_at': now, 'files': sorted(uploaded.get(source_path, []))}
+            # Its files under the previous codec were removed with the other stale files
+            for key in superseded_keys(manifest, source_path, source):
+                del manifest[key]
+        entry.update({'source': source_path, 'size': source['size'], 'mtime_ns': source['mtime_ns'],
+                      'sha256': source['sha256']})
+        manifest[source['key']] = entry
+
+
+class UploadJournal:
+    """
+    Per-file upload status for one run, persisted as JSON after every change.
+
+    Layout:
+        {'started_at', 'options': {...}, 'sources': {...from plan_uploads},
+         'files': {'<stage_path><file name>': {upload fields, 'status', 'attempts', 'last_error', 'updated_at'}}}
+    """
+
+    PENDING, UPLOADING, DONE, FAILED = 'PENDING', 'UPLOADING', 'DONE', 'FAILED'
+
+    def __init__(self, path, data):
+        # path=None keeps the journal in memory only (e.g. codec comparison runs)
+        self.path = Path(path) if path else None
+        self.data = data
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def file_key(upload):
+        return f"{upload['stage_path']}{Path(upload['path']).name}"
+
+    @classmethod
+    def start(cls, path, uploads, sources, options):
+        """New journal with every planned upload PENDING"""
+        now = datetime.now().isoformat()
+        files = {cls.file_key(upload): {**upload, 'status': cls.PENDING, 'attempts': 0, 'last_error': None,
+                                        'updated_at': now}
+                 for upload in uploads}
+        journal = cls(path, {'started_at': now, 'options': options, 'sources': sources, 'files': files})
+        journal.save()
+        return journal
+
+    @classmethod
+    def load(cls, path):
+        if not Path(path).exists():
+            raise FileNotFoundError(f"No upload journal to resume at {path}")
+        return cls(path, load_upload_manifest(path))
+
+    def save(self):
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        save_upload_manifest(self.path, self.data)
+
+    def mark(self, upload, status, **fields):
+        with self._lock:
+            entry = self.data['files'][self.file_key(upload)]
+            entry.update(fields, status=status, updated_at=datetime.now().isoformat())
+            self.save()
+
+    def entries(self, *statuses):
+        return [dict(entry) for entry in self.data['files'].values() if entry['status'] in statuses]
+
+
+def is_transient_error(error):
+    """Network/timeout/throttling errors worth retrying; missing files and SQL errors are not"""
+    if isinstance(error, (FileNotFoundError, PermissionError, ValueError)):
+        return False
+    if any(cls.__name__ in TRANSIENT_ERROR_TYPES for cls in type(error).__mro__):
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in TRANSIENT_ERROR_MARKERS)
+
+
+def backoff_delay(attempt, base=RETRY_BASE_DELAY, cap=RETRY_MAX_DELAY):
+    """Exponential backoff with full jitter for the given (0-based) retry attempt"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def _upload_with_retry(executor, upload, parallel, overwrite, codec, level, retries, journal=None):
+    attempt = 0
+    while True:
+        if journal:
+            journal.mark(upload, UploadJournal.UPLOADING, attempts=upload.get('attempts', 0) + attempt + 1)
+        try:
+            result = _upload_one(executor, upload, parallel, overwrite, codec, level)
+            result['attempts'] = attempt + 1
+            return result
+        except Exception as e:
+            executor.reset()
+            if attempt >= retries or not is_transient_error(e):
+                raise
+            delay = backoff_delay(attempt)
+            print(f"   🔁 {Path(upload['path']).name}: {e} (retry {attempt + 1}/{retries} in {delay:.1f}s)")
+            if journal:
+                journal.mark(upload, UploadJournal.UPLOADING, last_error=str(e))
+            time.sleep(delay)
+            attempt += 1
+
+
+def _upload_one(executor, upload, parallel, overwrite, codec=DEFAULT_CODEC, level=None):
+    size = os.path.getsize(upload['path'])
+    put_path = upload['path']
+    compress_sec = 0.0
+    if codec != 'none':
+        start = time.time()
+        put_path = compress_file(upload['path'], upload['compress_dir'], codec, level)
+        compress_sec = time.time() - start
+
+    try:
+        sent_bytes = os.path.getsize(put_path)
+        start = time.time()
+        rows = executor.put(put_path, upload['stage_path'], parallel=parallel,
+                            overwrite=overwrite and upload['overwrite'],
+                            source_compression=COMPRESSION_CODECS[codec][1])
+        elapsed = time.time() - start
     finally:
-        sf.close()
-
-# Run the upload
-upload_file_to_stage(folder_path="data/restaurant", stage_name="BRONZE.CSV_STG",subdirectory="restaurant")
-upload_file_to_stage(folder_path="data/order_item", stage_name="BRONZE.CSV_STG",subdirectory="order_item")
-upload_file_to_stage(folder_path="data/menu", stage_name="BRONZE.CSV_STG",subdirectory="menu")
-upload_file_to_stage(folder_path="data/login_audit", stage_name="BRONZE.CSV_STG",subdirectory="login_audit")
-upload_file_to_stage(folder_path="data/location", stage_name="BRONZE.CSV_STG",subdirectory="location")
-upload_file_to_stage(folder_path="data/order", stage_name="BRONZE.CSV_STG",subdirectory="order")
-upload_file_to_stage(folder_path="data/delivery_agent", stage_name="BRONZE.CSV_STG",subdirectory="delivery_agent")
-upload_file_to_stage(folder_path="data/delivery", stage_name="BRONZE.CSV_STG",subdirectory="delivery")
-upload_file_to_stage(folder_path="data/customer", stage_name="BRONZE.CSV_STG",subdirectory="customer")
-upload_file_to_stage(folder_path="data/customer_address", stage_name="BRONZE.CSV_STG",subdirectory="customer_address")
\ No newline at end of file
+        if put_path != upload['path']:
+            os.remove(put_path)
+
+    return {**upload, 'stage_file': Path(put_path).name, 'bytes': size, 'sent_bytes': sent_bytes,
+            'compress_sec': round(compress_sec, 3), 'elapsed_sec': round(elapsed, 3),
+            'status': rows[0]['status'] if rows else 'UNKNOWN'}
+
+
+def upload_all(jobs=UPLOAD_JOBS, executor=None, workers=DEFAULT_WORKERS, parallel=DEFAULT_PARALLEL,
+               chunk_mb=DEFAULT_CHUNK_MB, data_root=BASE_DIR, overwrite=True, manifest_path=None, force=False,
+               codec=DEFAULT_CODEC, compression_level=None, use_manifest=True, record_compression=True,
+               retries=DEFAULT_RETRIES, journal_path=None, resume=False, use_journal=True):
+    """
+    Upload every file of every job, several files at a time.
+
+    Args:
+        jobs: (folder, stage, subdirectory) tuples; folders are relative to data_root
+        executor: SnowflakePutExecutor (default) or LocalPutExecutor
+        workers: Files uploaded concurrently
+        parallel: PUT ... PARALLEL per file (1-99)
+        chunk_mb: Target chunk size for splitting large CSVs (None/0 = never split)
+        data_root: Directory the job folders are relative to
+        overwrite: Allow OVERWRITE = TRUE for files whose content changed
+        manifest_path: Upload manifest (default: data/upload_manifest.json under data_root)
+        force: Upload and overwrite everything regardless of the manifest (the manifest is still updated)
+        codec: Client-side compression before PUT (one of COMPRESSION_CODECS)
+        compression_level: Codec level (default: DEFAULT_COMPRESSION_LEVELS)
+        use_manifest: Read and write the upload manifest at all
+        record_compression: Write the codec to FILE_FORMAT_MASTER after a clean run
+        retries: Retries per file for transient errors (exponential backoff with jitter)
+        journal_path: Upload journal (default: data/upload_journal.json under data_root)
+        resume: Continue the journal's run instead of planning a new one; only files
+            that are not DONE are uploaded, with the journal's codec (jobs are ignored:
+            the journal already lists the run's files and stage paths)
+        use_journal: Persist the journal (False keeps it in memory, so --resume can't see the run)
+
+    Returns:
+        List of per-file results (table, path, bytes, elapsed_sec, status or error);
+        files skipped by the manifest are reported with status 'UNCHANGED'
+    """
+    if not 1 <= parallel <= MAX_PARALLEL:
+        raise ValueError(f"parallel must be between 1 and {MAX_PARALLEL}, got {parallel}")
+
+    if resume and not use_journal:
+        raise ValueError("resume needs the persisted journal; it can't be combined with use_journal=False")
+    journal_path = Path(journal_path or Path(data_root) / "data" / UPLOAD_JOURNAL_FILE) if use_journal else None
+    journal = UploadJournal.load(journal_path) if resume else None
+    if journal:
+        codec = journal.data['options']['codec']
+        compression_level = journal.data['options']['compression_level']
+
+    if codec not in COMPRESSION_CODECS:
+        raise ValueError(f"Unknown codec '{codec}', expected one of {list(COMPRESSION_CODECS)}")
+    if codec == 'zstd':
+        _zstandard()  # Fail before any work if the package is missing
+
+    manifest_path = Path(manifest_path or Path(data_root) / "data" / UPLOAD_MANIFEST_FILE)
+    # With force the manifest is still loaded: its file lists say what a re-upload supersedes
+    manifest = load_upload_manifest(manifest_path) if use_manifest else None
+
+    if journal:
+        sources = journal.data['sources']
+        done = journal.entries(UploadJournal.DONE)
+        uploads = journal.entries(UploadJournal.PENDING, UploadJournal.UPLOADING, UploadJournal.FAILED)
+        unchanged = []
+        print(f"⏯️  Resuming run from {journal.data['started_at']}: {len(done)} file(s) done, "
+              f"{len(uploads)} to upload (codec={codec})")
+    else:
+        uploads, sources = plan_uploads(jobs, data_root, chunk_mb, manifest, workers, codec, force)
+        done = []
+        journal = UploadJournal.start(journal_path, uploads, sources,
+                                      {'codec': codec, 'compression_level': compression_level})
+        unchanged = [{'table': source['table'], 'source': src_path, 'path': src_path,
+                      'stage_path': source['stage_path'], 'bytes': source['size'],
+                      'elapsed_sec': 0.0, 'status': 'UNCHANGED'}
+                     for src_path, source in sources.items() if source['state'] == 'unchanged']
+        if unchanged:
+            print(f"⏭️  {len(unchanged)} file(s) unchanged since the last upload")
+
+    executor = executor or SnowflakePutExecutor()
+    # Largest files first so one big file doesn't start last and hold up the run
+    uploads.sort(key=lambda upload: os.path.getsize(upload['path']) if os.path.exists(upload['path']) else 0,
+                 reverse=True)
+
+    results = []
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_upload_with_retry, executor, upload, parallel, overwrite, codec,
+                                   compression_level, retries, journal): upload
+                       for upload in uploads}
+            for future in as_completed(futures):
+                upload = futures[future]
+                try:
+                    result = future.result()
+                    journal.mark(upload, UploadJournal.DONE, stage_file=result['stage_file'],
+                                 put_status=result['status'], last_error=None)
+                    print(f"   ✅ {result['status']:<9} {result['stage_path']}{result['stage_file']} "
+                          f"({result['sent_bytes'] / 1024 / 1024:.1f} MB in {result['elapsed_sec']:.1f}s)")
+                except Exception as e:
+                    journal.mark(upload, UploadJournal.FAILED, last_error=str(e))
+                    print(f"   ❌ {upload['path']}: {e}")
+                    size = os.path.getsize(upload['path']) if os.path.exists(upload['path']) else 0
+                    result = {**upload, 'bytes': size, 'sent_bytes': 0, 'compress_sec': 0.0,
+                              'elapsed_sec': 0.0, 'status': 'ERROR', 'error': str(e)}
+                results.append(result)
+
+        if manifest is not None:
+            remove_stale_files(executor, stale_stage_files(manifest, sources, done + results))
+
+        skipped = sorted({r['source'] for r in results if r['status'] == 'SKIPPED'})
+        if skipped:
+            print(f"\n⚠️  {len(skipped)} file(s) were already on the stage and kept as they are (OVERWRITE = FALSE); "
+                  f"they aren't recorded as uploaded. Re-run with --force to replace them")
+        failed = journal.entries(UploadJournal.FAILED)
+        if failed:
+            print(f"\n⚠️  {len(failed)} file(s) failed; re-run with --resume to retry only those")
+        if record_compression and results and not failed:
+            executor.record_compression_type(sorted({r['stage_path'] for r in results}),
+                                             COMPRESSION_CODECS[codec][1])
+    finally:
+        executor.close()
+        if manifest is not None:
+            # Files finished by an earlier attempt of this run count towards their source being complete
+            update_manifest(manifest, sources, done + results)
+            manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            save_upload_manifest(manifest_path, manifest)
+    return unchanged + results
+
+
+def print_summary(results, elapsed_sec):
+    tables = {}
+    for result in results:
+        entry = tables.setdefault(result['table'], {'files': 0, 'bytes': 0, 'sent_bytes': 0, 'unchanged': 0,
+                                                    'errors': 0})
+        if result['status'] == 'UNCHANGED':
+            entry['unchanged'] += 1
+            continue
+        if result['status'] == 'ERROR':
+            entry['errors'] += 1
+            continue
+        entry['files'] += 1
+        entry['bytes'] += result['bytes']
+        entry['sent_bytes'] += result['sent_bytes']
+
+    print("\n" + "=" * 80)
+    print("📊 UPLOAD SUMMARY")
+    print("=" * 80)
+    print(f"{'Table':<20} {'Uploaded':>9} {'Raw MB':>10} {'Sent MB':>10} {'Unchanged':>10} {'Errors':>8}")
+    print("-" * 80)
+    for table, entry in sorted(tables.items()):
+        print(f"{table:<20} {entry['files']:>9} {entry['bytes'] / 1024 / 1024:>10.1f} "
+              f"{entry['sent_bytes'] / 1024 / 1024:>10.1f} {entry['unchanged']:>10} {entry['errors']:>8}")
+    print("=" * 80)
+    total_mb = sum(r['bytes'] for r in results if r['status'] != 'UNCHANGED') / 1024 / 1024
+    print(f"⏱️  {total_mb:.1f} MB in {elapsed_sec:.1f}s "
+          f"({total_mb / elapsed_sec if elapsed_sec else 0:.1f} MB/s)")
+
+
+def compare_codecs(jobs, executor, codecs, data_root=BASE_DIR, **upload_options):
+    """
+    Upload the same files once per codec and compare bytes sent and time.
+
+    Each codec goes to @<stage>/_codec_benchmark/<codec>/<subdirectory>/ so the
+    Bronze landing paths and the upload manifest are untouched.
+
+    Returns:
+        List of per-codec dicts (raw/sent bytes, ratio, compress/upload/wall seconds)
+    """
+    report = []
+    for codec in codecs:
+        codec_jobs = [(folder, stage, f"_codec_benchmark/{codec}/{subdirectory}")
+                      for folder, stage, subdirectory in jobs]
+        print(f"\n🔬 Codec: {codec}")
+        start = time.time()
+        results = upload_all(codec_jobs, executor, data_root=data_root, codec=codec, use_manifest=False,
+                             record_compression=False, use_journal=False, **upload_options)
+        wall = time.time() - start
+        raw = sum(r['bytes'] for r in results)
+        sent = sum(r['sent_bytes'] for r in results)
+        report.append({
+            'codec': codec,
+            'files': len(results),
+            'errors': sum(r['status'] == 'ERROR' for r in results),
+            'raw_bytes': raw,
+            'sent_bytes': sent,
+            'ratio': round(raw / sent, 2) if sent else None,
+            'compress_sec': round(sum(r['compress_sec'] for r in results), 3),
+            'upload_sec': round(sum(r['elapsed_sec'] for r in results), 3),
+            'wall_sec': round(wall, 3),
+        })
+    return report
+
+
+def print_codec_report(report):
+    print("\n" + "=" * 88)
+    print("📊 CODEC COMPARISON")
+    print("=" * 88)
+    print(f"{'Codec':<8} {'Files':>6} {'Raw MB':>10} {'Sent MB':>10} {'Ratio':>7} "
+          f"{'Compress s':>11} {'Upload s':>10} {'Wall s':>8} {'Errors':>7}")
+    print("-" * 88)
+    for entry in report:
+        ratio = f"{entry['ratio']:.1f}x" if entry['ratio'] else '-'
+        print(f"{entry['codec']:<8} {entry['files']:>6} {entry['raw_bytes'] / 1024 / 1024:>10.1f} "
+              f"{entry['sent_bytes'] / 1024 / 1024:>10.1f} {ratio:>7} {entry['compress_sec']:>11.1f} "
+              f"{entry['upload_sec']:>10.1f} {entry['wall_sec']:>8.1f} {entry['errors']:>7}")
+    print("=" * 88)
+    print("Compress/Upload are summed over workers; Wall is elapsed time for the whole run.")
+
+
+def upload_file_to_stage(folder_path, stage_name, subdirectory=None, parallel=DEFAULT_PARALLEL):
+    """Upload one folder (kept for callers of the old per-folder helper)."""
+    return upload_all([(folder_path, stage_name, subdirectory)], workers=1, parallel=parallel)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Upload the data/ tree to the Bronze stage")
+    parser.add_argument('--tables', nargs='+', help="Only upload these table folders")
+    parser.add_argument('--stage', help=f"Target stage (default: {DEFAULT_STAGE})")
+    parser.add_argument('--data-root', default=str(BASE_DIR),
+                        help="Directory containing data/ (default: repository root)")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f"Files uploaded concurrently (default: {DEFAULT_WORKERS})")
+    parser.add_argument('--parallel', type=int, default=DEFAULT_PARALLEL,
+                        help=f"PUT PARALLEL per file, 1-{MAX_PARALLEL} (default: {DEFAULT_PARALLEL})")
+    parser.add_argument('--chunk-mb', type=float, default=DEFAULT_CHUNK_MB,
+                        help=f"Split CSVs into chunks of about this size, 0 to disable (default: {DEFAULT_CHUNK_MB})")
+    parser.add_argument('--local-stage', help="Copy into this directory instead of running PUT")
+    parser.add_argument('--manifest', help=f"Upload manifest path (default: data/{UPLOAD_MANIFEST_FILE})")
+    parser.add_argument('--force', action='store_true', help="Upload every file, ignoring the manifest")
+    parser.add_argument('--compression', choices=list(COMPRESSION_CODECS), default=DEFAULT_CODEC,
+                        help=f"Compress files before PUT (default: {DEFAULT_CODEC})")
+    parser.add_argument('--compression-level', type=int, help="Codec level (default: gzip 6, zstd 3)")
+    parser.add_argument('--compare-codecs', nargs='+', choices=list(COMPRESSION_CODECS),
+                        help="Upload once per codec to a benchmark prefix and compare")
+    parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES,
+                        help=f"Retries per file for transient errors (default: {DEFAULT_RETRIES})")
+    parser.add_argument('--journal', help=f"Upload journal path (default: data/{UPLOAD_JOURNAL_FILE})")
+    parser.add_argument('--resume', action='store_true',
+                        help="Only upload files the last run didn't finish (pending or failed)")
+    parser.add_argument('--local-failure-rate', type=float, default=0.0,
+                        help="With --local-stage, fail this fraction of PUTs (to exercise retries/--resume)")
+    args = parser.parse_args(argv)
+    # A resumed run uploads exactly what its journal lists; a table or stage selection would be ignored
+    if args.resume and (args.tables or args.stage):
+        parser.error("--resume continues the journal's run as planned; it can't be combined with --tables/--stage")
+    args.stage = args.stage or DEFAULT_STAGE
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    jobs = [(folder, args.stage, subdirectory) for folder, _, subdirectory in UPLOAD_JOBS
+            if not args.tables or subdirectory in args.tables]
+    if args.local_stage:
+        executor = LocalPutExecutor(args.local_stage, failure_rate=args.local_failure_rate)
+    else:
+        executor = SnowflakePutExecutor()
+
+    if args.compare_codecs:
+        report = compare_codecs(jobs, executor, args.compare_codecs, data_root=args.data_root,
+                                workers=args.workers, parallel=args.parallel, chunk_mb=args.chunk_mb,
+                                compression_level=args.compression_level)
+        print_codec_report(report)
+        report_path = Path(args.data_root) / "data" / CODEC_REPORT_FILE
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump({'generated_at': datetime.now().isoformat(), 'codecs': report}, f, indent=2)
+        print(f"📝 Report saved to {report_path}")
+        return
+
+    print(f"\n🚀 Uploading {len(jobs)} table folder(s) → @{args.stage} "
+          f"(workers={args.workers}, parallel={args.parallel}, chunk={args.chunk_mb or '∞'} MB, "
+          f"compression={args.compression})\n")
+    start = time.time()
+    results = upload_all(jobs, executor, workers=args.workers, parallel=args.parallel,
+                         chunk_mb=args.chunk_mb, data_root=args.data_root, manifest_path=args.manifest,
+                         force=args.force, codec=args.compression, compression_level=args.compression_level,
+                         retries=args.retries, journal_path=args.journal, resume=args.resume)
+    print_summary(results, time.time() - start)
+
+
+if __name__ == "__main__":
+    main()